@@ -4,7 +4,7 @@
 
 {
     'name': 'ACMST Admission Management',
-    'version': '1.0.0',
+    'version': '1.0.1',
     'category': 'Education',
     'summary': 'Comprehensive admission management system for ACMST College',
     'description': """
@@ -81,6 +81,7 @@
         'wizards/acmst_ministry_approval_wizard_views.xml',
         'wizards/acmst_university_id_update_wizard_views.xml',
         'wizards/acmst_document_rejection_wizard_views.xml',
+        'wizards/acmst_admission_import_wizard_views.xml',
         'static/src/xml/acmst_admission_portal_templates.xml',
         'static/src/xml/acmst_admission_portal_dashboard.xml',
         'static/src/xml/acmst_admission_form_wizard.xml',
@@ -6,59 +6,109 @@ from odoo import http, fields, _
 from odoo.http import request
 from odoo.addons.portal.controllers.portal import CustomerPortal
 from odoo.addons.web.controllers.main import ensure_db
+from odoo.exceptions import ValidationError, UserError, AccessError, MissingError
+from odoo.addons.acmst_admission.models.acmst_rate_limit import RATE_LIMIT_CAPACITY, RATE_LIMIT_REFILL_RATE
+from odoo.addons.acmst_admission.models.acmst_document_upload import (
+    UPLOAD_RATE_LIMIT_CAPACITY, UPLOAD_RATE_LIMIT_REFILL_RATE,
+)
+from datetime import timezone
+import hashlib
+from psycopg2.errors import UniqueViolation
+from werkzeug.http import http_date
 import json
-import base64
 import logging
+import math
 
 _logger = logging.getLogger(__name__)
 
+# Resized image field served for each model and size
+PREVIEW_FIELDS = {
+    'acmst.document': {128: 'thumbnail_128', 512: 'thumbnail_512'},
+    'acmst.admission.file': {128: 'profile_picture_128', 512: 'profile_picture_512'},
+    'acmst.portal.application': {128: 'profile_picture_128', 512: 'profile_picture_512'},
+}
+# Browser cache lifetime of previews requested without a version
+PREVIEW_MAX_AGE = 3600
+# Browser and proxy cache lifetime of the public catalogue, revalidated through its ETag afterwards
+CATALOGUE_MAX_AGE = 300
+# Longest accepted client idempotency key
+IDEMPOTENCY_KEY_MAX_LENGTH = 128
+# Portal home counters and the application states they count, None counting every state
+APPLICATION_COUNTERS = {
+    'application_count': None,
+    'pending_count': ['submitted', 'under_review'],
+    'approved_count': ['approved'],
+    'rejected_count': ['rejected'],
+}
+
 
 class AdmissionPortal(CustomerPortal):
     """Portal controller for admission applications"""
 
     def _prepare_home_portal_values(self, counters):
+        """Add the requested application counters, from one grouped count query"""
         values = super()._prepare_home_portal_values(counters)
-        
-        # Get user's applications data
-        if request.env.user.has_group('acmst_admission.group_portal'):
-            domain = [('portal_user_id', '=', request.env.user.id)]
-            applications = request.env['acmst.portal.application'].search(domain)
-            
-            values['application_count'] = len(applications)
-            values['pending_count'] = len(applications.filtered(lambda x: x.state in ['submitted', 'under_review']))
-            values['approved_count'] = len(applications.filtered(lambda x: x.state == 'approved'))
-            values['rejected_count'] = len(applications.filtered(lambda x: x.state == 'rejected'))
-            values['recent_applications'] = applications.sorted('submission_date', reverse=True)[:5]
-        else:
-            values['application_count'] = 0
-            values['pending_count'] = 0
-            values['approved_count'] = 0
-            values['rejected_count'] = 0
-            values['recent_applications'] = []
-            
+        requested = [name for name in APPLICATION_COUNTERS if name in counters]
+        if not requested and 'recent_applications' not in counters:
+            return values
+
+        Application = request.env['acmst.portal.application']
+        is_applicant = request.env.user.has_group('acmst_admission.group_portal')
+        domain = [('portal_user_id', '=', request.env.user.id)]
+
+        if requested:
+            state_counts = dict(Application._read_group(domain, ['state'], ['__count'])) if is_applicant else {}
+            for name in requested:
+                states = APPLICATION_COUNTERS[name]
+                values[name] = sum(
+                    count for state, count in state_counts.items()
+                    if states is None or state in states
+                )
+        if 'recent_applications' in counters:
+            values['recent_applications'] = Application.search(
+                domain, order='submission_date desc nulls last, id desc', limit=5
+            ) if is_applicant else Application
         return values
 
     @http.route(['/admission', '/admission/home'], type='http', auth="public", website=True)
     def admission_home(self, **kw):
         """Admission portal home page"""
+        catalogue = request.env['acmst.catalogue'].get_catalogue()
         values = {
             'page_name': 'admission_home',
-            'programs': request.env['acmst.program'].search([]),
-            'batches': request.env['acmst.batch'].search([]),
+            'programs': catalogue['programs'],
+            'batches': catalogue['batches'],
         }
         return request.render('acmst_admission.portal_admission_home', values)
 
     @http.route('/admission/apply', type='http', auth="public", website=True)
     def admission_apply(self, **kw):
-        """Application form page"""
+        """Application form page, its programs and batches are loaded from the catalogue endpoint"""
         values = {
             'page_name': 'admission_apply',
-            'programs': request.env['acmst.program'].search([]),
-            'batches': request.env['acmst.batch'].search([]),
-            'countries': request.env['res.country'].search([]),
+            'catalogue_version': request.env['acmst.catalogue'].get_catalogue()['version'],
         }
         return request.render('acmst_admission.portal_admission_apply', values)
 
+    @http.route('/admission/catalogue.json', type='http', methods=['GET'], auth="public", sitemap=False)
+    def admission_catalogue(self, **kw):
+        """Program and batch catalogue, served with HTTP validators from the process cache"""
+        data, body, etag, last_modified = request.env['acmst.catalogue']._get_catalogue()
+        headers = [
+            ('Cache-Control', f'public, max-age={CATALOGUE_MAX_AGE}'),
+            ('ETag', f'"{etag}"'),
+            ('Last-Modified', http_date(last_modified.replace(tzinfo=timezone.utc))),
+        ]
+        httprequest = request.httprequest
+        if httprequest.if_none_match:
+            not_modified = httprequest.if_none_match.contains(etag)
+        else:
+            since = httprequest.if_modified_since
+            not_modified = bool(since) and last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= since
+        if not_modified:
+            return request.make_response(b'', headers=headers, status=304)
+        return request.make_response(body, headers=headers + [('Content-Type', 'application/json')])
+
     @http.route('/admission/status', type='http', auth="user", website=True)
     def admission_status(self, **kw):
         """Application status page"""
@@ -133,7 +183,20 @@ class AdmissionPortal(CustomerPortal):
     @http.route('/admission/submit', type='http', methods=['POST'], auth="public", website=True, csrf=False)
     def admission_submit(self, **kw):
         """Submit application form"""
+        limited = self._check_rate_limit()
+        if limited:
+            return limited
         try:
+            # A retried request returns the application created by the first one
+            idempotency_key = self._get_idempotency_key(kw)
+            application = self._find_idempotent_application(idempotency_key)
+            if application:
+                return json.dumps({
+                    'success': True,
+                    'application_id': application.id,
+                    'message': _('Application submitted successfully!')
+                })
+
             # Get form data
             form_data = self._prepare_application_data(kw)
             
@@ -146,7 +209,10 @@ class AdmissionPortal(CustomerPortal):
                 })
             
             # Create application
-            application = request.env['acmst.portal.application'].create(form_data)
+            application = self._create_idempotent_application(form_data, idempotency_key)
+            if not application:
+                return self._duplicate_request_response()
+            self._link_uploads(application, kw)
             
             # Submit application
             application.action_submit()
@@ -167,7 +233,20 @@ class AdmissionPortal(CustomerPortal):
     @http.route('/admission/save-draft', type='http', methods=['POST'], auth="public", website=True, csrf=False)
     def admission_save_draft(self, **kw):
         """Save application as draft"""
+        limited = self._check_rate_limit()
+        if limited:
+            return limited
         try:
+            # A retried request returns the draft saved by the first one
+            idempotency_key = self._get_idempotency_key(kw)
+            application = self._find_idempotent_application(idempotency_key)
+            if application:
+                return json.dumps({
+                    'success': True,
+                    'application_id': application.id,
+                    'message': _('Draft saved successfully!')
+                })
+
             # Get form data
             form_data = self._prepare_application_data(kw)
             
@@ -179,7 +258,10 @@ class AdmissionPortal(CustomerPortal):
                 else:
                     return json.dumps({'success': False, 'error': _('Invalid application')})
             else:
-                application = request.env['acmst.portal.application'].create(form_data)
+                application = self._create_idempotent_application(form_data, idempotency_key)
+                if not application:
+                    return self._duplicate_request_response()
+            self._link_uploads(application, kw)
             
             return json.dumps({
                 'success': True,
@@ -217,6 +299,14 @@ class AdmissionPortal(CustomerPortal):
             # Create health check
             health_check = request.env['acmst.health.check'].create(health_data)
             
+            # Stream attached reports into the filestore
+            Upload = request.env['acmst.document.upload'].sudo()
+            for field_name in ['medical_reports', 'lab_results', 'other_documents']:
+                for file in request.httprequest.files.getlist(field_name):
+                    if file and file.filename:
+                        upload = Upload.upload_stream(file.filename, file.stream, mimetype=file.mimetype)
+                        upload.link_to_record(health_check, field_name)
+            
             # Submit health check
             health_check.action_submit()
             
@@ -261,6 +351,90 @@ class AdmissionPortal(CustomerPortal):
                 'error': 'An error occurred while completing the condition. Please try again.'
             })
 
+    @http.route('/admission/preview/<string:model>/<int:res_id>/<int:size>', type='http', auth="user")
+    def admission_preview(self, model, res_id, size, unique=None, **kw):
+        """Serve a document thumbnail or resized profile picture with HTTP caching.
+
+        Responses carry the attachment checksum as ETag, so revalidation
+        costs a 304; URLs holding a ``unique`` version are cached as
+        immutable.
+        """
+        field_name = PREVIEW_FIELDS.get(model, {}).get(size)
+        if not field_name:
+            raise request.not_found()
+        try:
+            record = request.env['ir.binary']._find_record(res_model=model, res_id=res_id)
+            stream = request.env['ir.binary']._get_image_stream_from(record, field_name)
+        except (AccessError, MissingError):
+            raise request.not_found()
+        stream.max_age = PREVIEW_MAX_AGE
+        return stream.get_response(immutable=bool(unique))
+
+    @http.route('/admission/upload/start', type='json', auth="public", website=True)
+    def upload_start(self, filename, size, document_type='other', mimetype=None, **kw):
+        """Open a chunked document upload and return its token"""
+        if not self._consume_rate_limit('upload:', UPLOAD_RATE_LIMIT_CAPACITY, UPLOAD_RATE_LIMIT_REFILL_RATE):
+            return {
+                'success': False,
+                'error': _('Too many requests. Please wait a moment and try again.'),
+                'retry_after': math.ceil(1 / UPLOAD_RATE_LIMIT_REFILL_RATE),
+            }
+        try:
+            session_key = hashlib.sha256(request.session.sid.encode()).hexdigest() if request.session.sid else None
+            upload = request.env['acmst.document.upload'].sudo().start_upload(
+                filename, size, document_type=document_type, mimetype=mimetype,
+                ip_address=request.httprequest.remote_addr, session_key=session_key)
+            return dict(upload.get_status(), success=True)
+        except (ValidationError, UserError) as e:
+            return {'success': False, 'error': str(e)}
+
+    @http.route('/admission/upload/<string:token>/chunk', type='http', methods=['POST'], auth="public", website=True, csrf=False)
+    def upload_chunk(self, token, index=0, **kw):
+        """Receive one chunk of a document upload, streamed to the filestore"""
+        if not self._consume_rate_limit('upload:', UPLOAD_RATE_LIMIT_CAPACITY, UPLOAD_RATE_LIMIT_REFILL_RATE):
+            return self._rate_limited_response(UPLOAD_RATE_LIMIT_REFILL_RATE)
+        try:
+            chunk = request.httprequest.files.get('chunk')
+            if not chunk:
+                return json.dumps({'success': False, 'error': _('No chunk received')})
+            upload = request.env['acmst.document.upload'].sudo()._get_by_token(token)
+            status = upload.write_chunk(int(index), chunk.stream)
+            return json.dumps(dict(status, success=True))
+        except (ValidationError, UserError) as e:
+            return json.dumps({'success': False, 'error': str(e)})
+        except Exception as e:
+            _logger.error('Error receiving upload chunk: %s', str(e))
+            return json.dumps({
+                'success': False,
+                'error': _('An error occurred while uploading your document. Please resume the upload.')
+            })
+
+    @http.route('/admission/upload/<string:token>/status', type='json', auth="public", website=True)
+    def upload_status(self, token, **kw):
+        """Progress of a document upload, used to resume after a failure"""
+        try:
+            upload = request.env['acmst.document.upload'].sudo()._get_by_token(token)
+            return dict(upload.get_status(), success=True)
+        except (ValidationError, UserError) as e:
+            return {'success': False, 'error': str(e)}
+
+    @http.route('/admission/import', type='http', methods=['POST'], auth="user", csrf=False)
+    def admission_import(self, batch_size=None, **kw):
+        """Bulk import admission files from an uploaded CSV or XLSX file, streamed row by row"""
+        headers = [('Content-Type', 'application/json')]
+        try:
+            upload = request.httprequest.files.get('file')
+            if not upload:
+                return request.make_response(json.dumps({'success': False, 'error': _('No file received')}), headers, status=400)
+            ImportWizard = request.env['acmst.admission.import.wizard']
+            ImportWizard.check_access_rights('create')
+            result = ImportWizard.import_stream(upload.stream, upload.filename, batch_size=int(batch_size or 0))
+            return request.make_response(json.dumps(dict(result, success=True)), headers)
+        except AccessError as e:
+            return request.make_response(json.dumps({'success': False, 'error': str(e)}), headers, status=403)
+        except (ValidationError, UserError, ValueError) as e:
+            return request.make_response(json.dumps({'success': False, 'error': str(e)}), headers, status=400)
+
     def _prepare_application_data(self, kw):
         """Prepare application data from form"""
         data = {
@@ -282,15 +456,90 @@ class AdmissionPortal(CustomerPortal):
             'user_agent': request.httprequest.environ.get('HTTP_USER_AGENT', ''),
         }
         
-        # Handle file upload
-        if 'documents' in request.httprequest.files:
-            file = request.httprequest.files['documents']
-            if file and file.filename:
-                data['documents'] = base64.b64encode(file.read())
-                data['documents_filename'] = file.filename
-        
         return data
 
+    def _consume_rate_limit(self, prefix='', capacity=RATE_LIMIT_CAPACITY, refill_rate=RATE_LIMIT_REFILL_RATE):
+        """Take a token from the ``prefix`` buckets of the client's IP and session; return whether allowed.
+
+        Tokens are taken in a separate transaction committed at once, so
+        concurrent requests of one client only wait on the bucket row for
+        the upsert, not for the whole request.
+        """
+        keys = [f'{prefix}ip:{request.httprequest.remote_addr}']
+        if request.session.sid:
+            keys.append(f'{prefix}session:{request.session.sid}')
+        with request.env.registry.cursor() as cr:
+            RateLimit = request.env(cr=cr, su=True)['acmst.rate.limit']
+            return all(RateLimit._consume(key, capacity, refill_rate) for key in keys)
+
+    def _rate_limited_response(self, refill_rate=RATE_LIMIT_REFILL_RATE):
+        return request.make_response(json.dumps({
+            'success': False,
+            'error': _('Too many requests. Please wait a moment and try again.')
+        }), headers=[
+            ('Content-Type', 'application/json'),
+            ('Retry-After', str(math.ceil(1 / refill_rate))),
+        ], status=429)
+
+    def _check_rate_limit(self):
+        """Return a 429 response when the client's IP or session exhausted its submission bucket"""
+        if self._consume_rate_limit():
+            return None
+        return self._rate_limited_response()
+
+    def _get_idempotency_key(self, kw):
+        """Client token of the request, from the Idempotency-Key header or form field"""
+        key = request.httprequest.headers.get('Idempotency-Key') or kw.get('idempotency_key') or ''
+        return key.strip()[:IDEMPOTENCY_KEY_MAX_LENGTH] or False
+
+    def _find_idempotent_application(self, idempotency_key):
+        """Application already created by the request of ``idempotency_key``, for the same user"""
+        Application = request.env['acmst.portal.application']
+        if not idempotency_key:
+            return Application
+        portal_user_id = False if request.env.user._is_public() else request.env.user.id
+        return Application.sudo().search([
+            ('idempotency_key', '=', idempotency_key),
+            ('portal_user_id', '=', portal_user_id),
+        ], limit=1).with_env(request.env)
+
+    def _create_idempotent_application(self, form_data, idempotency_key):
+        """Create the application of a request, once per idempotency key.
+
+        The unique index on the key settles concurrent retries: the losing
+        request gets an empty recordset instead of a duplicate application.
+        """
+        Application = request.env['acmst.portal.application']
+        if not idempotency_key:
+            return Application.create(form_data)
+        try:
+            with request.env['acmst.audit.log']._savepoint():
+                return Application.create(dict(form_data, idempotency_key=idempotency_key))
+        except UniqueViolation:
+            _logger.info(f'Duplicate submission with idempotency key {idempotency_key} ignored')
+            return self._find_idempotent_application(idempotency_key)
+
+    def _duplicate_request_response(self):
+        return request.make_response(json.dumps({
+            'success': False,
+            'error': _('This submission is already being processed.')
+        }), headers=[('Content-Type', 'application/json')], status=409)
+
+    def _link_uploads(self, application, kw):
+        """Turn finished chunked uploads and plain form files into documents of ``application``"""
+        Upload = request.env['acmst.document.upload'].sudo()
+        uploads = Upload
+        tokens = [token for token in (kw.get('upload_tokens') or '').split(',') if token.strip()]
+        if tokens:
+            uploads |= Upload.search([('access_token', 'in', [token.strip() for token in tokens]), ('state', '=', 'done')])
+        # Files posted with the form are streamed to the filestore instead of being base64 encoded
+        for file in request.httprequest.files.getlist('documents'):
+            if file and file.filename:
+                uploads |= Upload.upload_stream(file.filename, file.stream, mimetype=file.mimetype)
+        if uploads:
+            uploads.link_to_application(application)
+        return uploads
+
     def _prepare_health_check_data(self, kw):
         """Prepare health check data from form"""
         application_id = int(kw.get('application_id', 0))
@@ -318,14 +567,6 @@ class AdmissionPortal(CustomerPortal):
             'follow_up_date': kw.get('follow_up_date', ''),
         }
         
-        # Handle file uploads
-        for field_name in ['medical_reports', 'lab_results', 'other_documents']:
-            if field_name in request.httprequest.files:
-                file = request.httprequest.files[field_name]
-                if file and file.filename:
-                    data[field_name] = base64.b64encode(file.read())
-                    data[field_name + '_filename'] = file.filename
-        
         return data
 
     def _validate_application_data(self, data):
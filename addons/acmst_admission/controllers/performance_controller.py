@@ -18,7 +18,7 @@ class PerformanceController(http.Controller):
     def get_performance_metrics(self):
         """Get current performance metrics"""
         try:
-            performance_model = request.env['acmst.performance']
+            performance_model = request.env['acmst.performance.optimization']
             
             # Get basic metrics
             metrics = {
@@ -62,35 +62,14 @@ class PerformanceController(http.Controller):
     def get_live_metrics(self):
         """Get live performance metrics"""
         try:
-            performance_model = request.env['acmst.performance']
+            performance_model = request.env['acmst.performance.optimization']
             
-            # Simulate live metrics (in real implementation, these would come from monitoring tools)
-            import random
-            
-            metrics = {
-                'query_performance': {
-                    'average_time': round(random.uniform(1.5, 3.0), 1),
-                    'total_queries': random.randint(1200, 1300),
-                    'slow_queries': random.randint(10, 20)
-                },
-                'database_load': {
-                    'cpu_usage': round(random.uniform(40, 60), 1),
-                    'memory_usage': round(random.uniform(1.0, 1.5), 1),
-                    'connection_count': random.randint(20, 30)
-                },
-                'memory_usage': {
-                    'ram_consumption': f"{round(random.uniform(1.0, 1.5), 1)}GB",
-                    'cache_hit_rate': round(random.uniform(80, 90), 1),
-                    'swap_usage': round(random.uniform(0.0, 0.2), 1)
-                },
-                'active_users': {
-                    'count': random.randint(120, 140),
-                    'concurrent_sessions': random.randint(40, 50),
-                    'peak_concurrent': random.randint(85, 95)
-                },
+            # Request windows of this worker, process and database statistics
+            metrics = request.env['acmst.live.metrics'].get_live_metrics()
+            metrics.update({
                 'optimizations': performance_model.get_optimization_status(),
                 'alerts': performance_model.get_performance_alerts()
-            }
+            })
             
             return {
                 'success': True,
@@ -108,7 +87,7 @@ class PerformanceController(http.Controller):
     def run_optimization_check(self):
         """Run optimization check"""
         try:
-            performance_model = request.env['acmst.performance']
+            performance_model = request.env['acmst.performance.optimization']
             
             # Run optimization check
             result = performance_model.run_optimization_check()
@@ -129,7 +108,7 @@ class PerformanceController(http.Controller):
     def export_performance_report(self):
         """Export performance report"""
         try:
-            performance_model = request.env['acmst.performance']
+            performance_model = request.env['acmst.performance.optimization']
             
             # Generate performance report
             report_data = performance_model.generate_performance_report()
@@ -153,7 +132,7 @@ class PerformanceController(http.Controller):
     def performance_dashboard(self):
         """Performance monitoring dashboard"""
         try:
-            performance_model = request.env['acmst.performance']
+            performance_model = request.env['acmst.performance.optimization']
             
             # Get performance data
             optimizations = performance_model.search([])
@@ -173,7 +152,7 @@ class PerformanceController(http.Controller):
     def get_optimization_status(self):
         """Get optimization status"""
         try:
-            performance_model = request.env['acmst.performance']
+            performance_model = request.env['acmst.performance.optimization']
             
             status = performance_model.get_optimization_status()
             
@@ -192,7 +171,7 @@ class PerformanceController(http.Controller):
     def get_performance_alerts(self):
         """Get performance alerts"""
         try:
-            performance_model = request.env['acmst.performance']
+            performance_model = request.env['acmst.performance.optimization']
             
             alerts = performance_model.get_performance_alerts()
             
@@ -212,7 +191,7 @@ class PerformanceController(http.Controller):
         """Optimize performance"""
         try:
             if optimization_id:
-                performance_model = request.env['acmst.performance']
+                performance_model = request.env['acmst.performance.optimization']
                 optimization = performance_model.browse(optimization_id)
                 
                 if optimization.exists():
@@ -243,7 +222,7 @@ class PerformanceController(http.Controller):
     def run_benchmark(self):
         """Run performance benchmark"""
         try:
-            performance_model = request.env['acmst.performance']
+            performance_model = request.env['acmst.performance.optimization']
             
             # Run benchmark tests
             benchmark_results = performance_model.run_benchmark_tests()
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    # Health check pictures are no longer stored copies of the admission file picture
+    cr.execute("""
+        DELETE FROM ir_attachment
+        WHERE res_model = 'acmst.health.check' AND res_field = 'profile_picture'
+    """)
+    _logger.info(f'Removed {cr.rowcount} copied health check profile pictures')
@@ -2,15 +2,25 @@
 # Copyright 2024 ACMST College
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from . import acmst_numbering
+from . import acmst_audit_mixin
 from . import acmst_admission_file
+from . import acmst_admission_stats
 from . import acmst_health_check
 from . import acmst_coordinator_condition
 from . import acmst_admission_approval
 from . import acmst_portal_application
 from . import acmst_workflow_engine
 from . import acmst_audit_log
+from . import acmst_live_metrics
 from . import acmst_performance
+from . import acmst_statistics
+from . import acmst_catalogue
 from . import acmst_dashboard
 from . import acmst_guardian
 from . import acmst_pending_email
+from . import acmst_mail_queue
 from . import acmst_document
+from . import acmst_document_upload
+from . import acmst_rate_limit
+from . import acmst_index_registry
@@ -120,13 +120,14 @@ class AcmstAdmissionApproval(models.Model):
             if record.approval_date and record.approval_date > fields.Datetime.now():
                 raise ValidationError(_('Approval date cannot be in the future.'))
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Override create to set approver if not provided"""
-        if 'approver_id' not in vals or not vals['approver_id']:
-            vals['approver_id'] = self.env.user.id
-        
-        return super().create(vals)
+        for vals in vals_list:
+            if 'approver_id' not in vals or not vals['approver_id']:
+                vals['approver_id'] = self.env.user.id
+
+        return super().create(vals_list)
 
     def action_view_admission_file(self):
         """Action to view the related admission file"""
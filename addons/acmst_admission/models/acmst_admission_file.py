@@ -8,13 +8,15 @@ from odoo.http import request
 from datetime import datetime, date
 import logging
 
+from .acmst_admission_stats import STATS_KEY_FIELDS
+
 _logger = logging.getLogger(__name__)
 
 
 class AcmstAdmissionFile(models.Model):
     _name = 'acmst.admission.file'
     _description = 'Admission File'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'acmst.audit.mixin']
     _order = 'create_date desc'
     _rec_name = 'name'
 
@@ -22,6 +24,30 @@ class AcmstAdmissionFile(models.Model):
         ('name_unique', 'unique(name)', 'File number must be unique!'),
     ]
 
+    # Activity scheduled when an admission file enters a state: (type xmlid, summary, note)
+    _STATE_ACTIVITIES = {
+        'health_required': ('acmst_admission.mail_activity_health_check', 'Health Check Required',
+                            'Admission file requires health check examination.'),
+        'coordinator_review': ('acmst_admission.mail_activity_coordinator_review', 'Coordinator Review Required',
+                               'Admission file requires academic coordinator review.'),
+        'manager_review': ('acmst_admission.mail_activity_manager_review', 'Manager Review Required',
+                           'Admission file requires final manager approval.'),
+    }
+
+    # Fields whose changes are logged as diffs by acmst.audit.mixin
+    _audit_fields = ('state', 'university_id', 'program_id', 'batch_id', 'applicant_name_english',
+                     'applicant_name_arabic', 'national_id', 'phone', 'email', 'academic_level',
+                     'coordinator_recommended_level', 'admission_type')
+
+    # Binary fields copied from the portal application by sharing their stored files
+    _SHARED_BINARY_FIELDS = ['profile_picture', 'profile_picture_128', 'profile_picture_512', 'id_document']
+
+    # Fields every admission file needs, checked before anything is created
+    _CREATE_REQUIRED_FIELDS = ['program_id', 'batch_id', 'applicant_name_english', 'applicant_name_arabic',
+                               'phone', 'email', 'birth_date', 'gender', 'nationality', 'id_type',
+                               'national_id', 'address', 'emergency_contact', 'emergency_phone',
+                               'admission_type']
+
     # Core fields
     name = fields.Char(
         string=_('File Number'),
@@ -59,11 +85,11 @@ class AcmstAdmissionFile(models.Model):
     id_document = fields.Binary(
         string=_('ID Document'),
         help=_('Upload National ID or Passport copy'),
-        required=False,
-        tracking=True
+        required=False
     )
     id_document_filename = fields.Char(
         string=_('ID Document Filename'),
+        tracking=True,
         help=_('Filename of the uploaded ID document')
     )
     phone = fields.Char(
@@ -125,49 +151,41 @@ class AcmstAdmissionFile(models.Model):
     total_applications = fields.Integer(
         string=_('Total Applications'),
         compute='_compute_dashboard_statistics',
-        store=True,
         help=_('Total number of applications')
     )
     pending_review = fields.Integer(
         string=_('Pending Review'),
         compute='_compute_dashboard_statistics',
-        store=True,
         help=_('Number of applications pending review')
     )
     health_required = fields.Integer(
         string=_('Health Required'),
         compute='_compute_dashboard_statistics',
-        store=True,
         help=_('Number of applications requiring health check')
     )
     coordinator_review = fields.Integer(
         string=_('Coordinator Review'),
         compute='_compute_dashboard_statistics',
-        store=True,
         help=_('Number of applications in coordinator review')
     )
     manager_review = fields.Integer(
         string=_('Manager Review'),
         compute='_compute_dashboard_statistics',
-        store=True,
         help=_('Number of applications in manager review')
     )
     ministry_pending_total = fields.Integer(
         string=_('Ministry Pending (Total)'),
         compute='_compute_dashboard_statistics',
-        store=True,
         help=_('Number of applications pending ministry approval')
     )
     completed = fields.Integer(
         string=_('Completed'),
         compute='_compute_dashboard_statistics',
-        store=True,
         help=_('Number of completed applications')
     )
     rejected = fields.Integer(
         string=_('Rejected'),
         compute='_compute_admission_manager_statistics',
-        store=True,
         help=_('Number of rejected applications')
     )
 
@@ -175,25 +193,21 @@ class AcmstAdmissionFile(models.Model):
     new_applications_count = fields.Integer(
         string=_('New Applications'),
         compute='_compute_officer_statistics',
-        store=True,
         help=_('Number of new applications')
     )
     ministry_pending_count = fields.Integer(
         string=_('Ministry Pending'),
         compute='_compute_officer_statistics',
-        store=True,
         help=_('Number of applications pending ministry approval')
     )
     ministry_approved_count = fields.Integer(
         string=_('Ministry Approved'),
         compute='_compute_officer_statistics',
-        store=True,
         help=_('Number of ministry approved applications')
     )
     ministry_rejected_count = fields.Integer(
         string=_('Ministry Rejected'),
         compute='_compute_officer_statistics',
-        store=True,
         help=_('Number of ministry rejected applications')
     )
 
@@ -201,37 +215,31 @@ class AcmstAdmissionFile(models.Model):
     total_reviews = fields.Integer(
         string=_('Total Reviews'),
         compute='_compute_coordinator_statistics',
-        store=True,
         help=_('Total number of coordinator reviews')
     )
     pending_review_count = fields.Integer(
         string=_('Pending Review'),
         compute='_compute_coordinator_statistics',
-        store=True,
         help=_('Number of applications pending coordinator review')
     )
     approved_count = fields.Integer(
         string=_('Approved'),
         compute='_compute_coordinator_statistics',
-        store=True,
         help=_('Number of applications approved by coordinator')
     )
     conditional_count = fields.Integer(
         string=_('Conditional'),
         compute='_compute_coordinator_statistics',
-        store=True,
         help=_('Number of applications with conditional approval')
     )
     my_reviews_count = fields.Integer(
         string=_('My Reviews'),
         compute='_compute_coordinator_statistics',
-        store=True,
         help=_('Number of reviews assigned to current user')
     )
     approved_total = fields.Integer(
         string=_('Approved (Total)'),
         compute='_compute_dashboard_statistics',
-        store=True,
         help=_('Number of approved applications')
     )
 
@@ -455,6 +463,22 @@ class AcmstAdmissionFile(models.Model):
         string=_('Profile Picture Filename'),
         help=_('Name of the profile picture file')
     )
+    profile_picture_128 = fields.Image(
+        string=_('Profile Picture 128'),
+        related='profile_picture',
+        max_width=128,
+        max_height=128,
+        store=True,
+        help=_('Profile picture resized for lists and kanban cards')
+    )
+    profile_picture_512 = fields.Image(
+        string=_('Profile Picture 512'),
+        related='profile_picture',
+        max_width=512,
+        max_height=512,
+        store=True,
+        help=_('Profile picture resized for forms and portal pages')
+    )
     health_check_date = fields.Date(
         string=_('Health Check Date'),
         help=_('Date when health check was completed')
@@ -623,47 +647,42 @@ class AcmstAdmissionFile(models.Model):
             record.applicant_name = record.applicant_name_english or ''
 
     @api.model
-    def create(self, vals):
-        """Override create to generate file number and validate required fields"""
-        _logger.info(f"Creating new admission file with vals: {vals}")
-
-        if vals.get('name', _('New')) == _('New'):
-            # Generate unique admission file number
-            sequence_code = 'acmst.admission.file'
-            while True:
-                sequence_number = self.env['ir.sequence'].next_by_code(sequence_code)
-                if sequence_number and not self.search([('name', '=', sequence_number)], limit=1):
-                    vals['name'] = sequence_number
-                    break
-                elif not sequence_number:
-                    vals['name'] = _('New')
-                    break
-            _logger.info(f"Generated admission file number: {vals['name']}")
+    def _get_missing_required_fields(self, vals):
+        """Return the labels of the required fields missing from ``vals``"""
+        return [self._fields[field].string for field in self._CREATE_REQUIRED_FIELDS if not vals.get(field)]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to generate file numbers and validate required fields.
+
+        Statistics, audit logs, chatter messages and health checks are
+        written once for the whole batch, so bulk imports pay for them per
+        batch rather than per record.
+        """
+        _logger.info(f"Creating {len(vals_list)} admission file(s)")
+
+        for vals in vals_list:
+            missing_fields = self._get_missing_required_fields(vals)
+            if missing_fields:
+                _logger.error(f"Missing required fields for admission file creation: {missing_fields}")
+                raise ValidationError(
+                    _('The following required fields are missing: %s') % ', '.join(missing_fields)
+                )
 
-        # Validate required fields
-        required_fields = ['program_id', 'batch_id', 'applicant_name_english', 'applicant_name_arabic',
-                          'phone', 'email', 'birth_date', 'gender', 'nationality', 'id_type',
-                          'national_id', 'address', 'emergency_contact', 'emergency_phone',
-                          'admission_type']
-
-        missing_fields = []
-        for field in required_fields:
-            if not vals.get(field):
-                field_label = self._fields[field].string
-                missing_fields.append(field_label)
-
-        if missing_fields:
-            _logger.error(f"Missing required fields for admission file creation: {missing_fields}")
-            raise ValidationError(
-                _('The following required fields are missing: %s') % ', '.join(missing_fields)
-            )
+        for vals in vals_list:
+            if vals.get('name', _('New')) == _('New'):
+                # Uniqueness is enforced by the name_unique constraint
+                vals['name'] = self.env['acmst.numbering']._next_number('acmst.admission.file') or _('New')
 
-        # Create the admission file
-        admission_file = super().create(vals)
-        _logger.info(f"Admission file {admission_file.name} created successfully with state: {admission_file.state}")
+        # Create the admission files
+        self.env['acmst.statistics'].invalidate_statistics(self._name)
+        admission_files = super().create(vals_list)
+        AdmissionStats = self.env['acmst.admission.stats']
+        AdmissionStats._apply_deltas(new_keys=AdmissionStats._get_keys(admission_files))
+        _logger.info(f"Created admission files {', '.join(admission_files.mapped('name'))}")
 
-        # Create audit log entry
-        self.env['acmst.audit.log'].create({
+        # Queue audit log entries
+        self.env['acmst.audit.log']._buffer_logs([{
             'model_name': 'acmst.admission.file',
             'record_id': admission_file.id,
             'record_name': admission_file.name,
@@ -673,130 +692,96 @@ class AcmstAdmissionFile(models.Model):
             'new_values': f'Created new admission file for {admission_file.applicant_name_english}',
             'user_id': self.env.user.id,
             'action_description': f'New admission file created: {admission_file.name}'
-        })
-
-        # Post message to chatter
-        admission_file.message_post(
-            body=f'New admission file created for {admission_file.applicant_name_english}',
-            message_type='comment'
-        )
-
-        # If state is health_required, create health check record
-        if vals.get('state') == 'health_required':
-            _logger.info(f"Creating health check record for admission file {admission_file.name}")
-            admission_file._create_health_check_record()
+        } for admission_file in admission_files])
+
+        # Post messages to chatter
+        admission_files._message_log_batch({
+            admission_file.id: f'New admission file created for {admission_file.applicant_name_english}'
+            for admission_file in admission_files
+        }, message_type='comment')
+
+        # Files created in health_required state get their health check record
+        health_required = admission_files.filtered(lambda admission_file: admission_file.state == 'health_required')
+        if health_required:
+            _logger.info(f"Creating health check records for {len(health_required)} admission file(s)")
+            self.env['acmst.health.check'].create([{
+                'admission_file_id': admission_file.id,
+                'check_date': fields.Datetime.now(),
+                'examiner_id': self.env.user.id,
+                'state': 'draft'
+            } for admission_file in health_required])
 
-        return admission_file
+        return admission_files
 
     def write(self, vals):
-        """Override write to log all changes"""
-        _logger.info(f"Updating admission file {self.name} with vals: {vals}")
-
-        # Get old values before update
-        old_values = {}
-        if 'state' in vals:
-            old_values['state'] = self.state
-        if 'university_id' in vals:
-            old_values['university_id'] = self.university_id
-        if 'is_processing_student' in vals:
-            old_values['is_processing_student'] = self.is_processing_student
-
-        result = super(AcmstAdmissionFile, self).write(vals)
+        """Override write to keep the statistics current; changes are audited by acmst.audit.mixin"""
+        _logger.info(f"Updating {len(self)} admission file(s) with vals: {vals}")
 
-        # Log state changes
-        if 'state' in vals and old_values.get('state') != self.state:
-            _logger.info(f"Admission file {self.name} state changed from {old_values.get('state')} to {self.state}")
-
-            # Create audit log entry for state change
-            self.env['acmst.audit.log'].create({
-                'model_name': 'acmst.admission.file',
-                'record_id': self.id,
-                'record_name': self.name,
-                'action': 'write',
-                'category': 'workflow',
-                'old_values': f"State: {old_values.get('state')}",
-                'new_values': f"State: {self.state}",
-                'user_id': self.env.user.id,
-                'action_description': f'State changed from {old_values.get("state")} to {self.state}'
-            })
-
-            # Post message to chatter
-            self.message_post(
-                body=f'Status changed from {old_values.get("state")} to {self.state}',
-                message_type='comment'
-            )
-
-            # Create activity for state change
-            if self.state == 'health_required':
-                self.activity_schedule(
-                    'acmst_admission.mail_activity_health_check',
-                    summary='Health Check Required',
-                    note=f'Admission file {self.name} requires health check examination.',
-                    user_id=self.env.user.id
-                )
-            elif self.state == 'coordinator_review':
-                self.activity_schedule(
-                    'acmst_admission.mail_activity_coordinator_review',
-                    summary='Coordinator Review Required',
-                    note=f'Admission file {self.name} requires academic coordinator review.',
-                    user_id=self.env.user.id
-                )
-            elif self.state == 'manager_review':
-                self.activity_schedule(
-                    'acmst_admission.mail_activity_manager_review',
-                    summary='Manager Review Required',
-                    note=f'Admission file {self.name} requires final manager approval.',
-                    user_id=self.env.user.id
-                )
+        AdmissionStats = self.env['acmst.admission.stats']
+        stats_keys_changed = any(fname in vals for fname in STATS_KEY_FIELDS)
+        old_stats_keys = AdmissionStats._get_keys(self) if stats_keys_changed else []
 
-        # Log University ID changes
-        if 'university_id' in vals:
-            _logger.info(f"Admission file {self.name} university ID changed")
-
-            self.env['acmst.audit.log'].create({
-                'model_name': 'acmst.admission.file',
-                'record_id': self.id,
-                'record_name': self.name,
-                'action': 'write',
-                'category': 'data_modification',
-                'old_values': f"University ID: {old_values.get('university_id', 'None')}",
-                'new_values': f"University ID: {self.university_id}",
-                'user_id': self.env.user.id,
-                'action_description': 'University ID updated'
-            })
-
-            self.message_post(
-                body=f'University ID updated to {self.university_id}',
-                message_type='comment'
-            )
+        result = super(AcmstAdmissionFile, self).write(vals)
+        self.env['acmst.statistics'].invalidate_statistics(self._name)
+        if stats_keys_changed:
+            AdmissionStats._apply_deltas(old_stats_keys, AdmissionStats._get_keys(self))
 
         return result
 
+    def _on_audited_changes(self, diffs):
+        """Post the state and University ID changes and schedule the activities of the new states"""
+        super()._on_audited_changes(diffs)
+        messages = {}
+        for record_id, diff in diffs.items():
+            lines = []
+            if 'state' in diff:
+                lines.append(f"Status changed from {diff['state']['old']} to {diff['state']['new']}")
+            if 'university_id' in diff:
+                lines.append(f"University ID updated to {diff['university_id']['new']}")
+            if lines:
+                messages[record_id] = '<br/>'.join(lines)
+        if messages:
+            self.browse(list(messages))._message_log_batch(messages, message_type='comment')
+
+        changed_states = self.filtered(lambda record: 'state' in diffs[record.id])
+        if changed_states:
+            _logger.info(f"{len(changed_states)} admission file(s) changed state")
+            # Create activities for state change, one batch per activity type
+            for state, records in changed_states.grouped('state').items():
+                if state in self._STATE_ACTIVITIES:
+                    act_type_xmlid, summary, note = self._STATE_ACTIVITIES[state]
+                    records.activity_schedule(act_type_xmlid, summary=summary, note=note, user_id=self.env.user.id)
+
     def unlink(self):
         """Override unlink to log deletions"""
+        # Queue audit log entries for deletion
+        self.env['acmst.audit.log']._buffer_logs([{
+            'model_name': 'acmst.admission.file',
+            'record_id': record.id,
+            'record_name': record.name,
+            'action': 'unlink',
+            'category': 'data_modification',
+            'old_values': f'Admission file: {record.name} for {record.applicant_name_english}',
+            'new_values': '',
+            'user_id': self.env.user.id,
+            'action_description': f'Admission file deleted: {record.name}'
+        } for record in self])
+
         for record in self:
             _logger.warning(f"Deleting admission file {record.name} for applicant {record.applicant_name_english}")
 
-            # Create audit log entry for deletion
-            self.env['acmst.audit.log'].create({
-                'model_name': 'acmst.admission.file',
-                'record_id': record.id,
-                'record_name': record.name,
-                'action': 'unlink',
-                'category': 'data_deletion',
-                'old_values': f'Admission file: {record.name} for {record.applicant_name_english}',
-                'new_values': '',
-                'user_id': self.env.user.id,
-                'action_description': f'Admission file deleted: {record.name}'
-            })
-
-            # Post message to chatter before deletion
-            record.message_post(
-                body=f'Admission file {record.name} has been deleted',
-                message_type='comment'
-            )
-
-        return super(AcmstAdmissionFile, self).unlink()
+        # Post messages to chatter before deletion
+        self._message_log_batch({
+            record.id: f'Admission file {record.name} has been deleted'
+            for record in self
+        }, message_type='comment')
+
+        AdmissionStats = self.env['acmst.admission.stats']
+        old_stats_keys = AdmissionStats._get_keys(self)
+        self.env['acmst.statistics'].invalidate_statistics(self._name)
+        result = super(AcmstAdmissionFile, self).unlink()
+        AdmissionStats._apply_deltas(old_keys=old_stats_keys)
+        return result
 
     @api.constrains('national_id')
     def _check_national_id(self):
@@ -983,7 +968,7 @@ class AcmstAdmissionFile(models.Model):
             'model_name': 'acmst.admission.file',
             'record_id': self.id,
             'record_name': self.name,
-            'action': 'action_submit_ministry',
+            'action': 'workflow',
             'category': 'workflow',
             'old_values': f'State: {self.state}',
             'new_values': 'State: ministry_pending',
@@ -1026,7 +1011,7 @@ class AcmstAdmissionFile(models.Model):
             'model_name': 'acmst.admission.file',
             'record_id': self.id,
             'record_name': self.name,
-            'action': 'action_ministry_approve',
+            'action': 'workflow',
             'category': 'workflow',
             'old_values': f'State: {self.state}',
             'new_values': f'State: {self.state} (wizard opened)',
@@ -1609,31 +1594,65 @@ class AcmstAdmissionFile(models.Model):
             }
             self.env['acmst.health.check'].create(health_check_vals)
 
-    def _safe_send_mail(self, template_ref, record_id=None, force_send=True):
-        """Safely send email with proper error handling - NEVER raises exceptions"""
+    def get_picture_url(self, size=128):
+        """Get the cacheable URL of the resized profile picture"""
+        self.ensure_one()
+        unique = int(self.write_date.timestamp()) if self.write_date else 0
+        return f'/admission/preview/acmst.admission.file/{self.id}/{size}?unique={unique}'
+
+    def _share_binary_fields(self, source, field_names=None):
+        """Make binary ``field_names`` of this file reference the attachments of ``source``.
+
+        Attachments are created for the existing filestore files, so copying a
+        portal application into an admission file neither reads nor duplicates
+        the documents; both records share content with the same checksum.
+        """
+        self.ensure_one()
+        field_names = field_names or self._SHARED_BINARY_FIELDS
+        Attachment = self.env['ir.attachment'].sudo()
+        sources = Attachment.search([
+            ('res_model', '=', source._name),
+            ('res_id', '=', source.id),
+            ('res_field', 'in', field_names),
+        ])
+        current = Attachment.search([
+            ('res_model', '=', self._name),
+            ('res_id', '=', self.id),
+            ('res_field', 'in', field_names),
+        ])
+        source_keys = {(attachment.res_field, attachment.checksum) for attachment in sources}
+        current_keys = {(attachment.res_field, attachment.checksum) for attachment in current}
+        # Only attachments whose content changed are replaced
+        current.filtered(lambda attachment: (attachment.res_field, attachment.checksum) not in source_keys).unlink()
+        sources = sources.filtered(lambda attachment: (attachment.res_field, attachment.checksum) not in current_keys)
+
+        Upload = self.env['acmst.document.upload']
+        for attachment in sources:
+            vals = {
+                'name': attachment.res_field,
+                'mimetype': attachment.mimetype,
+                'res_model': self._name,
+                'res_field': attachment.res_field,
+                'res_id': self.id,
+            }
+            if attachment.store_fname:
+                Upload._create_stored_attachment(vals, attachment.store_fname, attachment.file_size, attachment.checksum)
+            else:
+                Attachment.create(dict(vals, raw=attachment.raw))
+        self.invalidate_recordset(field_names)
+
+    def _safe_send_mail(self, template_ref, record_id=None, force_send=False):
+        """Safely queue email with proper error handling - NEVER raises exceptions"""
         try:
             template = self.env.ref(template_ref, False)
             if not template:
                 _logger.warning(f'Template {template_ref} not found.')
                 return False
 
-            # Check if there's an active mail server before sending
-            mail_server = self.env['ir.mail_server'].search([('active', '=', True)], order='sequence', limit=1)
-            if not mail_server:
-                # Create pending email instead of skipping
-                _logger.warning(f'No active mail server configured. Creating pending email for template {template_ref}.')
-                try:
-                    self._create_pending_email(template_ref, record_id or self.id)
-                except (ValidationError, UserError) as e:
-                    _logger.error(f'Validation error creating pending email for template {template_ref}: {str(e)}')
-                except Exception as e:
-                    _logger.error(f'Unexpected error creating pending email for template {template_ref}: {str(e)}')
-                return False
-
-            # Try to send the email
+            # Render and queue the email, delivered by the mail queue cron
             try:
-                template.send_mail(record_id or self.id, force_send=force_send)
-                _logger.info(f'Successfully sent email using template {template_ref}')
+                self.env['acmst.mail.queue'].enqueue(template, [record_id or self.id], force_send=force_send)
+                _logger.info(f'Successfully queued email using template {template_ref}')
                 return True
             except (ValidationError, UserError) as e:
                 _logger.warning(f'Validation error sending email using template {template_ref}: {str(e)}')
@@ -1996,66 +2015,49 @@ class AcmstAdmissionFile(models.Model):
 
     def _compute_dashboard_statistics(self):
         """Compute dashboard statistics"""
-        # Get global statistics once
-        total_applications = self.env['acmst.admission.file'].search_count([])
-        pending_review = self.env['acmst.admission.file'].search_count([('state', '=', 'ministry_pending')])
-        health_required = self.env['acmst.admission.file'].search_count([('state', '=', 'health_required')])
-        coordinator_review = self.env['acmst.admission.file'].search_count([('state', '=', 'coordinator_review')])
-        manager_review = self.env['acmst.admission.file'].search_count([('state', '=', 'manager_review')])
-        ministry_pending = self.env['acmst.admission.file'].search_count([('state', '=', 'ministry_pending')])
-        completed = self.env['acmst.admission.file'].search_count([('state', '=', 'completed')])
-        
-        # Apply to all records
+        stats = self.env['acmst.statistics'].get_admission_file_statistics()
         for record in self:
-            record.total_applications = total_applications
-            record.pending_review = pending_review
-            record.health_required = health_required
-            record.coordinator_review = coordinator_review
-            record.manager_review = manager_review
-            record.ministry_pending_total = ministry_pending
-            record.completed = completed
-
+            record.total_applications = stats['total']
+            record.pending_review = stats['ministry_pending']
+            record.health_required = stats['health_required']
+            record.coordinator_review = stats['coordinator_review']
+            record.manager_review = stats['manager_review']
+            record.ministry_pending_total = stats['ministry_pending']
+            record.completed = stats['completed']
+
+    @api.depends_context('uid')
     def _compute_coordinator_statistics(self):
         """Compute coordinator dashboard statistics"""
-        # Get global statistics once
-        pending_review_count = self.env['acmst.admission.file'].search_count([('state', '=', 'coordinator_review')])
-        total_reviews = self.env['acmst.admission.file'].search_count([('coordinator_id', '=', self.env.user.id)])
-        approved_count = self.env['acmst.admission.file'].search_count([('coordinator_id', '=', self.env.user.id), ('state', 'in', ['coordinator_approved', 'manager_review', 'manager_approved', 'manager_rejected', 'completed'])])
-        conditional_count = self.env['acmst.admission.file'].search_count([('coordinator_id', '=', self.env.user.id), ('state', 'in', ['coordinator_conditional', 'manager_review', 'manager_approved', 'manager_rejected', 'completed'])])
-        my_reviews_count = self.env['acmst.admission.file'].search_count([('coordinator_id', '=', self.env.user.id)])
-        approved_total = self.env['acmst.admission.file'].search_count([('state', '=', 'manager_approved')])
-
-        # Apply to all records
+        stats = self.env['acmst.statistics'].get_admission_file_statistics()
         for record in self:
-            record.pending_review_count = pending_review_count
-            record.total_reviews = total_reviews
-            record.approved_count = approved_count
-            record.conditional_count = conditional_count
-            record.my_reviews_count = my_reviews_count
-            record.approved_total = approved_total
+            record.pending_review_count = stats['coordinator_review']
+            record.total_reviews = stats['my_reviews']
+            record.approved_count = stats['my_coordinator_approved']
+            record.conditional_count = stats['my_coordinator_conditional']
+            record.my_reviews_count = stats['my_reviews']
+            record.approved_total = stats['manager_approved']
 
     # Coordinator Dashboard Additional Statistics
     coordinator_review_rate = fields.Float(
         string='Review Rate',
         compute='_compute_coordinator_performance_stats',
-        store=True,
         help='Coordinator review completion rate percentage'
     )
     active_conditions_count = fields.Integer(
         string='Active Conditions',
         compute='_compute_coordinator_performance_stats',
-        store=True,
         help='Number of active conditions assigned to coordinator'
     )
     overdue_conditions_count = fields.Integer(
         string='Overdue Conditions',
         compute='_compute_coordinator_performance_stats',
-        store=True,
         help='Number of overdue conditions assigned to coordinator'
     )
 
+    @api.depends_context('uid')
     def _compute_coordinator_performance_stats(self):
         """Compute coordinator performance statistics"""
+        condition_stats = self.env['acmst.statistics'].get_coordinator_condition_statistics()
         for record in self:
             # Review rate calculation
             total_my_reviews = record.my_reviews_count
@@ -2066,40 +2068,32 @@ class AcmstAdmissionFile(models.Model):
                 record.coordinator_review_rate = 0.0
             
             # Conditions statistics
-            record.active_conditions_count = self.env['acmst.coordinator.condition'].search_count([
-                ('coordinator_id', '=', self.env.user.id),
-                ('state', 'in', ['pending', 'in_progress'])
-            ])
-            record.overdue_conditions_count = self.env['acmst.coordinator.condition'].search_count([
-                ('coordinator_id', '=', self.env.user.id),
-                ('state', '=', 'overdue')
-            ])
+            record.active_conditions_count = condition_stats['my_active']
+            record.overdue_conditions_count = condition_stats['my_overdue']
 
     def _compute_officer_statistics(self):
         """Compute officer dashboard statistics"""
+        stats = self.env['acmst.statistics'].get_admission_file_statistics()
         for record in self:
-            record.new_applications_count = self.search_count([('state', '=', 'new')])
-            record.ministry_pending_count = self.search_count([('state', '=', 'ministry_pending')])
-            record.ministry_approved_count = self.search_count([('state', '=', 'ministry_approved')])
-            record.ministry_rejected_count = self.search_count([('state', '=', 'ministry_rejected')])
+            record.new_applications_count = stats['new']
+            record.ministry_pending_count = stats['ministry_pending']
+            record.ministry_approved_count = stats['ministry_approved']
+            record.ministry_rejected_count = stats['ministry_rejected']
 
     # Officer Dashboard Additional Statistics
     officer_processing_rate = fields.Float(
         string='Processing Rate',
         compute='_compute_officer_processing_stats',
-        store=True,
         help='Officer processing rate percentage'
     )
     today_applications_count = fields.Integer(
         string="Today's Applications",
         compute='_compute_officer_processing_stats',
-        store=True,
         help='Number of applications received today'
     )
     week_applications_count = fields.Integer(
         string='This Week Applications',
         compute='_compute_officer_processing_stats',
-        store=True,
         help='Number of applications received this week'
     )
 
@@ -2130,165 +2124,155 @@ class AcmstAdmissionFile(models.Model):
 
     def _compute_admission_manager_statistics(self):
         """Compute admission manager dashboard statistics"""
+        stats = self.env['acmst.statistics'].get_admission_file_statistics()
         for record in self:
-            record.rejected = self.search_count([('state', 'in', ['ministry_rejected', 'health_rejected', 'coordinator_rejected', 'manager_rejected'])])
+            record.rejected = stats['rejected']
 
     # Manager Dashboard Additional Statistics
     manager_pending_count = fields.Integer(
         string='Manager Pending',
         compute='_compute_manager_statistics',
-        store=True,
         help='Number of applications pending manager review'
     )
     manager_approvals_count = fields.Integer(
         string='My Approvals',
         compute='_compute_manager_statistics',
-        store=True,
         help='Number of applications approved by current manager'
     )
     manager_approval_rate = fields.Float(
         string='Approval Rate',
         compute='_compute_manager_statistics',
-        store=True,
         help='Manager approval rate percentage'
     )
     processing_students_count = fields.Integer(
         string='Processing Students',
         compute='_compute_manager_statistics',
-        store=True,
         help='Number of processing students (من طلاب المعالجات)'
     )
     student_records_count = fields.Integer(
         string='Student Records',
         compute='_compute_manager_statistics',
-        store=True,
         help='Number of created student records'
     )
 
+    @api.depends_context('uid')
     def _compute_manager_statistics(self):
         """Compute manager dashboard statistics"""
+        stats = self.env['acmst.statistics'].get_admission_file_statistics()
+        # Student records
+        student_records_count = self.env['res.partner'].search_count([
+            ('is_company', '=', False),
+            ('comment', 'ilike', 'Admission File:')
+        ])
         for record in self:
             # Manager pending reviews
-            record.manager_pending_count = self.env['acmst.admission.file'].search_count([('state', '=', 'manager_review')])
+            record.manager_pending_count = stats['manager_review']
             
             # Manager approvals
-            record.manager_approvals_count = self.env['acmst.admission.file'].search_count([
-                ('manager_id', '=', self.env.user.id),
-                ('state', 'in', ['manager_approved', 'completed'])
-            ])
+            record.manager_approvals_count = stats['my_manager_approvals']
             
             # Approval rate calculation
-            total_manager_reviews = self.env['acmst.admission.file'].search_count([('manager_id', '=', self.env.user.id)])
+            total_manager_reviews = stats['my_manager_reviews']
             if total_manager_reviews > 0:
                 record.manager_approval_rate = (record.manager_approvals_count / total_manager_reviews) * 100
             else:
                 record.manager_approval_rate = 0.0
             
             # Processing students
-            record.processing_students_count = self.env['acmst.admission.file'].search_count([('is_processing_student', '=', True)])
+            record.processing_students_count = stats['processing_students']
             
-            # Student records
-            record.student_records_count = self.env['res.partner'].search_count([
-                ('is_company', '=', False),
-                ('comment', 'ilike', 'Admission File:')
-            ])
+            record.student_records_count = student_records_count
 
     # Reports Dashboard Statistics (computed fields)
     program_count = fields.Integer(
         string='Programs',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of active programs'
     )
     batch_count = fields.Integer(
         string='Batches',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of active batches'
     )
     health_checks_count = fields.Integer(
         string='Health Checks',
         compute='_compute_reports_statistics',
-        store=True,
         help='Total number of health checks'
     )
     health_approved_count = fields.Integer(
         string='Health Approved',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of approved health checks'
     )
     health_pending_count = fields.Integer(
         string='Health Pending',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of pending health checks'
     )
     health_rejected_count = fields.Integer(
         string='Health Rejected',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of rejected health checks'
     )
     conditions_count = fields.Integer(
         string='Conditions',
         compute='_compute_reports_statistics',
-        store=True,
         help='Total number of coordinator conditions'
     )
     conditions_completed_count = fields.Integer(
         string='Conditions Completed',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of completed conditions'
     )
     conditions_pending_count = fields.Integer(
         string='Conditions Pending',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of pending conditions'
     )
     conditions_overdue_count = fields.Integer(
         string='Conditions Overdue',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of overdue conditions'
     )
     level2_count = fields.Integer(
         string='Level 2 Applications',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of Level 2 applications'
     )
     level3_count = fields.Integer(
         string='Level 3 Applications',
         compute='_compute_reports_statistics',
-        store=True,
         help='Number of Level 3 applications'
     )
 
     def _compute_reports_statistics(self):
         """Compute reports dashboard statistics"""
+        statistics = self.env['acmst.statistics']
+        stats = statistics.get_admission_file_statistics()
+        health_stats = statistics.get_health_check_statistics()
+        condition_stats = statistics.get_coordinator_condition_statistics()
+        # Program and batch counts
+        program_count = self.env['acmst.program'].search_count([])
+        batch_count = self.env['acmst.batch'].search_count([])
         for record in self:
-            # Program and batch counts
-            record.program_count = self.env['acmst.program'].search_count([])
-            record.batch_count = self.env['acmst.batch'].search_count([])
+            record.program_count = program_count
+            record.batch_count = batch_count
             
             # Health check statistics
-            record.health_checks_count = self.env['acmst.health.check'].search_count([])
-            record.health_approved_count = self.env['acmst.health.check'].search_count([('state', '=', 'approved')])
-            record.health_pending_count = self.env['acmst.health.check'].search_count([('state', '=', 'draft')])
-            record.health_rejected_count = self.env['acmst.health.check'].search_count([('state', '=', 'rejected')])
+            record.health_checks_count = health_stats['total']
+            record.health_approved_count = health_stats['approved']
+            record.health_pending_count = health_stats['draft']
+            record.health_rejected_count = health_stats['rejected']
             
             # Coordinator conditions statistics
-            record.conditions_count = self.env['acmst.coordinator.condition'].search_count([])
-            record.conditions_completed_count = self.env['acmst.coordinator.condition'].search_count([('state', '=', 'completed')])
-            record.conditions_pending_count = self.env['acmst.coordinator.condition'].search_count([('state', '=', 'pending')])
-            record.conditions_overdue_count = self.env['acmst.coordinator.condition'].search_count([('state', '=', 'overdue')])
+            record.conditions_count = condition_stats['total']
+            record.conditions_completed_count = condition_stats['completed']
+            record.conditions_pending_count = condition_stats['pending']
+            record.conditions_overdue_count = condition_stats['overdue']
             
             # Academic level statistics
-            record.level2_count = self.search_count([('academic_level', '=', 'level2')])
-            record.level3_count = self.search_count([('academic_level', '=', 'level3')])
+            record.level2_count = stats['level2']
+            record.level3_count = stats['level3']
 
     # Reports Dashboard Action Methods
     def action_view_application_statistics(self):
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, fields, api
+from collections import Counter
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Admission file fields making up the counter key, in column order
+STATS_KEY_FIELDS = ['state', 'program_id', 'batch_id', 'coordinator_id', 'manager_id']
+
+
+class AcmstAdmissionStats(models.Model):
+    """Materialized admission file counters.
+
+    One row per (state, program, batch, coordinator, manager) combination
+    holding the number of admission files in it. Rows are maintained by delta
+    from the admission file create, write and unlink overrides, inside the
+    same transaction, so dashboards read a handful of rows instead of
+    scanning the admission file table.
+    """
+    _name = 'acmst.admission.stats'
+    _description = 'Admission Statistics Counter'
+    _log_access = False
+
+    state = fields.Selection(
+        selection=lambda self: self.env['acmst.admission.file']._fields['state'].selection,
+        string='State',
+        required=True,
+        readonly=True
+    )
+    program_id = fields.Many2one('acmst.program', string='Program', readonly=True, ondelete='cascade')
+    batch_id = fields.Many2one('acmst.batch', string='Batch', readonly=True, ondelete='cascade')
+    coordinator_id = fields.Many2one('res.users', string='Coordinator', readonly=True, ondelete='cascade')
+    manager_id = fields.Many2one('res.users', string='Manager', readonly=True, ondelete='cascade')
+    count = fields.Integer(string='Count', default=0, readonly=True)
+
+    def init(self):
+        """Create the counter key index and rebuild counters from admission files"""
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS acmst_admission_stats_key_uniq
+            ON acmst_admission_stats (state, COALESCE(program_id, 0), COALESCE(batch_id, 0),
+                                      COALESCE(coordinator_id, 0), COALESCE(manager_id, 0))
+        """)
+        self._rebuild_counters()
+
+    @api.model
+    def _rebuild_counters(self):
+        """Recompute every counter from the admission file table"""
+        self.env['acmst.admission.file'].flush_model(STATS_KEY_FIELDS)
+        self.env.cr.execute("DELETE FROM acmst_admission_stats")
+        self.env.cr.execute("""
+            INSERT INTO acmst_admission_stats (state, program_id, batch_id, coordinator_id, manager_id, count)
+            SELECT state, program_id, batch_id, coordinator_id, manager_id, COUNT(*)
+            FROM acmst_admission_file
+            WHERE state IS NOT NULL
+            GROUP BY state, program_id, batch_id, coordinator_id, manager_id
+        """)
+        self.invalidate_model()
+        _logger.info('Rebuilt %s admission statistics counters', self.env.cr.rowcount)
+
+    @api.model
+    def _get_keys(self, admission_files):
+        """Return the counter key of each admission file, read in one pass"""
+        return [
+            tuple(values[fname] for fname in STATS_KEY_FIELDS)
+            for values in admission_files.read(STATS_KEY_FIELDS, load=None)
+        ]
+
+    @api.model
+    def _apply_deltas(self, old_keys=(), new_keys=()):
+        """Decrement counters of ``old_keys`` and increment those of ``new_keys``"""
+        deltas = Counter(key for key in new_keys if key[0])
+        deltas.subtract(key for key in old_keys if key[0])
+        rows = [key + (delta,) for key, delta in deltas.items() if delta]
+        if not rows:
+            return
+        placeholders = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(rows))
+        self.env.cr.execute(f"""
+            INSERT INTO acmst_admission_stats AS stats (state, program_id, batch_id, coordinator_id, manager_id, count)
+            VALUES {placeholders}
+            ON CONFLICT (state, COALESCE(program_id, 0), COALESCE(batch_id, 0),
+                         COALESCE(coordinator_id, 0), COALESCE(manager_id, 0))
+            DO UPDATE SET count = stats.count + EXCLUDED.count
+        """, [value for row in rows for value in row])
+        self.invalidate_model(['count'])
+        self.env['acmst.statistics'].invalidate_statistics('acmst.admission.file')
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class AcmstAuditMixin(models.AbstractModel):
+    """Audit the changes of the written records as structured diffs.
+
+    The audited fields of the records are read once before and once after
+    each ``write``, and every record with actual changes gets one audit log
+    entry whose ``diff`` holds ``{field: {"old": ..., "new": ...}}`` for the
+    changed fields only. Inheriting models list their audited fields in
+    ``_audit_fields`` and react to the changes in :meth:`_on_audited_changes`
+    instead of re-reading the fields themselves.
+    """
+    _name = 'acmst.audit.mixin'
+    _description = 'Audited Changes Mixin'
+
+    # Names of the fields whose changes are logged
+    _audit_fields = ()
+
+    def _get_audit_snapshot(self, fnames):
+        """JSON-compatible values of ``fnames`` for every record, in one read"""
+        return {
+            values.pop('id'): json.loads(json.dumps(values, default=str))
+            for values in self.read(fnames, load=None)
+        }
+
+    def write(self, vals):
+        fnames = [fname for fname in self._audit_fields if fname in vals]
+        if not fnames or not self:
+            return super().write(vals)
+
+        old_snapshot = self._get_audit_snapshot(fnames)
+        result = super().write(vals)
+        new_snapshot = self._get_audit_snapshot(fnames)
+
+        diffs = {}
+        for record_id, new_values in new_snapshot.items():
+            old_values = old_snapshot[record_id]
+            diff = {
+                fname: {'old': old_values[fname], 'new': new_values[fname]}
+                for fname in fnames if old_values[fname] != new_values[fname]
+            }
+            if diff:
+                diffs[record_id] = diff
+
+        if diffs:
+            changed_records = self.browse(list(diffs))
+            self.env['acmst.audit.log']._buffer_logs([
+                record._get_audit_log_vals(diffs[record.id]) for record in changed_records
+            ])
+            changed_records._on_audited_changes(diffs)
+        return result
+
+    def _get_audit_log_vals(self, diff):
+        """Audit log entry of the changes ``diff`` of this record"""
+        self.ensure_one()
+        if 'state' in diff:
+            category = 'workflow'
+            description = f"State changed from {diff['state']['old']} to {diff['state']['new']}"
+        else:
+            category = 'data_modification'
+            description = f"Updated {', '.join(self._fields[fname].string for fname in diff)}"
+        return {
+            'model_name': self._name,
+            'record_id': self.id,
+            'record_name': self.display_name,
+            'action': 'write',
+            'category': category,
+            'diff': diff,
+            'changed_fields': json.dumps(list(diff)),
+            'old_values': json.dumps({fname: change['old'] for fname, change in diff.items()}),
+            'new_values': json.dumps({fname: change['new'] for fname, change in diff.items()}),
+            'action_description': description,
+        }
+
+    def _on_audited_changes(self, diffs):
+        """Hook called after a write with the ``{record_id: diff}`` of the changed records"""
+        pass
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, fields, api, tools
+import hashlib
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Fields published in the public catalogue, per model
+CATALOGUE_PROGRAM_FIELDS = ['name', 'code']
+CATALOGUE_BATCH_FIELDS = ['name', 'code', 'program_id', 'start_date']
+
+
+class AcmstCatalogue(models.AbstractModel):
+    """Public program and batch catalogue of the admission pages.
+
+    The catalogue is built once per worker process and kept in the registry
+    cache until a program or batch changes, so anonymous page views and the
+    JSON endpoint run no catalogue queries. Its version comes from the
+    latest ``write_date`` and the record count of both models, and is used
+    as HTTP validator.
+    """
+    _name = 'acmst.catalogue'
+    _description = 'Admission Catalogue'
+
+    @api.model
+    @tools.ormcache()
+    def _get_catalogue(self):
+        """Return the catalogue as ``(data, json_body, etag, last_modified)``"""
+        Program = self.env['acmst.program'].sudo()
+        Batch = self.env['acmst.batch'].sudo()
+        programs = Program.search_read([], CATALOGUE_PROGRAM_FIELDS, order='sequence, name')
+        batches = Batch.search_read([('program_id', 'in', [program['id'] for program in programs])],
+                                    CATALOGUE_BATCH_FIELDS, order='start_date desc, name')
+
+        [(program_date, program_count)] = Program.with_context(active_test=False)._read_group(
+            [], aggregates=['write_date:max', '__count'])
+        [(batch_date, batch_count)] = Batch.with_context(active_test=False)._read_group(
+            [], aggregates=['write_date:max', '__count'])
+        last_modified = max(filter(None, [program_date, batch_date]), default=fields.Datetime.now())
+        version = f'{last_modified.isoformat()}-{program_count}-{batch_count}'
+
+        data = {
+            'version': hashlib.sha1(version.encode()).hexdigest()[:16],
+            'programs': programs,
+            'batches': [
+                dict(batch, program_id=batch['program_id'] and batch['program_id'][0],
+                     start_date=fields.Date.to_string(batch['start_date']))
+                for batch in batches
+            ],
+        }
+        body = json.dumps(data).encode()
+        _logger.info(f'Built admission catalogue {data["version"]} with {len(programs)} programs and {len(batches)} batches')
+        return data, body, data['version'], last_modified
+
+    @api.model
+    def get_catalogue(self):
+        """Public program and batch catalogue"""
+        return self._get_catalogue()[0]
+
+    @api.model
+    def invalidate_catalogue(self):
+        """Drop the cached catalogue of every worker"""
+        self.env.registry.clear_cache()
+
+
+class AcmstProgram(models.Model):
+    _inherit = 'acmst.program'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['acmst.catalogue'].invalidate_catalogue()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self.env['acmst.catalogue'].invalidate_catalogue()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env['acmst.catalogue'].invalidate_catalogue()
+        return result
+
+
+class AcmstBatch(models.Model):
+    _inherit = 'acmst.batch'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['acmst.catalogue'].invalidate_catalogue()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self.env['acmst.catalogue'].invalidate_catalogue()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env['acmst.catalogue'].invalidate_catalogue()
+        return result
@@ -98,6 +98,7 @@ class AcmstCoordinatorCondition(models.Model):
     status = fields.Selection([
         ('pending', 'Pending'),
         ('completed', 'Completed'),
+        ('rejected', 'Rejected'),
         ('overdue', 'Overdue')
     ], string='Status', compute='_compute_status', store=True, help='Current status of the condition')
     notes = fields.Text(
@@ -187,12 +188,12 @@ class AcmstCoordinatorCondition(models.Model):
         if self.state != 'pending':
             raise UserError(_('Only pending conditions can be completed.'))
 
-        _logger.info(f"Coordinator condition {self.name} completed by {self.env.user.name}")
+        _logger.info(f"Coordinator condition {self.subject_name} completed by {self.env.user.name}")
         self.write({
             'state': 'completed',
             'completion_date': fields.Date.today()
         })
-        _logger.info(f"Coordinator condition {self.name} state changed to 'completed'")
+        _logger.info(f"Coordinator condition {self.subject_name} state changed to 'completed'")
 
         # Check if all conditions are completed
         _logger.info(f"Checking if all conditions are completed for admission file {self.admission_file_id.name}")
@@ -206,9 +207,9 @@ class AcmstCoordinatorCondition(models.Model):
         if self.state != 'pending':
             raise UserError(_('Only pending conditions can be rejected.'))
 
-        _logger.info(f"Coordinator condition {self.name} rejected by {self.env.user.name}")
+        _logger.info(f"Coordinator condition {self.subject_name} rejected by {self.env.user.name}")
         self.write({'state': 'rejected'})
-        _logger.info(f"Coordinator condition {self.name} state changed to 'rejected'")
+        _logger.info(f"Coordinator condition {self.subject_name} state changed to 'rejected'")
         return True
 
     def action_reset_to_pending(self):
@@ -265,8 +266,19 @@ class AcmstCoordinatorCondition(models.Model):
     @api.model
     def create(self, vals):
         """Override create method"""
+        self.env['acmst.statistics'].invalidate_statistics(self._name)
         return super().create(vals)
 
+    def write(self, vals):
+        """Override write to refresh dashboard statistics"""
+        self.env['acmst.statistics'].invalidate_statistics(self._name)
+        return super().write(vals)
+
+    def unlink(self):
+        """Override unlink to refresh dashboard statistics"""
+        self.env['acmst.statistics'].invalidate_statistics(self._name)
+        return super().unlink()
+
     def get_portal_url(self):
         """Get portal URL for this condition"""
         return request.httprequest.host_url.rstrip('/') + '/admission/conditions/' + str(self.admission_file_id.id)
@@ -114,36 +114,39 @@ class AcmstDashboard(models.Model):
     @api.depends_context('uid')
     def _compute_dashboard_statistics(self):
         """Compute dashboard statistics"""
+        stats = self.env['acmst.statistics'].get_admission_file_statistics()
         for record in self:
-            record.total_applications = self.env['acmst.admission.file'].search_count([])
-            record.pending_review = self.env['acmst.admission.file'].search_count([('state', '=', 'ministry_pending')])
-            record.health_required = self.env['acmst.admission.file'].search_count([('state', '=', 'health_required')])
-            record.coordinator_review = self.env['acmst.admission.file'].search_count([('state', '=', 'coordinator_review')])
-            record.manager_review = self.env['acmst.admission.file'].search_count([('state', '=', 'manager_review')])
-            record.ministry_pending = self.env['acmst.admission.file'].search_count([('state', '=', 'ministry_pending')])
-            record.completed = self.env['acmst.admission.file'].search_count([('state', '=', 'completed')])
+            record.total_applications = stats['total']
+            record.pending_review = stats['ministry_pending']
+            record.health_required = stats['health_required']
+            record.coordinator_review = stats['coordinator_review']
+            record.manager_review = stats['manager_review']
+            record.ministry_pending = stats['ministry_pending']
+            record.completed = stats['completed']
 
     @api.depends_context('uid')
     def _compute_coordinator_statistics(self):
         """Compute coordinator dashboard statistics"""
+        stats = self.env['acmst.statistics'].get_admission_file_statistics()
         for record in self:
-            record.coordinator_pending_count = self.env['acmst.admission.file'].search_count([('state', '=', 'coordinator_review')])
-            record.coordinator_approved_count = self.env['acmst.admission.file'].search_count([('state', '=', 'coordinator_approved')])
-            record.coordinator_conditional_count = self.env['acmst.admission.file'].search_count([('state', '=', 'coordinator_conditional')])
-            record.coordinator_rejected_count = self.env['acmst.admission.file'].search_count([('state', '=', 'coordinator_rejected')])
-            record.coordinator_total_reviews = self.env['acmst.admission.file'].search_count([('state', 'in', ['coordinator_review', 'coordinator_approved', 'coordinator_rejected', 'coordinator_conditional'])])
-            record.my_reviews_count = self.env['acmst.admission.file'].search_count([('coordinator_id', '=', self.env.user.id)])
-            record.approved = self.env['acmst.admission.file'].search_count([('state', '=', 'manager_approved')])
+            record.coordinator_pending_count = stats['coordinator_review']
+            record.coordinator_approved_count = stats['coordinator_approved']
+            record.coordinator_conditional_count = stats['coordinator_conditional']
+            record.coordinator_rejected_count = stats['coordinator_rejected']
+            record.coordinator_total_reviews = stats['coordinator_total_reviews']
+            record.my_reviews_count = stats['my_reviews']
+            record.approved = stats['manager_approved']
 
     @api.depends_context('uid')
     def _compute_health_statistics(self):
         """Compute health check statistics"""
+        stats = self.env['acmst.statistics'].get_health_check_statistics()
         for record in self:
-            record.total_health_checks = self.env['acmst.health.check'].search_count([])
-            record.pending_health_checks_count = self.env['acmst.health.check'].search_count([('state', '=', 'draft')])
-            record.approved_health_checks_count = self.env['acmst.health.check'].search_count([('state', '=', 'approved')])
-            record.rejected_health_checks_count = self.env['acmst.health.check'].search_count([('state', '=', 'rejected')])
-            record.my_health_checks_count = self.env['acmst.health.check'].search_count([('examiner_id', '=', self.env.user.id)])
+            record.total_health_checks = stats['total']
+            record.pending_health_checks_count = stats['draft']
+            record.approved_health_checks_count = stats['approved']
+            record.rejected_health_checks_count = stats['rejected']
+            record.my_health_checks_count = stats['mine']
 
     def action_view_pending_review(self):
         """Open pending review applications"""
@@ -4,10 +4,22 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+import base64
 import logging
+import mimetypes
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
 
 _logger = logging.getLogger(__name__)
 
+# Longest side of the generated thumbnails, in pixels
+THUMBNAIL_SIZES = (128, 512)
+# Seconds allowed to render the first page of a PDF
+PDF_PREVIEW_TIMEOUT = 30
+
 
 class AcmstDocument(models.Model):
     _name = 'acmst.document'
@@ -51,20 +63,51 @@ class AcmstDocument(models.Model):
         help='Admission file this document belongs to'
     )
 
-    # Document metadata
+    # Document metadata, copied from the file attachment so lists never read the content
     file_size = fields.Integer(
         string='File Size (KB)',
-        compute='_compute_file_size',
+        compute='_compute_file_metadata',
         store=True,
         help='Size of the document file in kilobytes'
     )
     mimetype = fields.Char(
         string='MIME Type',
-        compute='_compute_mime_type',
+        compute='_compute_file_metadata',
+        store=True,
+        help='MIME type of the document, sniffed from its content'
+    )
+    checksum = fields.Char(
+        string='Checksum',
+        compute='_compute_file_metadata',
         store=True,
-        help='MIME type of the document'
+        index=True,
+        help='SHA-1 checksum of the document file'
     )
 
+    # Previews, generated in the background so lists and kanbans never load the full scan
+    thumbnail_128 = fields.Image(
+        string='Thumbnail',
+        max_width=128,
+        max_height=128,
+        readonly=True,
+        copy=False,
+        help='Small preview of the document'
+    )
+    thumbnail_512 = fields.Image(
+        string='Preview',
+        max_width=512,
+        max_height=512,
+        readonly=True,
+        copy=False,
+        help='Large preview of the document'
+    )
+    preview_state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Generated'),
+        ('none', 'Not Available')
+    ], string='Preview Status', default='pending', readonly=True, copy=False, index=True,
+        help='Whether previews were generated for the current file')
+
     # Status
     state = fields.Selection([
         ('draft', 'Draft'),
@@ -105,25 +148,28 @@ class AcmstDocument(models.Model):
         help='Whether this is a support document'
     )
 
-    @api.depends('file')
-    def _compute_file_size(self):
-        """Compute file size in KB"""
-        for record in self:
-            if record.file:
-                # Convert bytes to KB
-                record.file_size = len(record.file) / 1024
-            else:
-                record.file_size = 0
-
-    @api.depends('filename')
-    def _compute_mime_type(self):
-        """Compute MIME type from filename"""
+    @api.depends('file', 'filename')
+    def _compute_file_metadata(self):
+        """Copy size, MIME type and checksum from the file attachments, read in one query.
+
+        ir.attachment computes them once when the content is stored, sniffing
+        the MIME type from the first bytes, so the file itself is never read.
+        """
+        attachments = self.env['ir.attachment'].sudo().search_read([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'file'),
+            ('res_id', 'in', self.ids),
+        ], ['res_id', 'file_size', 'mimetype', 'checksum'])
+        metadata = {attachment['res_id']: attachment for attachment in attachments}
         for record in self:
-            if record.filename:
-                import mimetypes
-                record.mimetype = mimetypes.guess_type(record.filename)[0] or 'application/octet-stream'
-            else:
-                record.mimetype = 'application/octet-stream'
+            attachment = metadata.get(record.id)
+            mimetype = attachment and attachment['mimetype']
+            if not mimetype or mimetype == 'application/octet-stream':
+                # Content that could not be sniffed falls back to the filename
+                mimetype = mimetypes.guess_type(record.filename or '')[0] or mimetype or 'application/octet-stream'
+            record.file_size = -(-attachment['file_size'] // 1024) if attachment else 0
+            record.mimetype = mimetype
+            record.checksum = attachment['checksum'] if attachment else False
 
     @api.depends('document_type')
     def _compute_document_category(self):
@@ -139,7 +185,18 @@ class AcmstDocument(models.Model):
         if vals.get('filename') and not vals.get('name'):
             vals['name'] = vals['filename'].split('.')[0]
 
-        return super().create(vals)
+        document = super().create(vals)
+        document._trigger_preview_generation()
+        return document
+
+    def write(self, vals):
+        """Regenerate previews when the file is replaced"""
+        if 'file' in vals:
+            vals = dict(vals, preview_state='pending', thumbnail_128=False, thumbnail_512=False)
+        result = super().write(vals)
+        if 'file' in vals:
+            self._trigger_preview_generation()
+        return result
 
     def action_approve(self):
         """Approve document"""
@@ -164,7 +221,106 @@ class AcmstDocument(models.Model):
             }
         }
 
+    @api.model
+    def _cron_backfill_file_metadata(self, batch_size=1000, auto_commit=None):
+        """Cron job filling the metadata of documents stored before it was recorded.
+
+        Documents without a file attachment have no metadata to copy and are
+        skipped, so they are not scanned again on every run.
+        """
+        if auto_commit is None:
+            auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        total = 0
+        last_id = 0
+        while True:
+            documents = self.sudo().search([
+                ('checksum', '=', False), ('file', '!=', False), ('id', '>', last_id),
+            ], order='id', limit=batch_size)
+            if not documents:
+                break
+            documents._compute_file_metadata()
+            documents.flush_recordset(['file_size', 'mimetype', 'checksum'])
+            total += len(documents)
+            last_id = documents[-1].id
+            if auto_commit:
+                self.env.cr.commit()
+            documents.invalidate_recordset()
+        _logger.info(f'Backfilled file metadata of {total} documents')
+        return total
+
+    def _trigger_preview_generation(self):
+        """Wake the preview cron up once the current transaction commits"""
+        if self.filtered(lambda document: document.preview_state == 'pending'):
+            self._trigger_preview_cron()
+
+    @api.model
+    def _trigger_preview_cron(self):
+        cron = self.env.ref('acmst_admission.cron_generate_document_previews', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+
+    def _render_pdf_preview(self):
+        """Render the first page of the PDF file as a base64 PNG, if poppler's pdftoppm is installed"""
+        self.ensure_one()
+        pdftoppm = shutil.which('pdftoppm')
+        if not pdftoppm:
+            return False
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, 'document.pdf')
+            with open(source, 'wb') as pdf_file:
+                pdf_file.write(base64.b64decode(self.file))
+            subprocess.run([
+                pdftoppm, '-png', '-singlefile', '-f', '1', '-l', '1',
+                '-scale-to', str(max(THUMBNAIL_SIZES)),
+                source, os.path.join(tmpdir, 'preview'),
+            ], check=True, capture_output=True, timeout=PDF_PREVIEW_TIMEOUT)
+            with open(os.path.join(tmpdir, 'preview.png'), 'rb') as preview_file:
+                return base64.b64encode(preview_file.read())
+
+    def _generate_previews(self):
+        """Generate the thumbnails of image documents and the first page preview of PDFs"""
+        for document in self:
+            image = False
+            try:
+                with self.env.cr.savepoint():
+                    if (document.mimetype or '').startswith('image/'):
+                        image = document.file
+                    elif document.mimetype == 'application/pdf':
+                        image = document._render_pdf_preview()
+                    if image:
+                        # The image fields downscale the value to their maximum size
+                        document.write({'thumbnail_128': image, 'thumbnail_512': image, 'preview_state': 'done'})
+            except Exception as e:
+                _logger.warning(f'Could not generate previews of document {document.id}: {str(e)}')
+                image = False
+            if not image:
+                document.write({'preview_state': 'none'})
+
+    @api.model
+    def _cron_generate_previews(self, batch_size=50, auto_commit=None):
+        """Cron job generating pending document previews, ``batch_size`` at a time"""
+        if auto_commit is None:
+            auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        documents = self.sudo().search([('preview_state', '=', 'pending')], order='id', limit=batch_size)
+        for document in documents:
+            document._generate_previews()
+            if auto_commit:
+                self.env.cr.commit()
+        _logger.info(f'Generated previews of {len(documents)} documents')
+
+        if len(documents) == batch_size:
+            self._trigger_preview_cron()
+        return len(documents)
+
     def get_download_url(self):
         """Get download URL for the document"""
         self.ensure_one()
         return f'/web/content/acmst.document/{self.id}/file/{self.filename}'
+
+    def get_preview_url(self, size=128):
+        """Get the cacheable URL of the document thumbnail"""
+        self.ensure_one()
+        unique = int(self.write_date.timestamp()) if self.write_date else 0
+        return f'/admission/preview/acmst.document/{self.id}/{size}?unique={unique}'
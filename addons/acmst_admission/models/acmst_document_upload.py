@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError, UserError
+from odoo.tools.mimetypes import guess_mimetype
+from datetime import timedelta
+import hashlib
+import logging
+import mimetypes
+import os
+import secrets
+
+_logger = logging.getLogger(__name__)
+
+# Largest accepted document, in bytes
+MAX_UPLOAD_SIZE = 25 * 1024 * 1024
+# Chunk size suggested to clients, and the largest chunk accepted
+CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+# Block size used when copying streams, so no file is ever held in memory
+COPY_BLOCK_SIZE = 64 * 1024
+# Unfinished uploads a client (IP address or session) may keep open at once
+MAX_OPEN_UPLOADS = 10
+# Bytes announced by the unfinished uploads of a client, at most
+MAX_PENDING_UPLOAD_SIZE = 100 * 1024 * 1024
+# Upload requests, starts and chunks, a client may burst before being rate limited
+UPLOAD_RATE_LIMIT_CAPACITY = 60
+# Upload requests regained per second, i.e. a sustained rate of 60 per minute
+UPLOAD_RATE_LIMIT_REFILL_RATE = 1.0
+
+
+class AcmstDocumentUpload(models.Model):
+    """Resumable, chunked upload of an admission document.
+
+    Chunks are appended to a part file in the filestore as they arrive and
+    must be sent in order; a client that lost its connection asks for
+    ``next_chunk`` and resumes from there. Once all bytes are received the
+    part file is moved into the filestore and registered as an
+    ``ir.attachment``, without the content ever being loaded or base64
+    encoded in Python. Uploads are reached through their access token, so
+    public applicants can upload before they have an account.
+    """
+    _name = 'acmst.document.upload'
+    _description = 'Document Upload'
+    _order = 'create_date desc'
+
+    name = fields.Char(string='Filename', required=True, help='Original filename of the upload')
+    access_token = fields.Char(
+        string='Access Token',
+        required=True,
+        readonly=True,
+        copy=False,
+        index=True,
+        default=lambda self: secrets.token_urlsafe(24),
+        help='Token identifying the upload for the uploading client'
+    )
+    user_id = fields.Many2one(
+        'res.users',
+        string='Uploaded By',
+        default=lambda self: self.env.user,
+        help='User who started the upload'
+    )
+    document_type = fields.Selection(
+        selection=lambda self: self.env['acmst.document']._fields['document_type'].selection,
+        string='Document Type',
+        default='other',
+        required=True,
+        help='Type of the document created from this upload'
+    )
+    mimetype = fields.Char(string='MIME Type', help='MIME type of the uploaded file')
+    total_size = fields.Integer(string='Total Size', required=True, help='Announced size of the file in bytes')
+    received_size = fields.Integer(string='Received Size', default=0, help='Number of bytes received so far')
+    next_chunk = fields.Integer(string='Next Chunk', default=0, help='Index of the next expected chunk')
+    state = fields.Selection([
+        ('uploading', 'Uploading'),
+        ('done', 'Done'),
+        ('linked', 'Linked'),
+    ], string='Status', default='uploading', required=True, help='Status of the upload')
+    attachment_id = fields.Many2one(
+        'ir.attachment',
+        string='Attachment',
+        readonly=True,
+        ondelete='set null',
+        help='Attachment holding the uploaded file'
+    )
+    ip_address = fields.Char(string='IP Address', readonly=True, index=True, help='IP address of the uploading client')
+    session_key = fields.Char(
+        string='Session Key',
+        readonly=True,
+        index=True,
+        help='Hash of the session of the uploading client'
+    )
+
+    @api.model
+    def start_upload(self, filename, total_size, document_type='other', mimetype=None, ip_address=None, session_key=None):
+        """Open a new upload of ``total_size`` bytes.
+
+        Uploads started for a client, identified by its ``ip_address`` and
+        ``session_key``, are refused once it has too many unfinished uploads
+        or too many pending bytes, so part files cannot fill the filestore
+        before they are garbage collected.
+        """
+        total_size = int(total_size)
+        if total_size <= 0:
+            raise ValidationError(_('The file is empty.'))
+        if total_size > MAX_UPLOAD_SIZE:
+            raise ValidationError(_('The file exceeds the maximum size of %s MB.') % (MAX_UPLOAD_SIZE // (1024 * 1024)))
+        self._check_client_quota(total_size, ip_address=ip_address, session_key=session_key)
+        if document_type not in dict(self._fields['document_type']._description_selection(self.env)):
+            document_type = 'other'
+        upload = self.create({
+            'name': os.path.basename(filename or '') or _('document'),
+            'total_size': total_size,
+            'document_type': document_type,
+            'mimetype': mimetype or mimetypes.guess_type(filename or '')[0],
+            'ip_address': ip_address,
+            'session_key': session_key,
+        })
+        _logger.info(f'Started upload {upload.id} of {upload.name} ({total_size} bytes)')
+        return upload
+
+    @api.model
+    def _check_client_quota(self, total_size, ip_address=None, session_key=None):
+        """Raise if a new upload of ``total_size`` bytes exceeds the open uploads or pending bytes of its client"""
+        for field_name, value in (('ip_address', ip_address), ('session_key', session_key)):
+            if not value:
+                continue
+            [(count, pending_size)] = self._read_group(
+                [(field_name, '=', value), ('state', '=', 'uploading')], aggregates=['__count', 'total_size:sum'])
+            if count >= MAX_OPEN_UPLOADS:
+                raise ValidationError(_('Too many uploads in progress. Please finish or wait for them before starting another.'))
+            if (pending_size or 0) + total_size > MAX_PENDING_UPLOAD_SIZE:
+                raise ValidationError(_('Your uploads in progress exceed %s MB. Please finish them before starting another.')
+                                      % (MAX_PENDING_UPLOAD_SIZE // (1024 * 1024)))
+
+    @api.model
+    def _get_by_token(self, access_token):
+        """Return the upload of ``access_token``, locked for this transaction"""
+        upload = self.search([('access_token', '=', access_token)], limit=1) if access_token else self
+        if not upload:
+            raise UserError(_('Upload not found.'))
+        # Uploads of signed-in users stay private to them; anonymous ones rely on the token alone
+        if upload.user_id and not upload.user_id._is_public() and upload.user_id != self.env.user:
+            raise UserError(_('Upload not found.'))
+        # Serialize concurrent chunks of the same upload
+        self.env.cr.execute('SELECT id FROM acmst_document_upload WHERE id = %s FOR UPDATE NOWAIT', [upload.id])
+        return upload
+
+    def _get_part_path(self):
+        """Path of the part file collecting the received chunks"""
+        self.ensure_one()
+        directory = os.path.join(self.env['ir.attachment']._filestore(), 'acmst_uploads')
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f'{self.access_token}.part')
+
+    def write_chunk(self, index, stream):
+        """Append chunk ``index`` read from ``stream``.
+
+        Chunks already received are acknowledged without being written again,
+        so clients can safely resend after a timeout. Returns the upload
+        status.
+        """
+        self.ensure_one()
+        index = int(index)
+        if self.state != 'uploading' or index < self.next_chunk:
+            return self.get_status()
+        if index > self.next_chunk:
+            raise UserError(_('Expected chunk %s, received chunk %s.') % (self.next_chunk, index))
+
+        path = self._get_part_path()
+        with open(path, 'ab') as part_file:
+            # Drop bytes left by a chunk whose transaction was rolled back
+            part_file.truncate(self.received_size)
+            part_file.seek(self.received_size)
+            written = 0
+            while True:
+                block = stream.read(COPY_BLOCK_SIZE)
+                if not block:
+                    break
+                written += len(block)
+                if written > MAX_CHUNK_SIZE or self.received_size + written > self.total_size:
+                    part_file.truncate(self.received_size)
+                    raise ValidationError(_('The chunk exceeds the announced file size.'))
+                part_file.write(block)
+
+        self.write({
+            'received_size': self.received_size + written,
+            'next_chunk': index + 1,
+        })
+        if self.received_size == self.total_size:
+            self._finalize()
+        return self.get_status()
+
+    def get_status(self):
+        """Progress of the upload, as sent back to the client"""
+        self.ensure_one()
+        return {
+            'token': self.access_token,
+            'state': self.state,
+            'next_chunk': self.next_chunk,
+            'received_size': self.received_size,
+            'total_size': self.total_size,
+            'chunk_size': CHUNK_SIZE,
+        }
+
+    def _finalize(self):
+        """Move the complete part file into the filestore as an attachment"""
+        self.ensure_one()
+        path = self._get_part_path()
+        checksum = hashlib.sha1()
+        with open(path, 'rb') as part_file:
+            head = part_file.read(1024)
+            checksum.update(head)
+            for block in iter(lambda: part_file.read(COPY_BLOCK_SIZE), b''):
+                checksum.update(block)
+        checksum = checksum.hexdigest()
+        mimetype = guess_mimetype(head, default=self.mimetype or 'application/octet-stream')
+        if mimetype == 'application/octet-stream' and self.mimetype:
+            mimetype = self.mimetype
+
+        Attachment = self.env['ir.attachment'].sudo()
+        vals = {
+            'name': self.name,
+            'type': 'binary',
+            'mimetype': mimetype,
+            'res_model': self._name,
+            'res_id': self.id,
+        }
+        if Attachment._storage() == 'file':
+            fname = f'{checksum[:2]}/{checksum}'
+            full_path = Attachment._full_path(fname)
+            if os.path.exists(full_path):
+                os.remove(path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.replace(path, full_path)
+                Attachment._mark_for_gc(fname)
+            attachment = self._create_stored_attachment(vals, fname, self.total_size, checksum)
+        else:
+            with open(path, 'rb') as part_file:
+                attachment = Attachment.create(dict(vals, raw=part_file.read()))
+            os.remove(path)
+
+        self.write({'state': 'done', 'attachment_id': attachment.id, 'mimetype': mimetype})
+        _logger.info(f'Upload {self.id} of {self.name} completed as attachment {attachment.id}')
+
+    @api.model
+    def _create_stored_attachment(self, vals, store_fname, file_size, checksum):
+        """Create an attachment whose content is the existing filestore file ``store_fname``.
+
+        The filestore is content-addressed, so attachments with the same
+        checksum share one file; this registers another reference to it
+        without reading the content.
+        """
+        attachment = self.env['ir.attachment'].sudo().create(vals)
+        # ir.attachment ignores these fields on create/write as it normally computes them from the content
+        self.env.cr.execute(
+            'UPDATE ir_attachment SET store_fname = %s, file_size = %s, checksum = %s WHERE id = %s',
+            [store_fname, file_size, checksum, attachment.id],
+        )
+        attachment.invalidate_recordset(['store_fname', 'file_size', 'checksum'])
+        return attachment
+
+    @api.model
+    def upload_stream(self, filename, stream, document_type='other', mimetype=None):
+        """Store a whole file read from ``stream`` through a one-chunk upload"""
+        upload = self.start_upload(filename, MAX_UPLOAD_SIZE, document_type=document_type, mimetype=mimetype)
+        path = upload._get_part_path()
+        received = 0
+        with open(path, 'wb') as part_file:
+            for block in iter(lambda: stream.read(COPY_BLOCK_SIZE), b''):
+                received += len(block)
+                if received > MAX_UPLOAD_SIZE:
+                    part_file.close()
+                    os.remove(path)
+                    raise ValidationError(_('The file exceeds the maximum size of %s MB.') % (MAX_UPLOAD_SIZE // (1024 * 1024)))
+                part_file.write(block)
+        if not received:
+            os.remove(path)
+            raise ValidationError(_('The file is empty.'))
+        upload.write({'total_size': received, 'received_size': received, 'next_chunk': 1})
+        upload._finalize()
+        return upload
+
+    def link_to_application(self, application):
+        """Attach completed uploads to ``application`` as acmst.document records"""
+        uploads = self.filtered(lambda upload: upload.state == 'done' and upload.attachment_id)
+        documents = self.env['acmst.document'].sudo().create([{
+            'name': os.path.splitext(upload.name)[0] or upload.name,
+            'filename': upload.name,
+            'document_type': upload.document_type,
+            'portal_application_id': application.id,
+            'state': 'submitted',
+        } for upload in uploads])
+        for upload, document in zip(uploads, documents):
+            # The attachment becomes the value of the document's binary field
+            upload.attachment_id.write({
+                'name': 'file',
+                'res_model': 'acmst.document',
+                'res_field': 'file',
+                'res_id': document.id,
+            })
+        uploads.write({'state': 'linked'})
+        # The documents were created before their attachments were attached
+        documents._compute_file_metadata()
+        return documents
+
+    def link_to_record(self, record, field_name):
+        """Add completed uploads to the attachment many2many ``field_name`` of ``record``"""
+        uploads = self.filtered(lambda upload: upload.state == 'done' and upload.attachment_id)
+        uploads.attachment_id.write({'res_model': record._name, 'res_id': record.id})
+        record.write({field_name: [(4, attachment_id) for attachment_id in uploads.attachment_id.ids]})
+        uploads.write({'state': 'linked'})
+        return uploads.attachment_id
+
+    @api.autovacuum
+    def _gc_stale_uploads(self):
+        """Drop uploads abandoned for more than a day, with their part files and attachments"""
+        stale = self.search([
+            ('state', 'in', ['uploading', 'done']),
+            ('create_date', '<', fields.Datetime.now() - timedelta(days=1)),
+        ])
+        for upload in stale.filtered(lambda upload: upload.state == 'uploading'):
+            try:
+                os.remove(upload._get_part_path())
+            except FileNotFoundError:
+                pass
+        stale.attachment_id.unlink()
+        stale.unlink()
+        if stale:
+            _logger.info(f'Removed {len(stale)} stale document uploads')
@@ -2,6 +2,7 @@
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 from odoo import _
+from collections import defaultdict
 
 
 class AcmstGuardian(models.Model):
@@ -60,35 +61,44 @@ class AcmstGuardian(models.Model):
             if default_count > 1:
                 raise ValidationError('Only one guardian can be marked as default.')
 
-    @api.model
-    def create(self, vals):
-        """Override create to handle default guardian logic"""
-        # If this is the first guardian, automatically set as default
-        if not vals.get('is_default', False):
-            domain = []
-            if vals.get('portal_application_id'):
-                domain = [('portal_application_id', '=', vals['portal_application_id'])]
-            elif vals.get('admission_file_id'):
-                domain = [('admission_file_id', '=', vals['admission_file_id'])]
-
-            if domain:
-                existing_guardians = self.search(domain)
-                if not existing_guardians:
-                    vals['is_default'] = True
-
-        if vals.get('is_default', False):
-            # If this is set as default, remove default flag from other guardians
-            domain = []
-            if vals.get('portal_application_id'):
-                domain = [('portal_application_id', '=', vals['portal_application_id'])]
-            elif vals.get('admission_file_id'):
-                domain = [('admission_file_id', '=', vals['admission_file_id'])]
-
-            if domain:
-                other_guardians = self.search(domain + [('is_default', '=', True)])
-                other_guardians.write({'is_default': False})
-
-        return super(AcmstGuardian, self).create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to handle default guardian logic, for all parents of the batch at once.
+
+        The first guardian of a parent without guardians becomes its default,
+        and a new default guardian replaces the previous default of its
+        parent, as if the records were created one after the other.
+        """
+        parent_fields = ('portal_application_id', 'admission_file_id')
+        vals_by_parent = defaultdict(list)
+        for vals in vals_list:
+            parent = next(((fname, vals[fname]) for fname in parent_fields if vals.get(fname)), None)
+            if parent:
+                vals_by_parent[parent].append(vals)
+
+        if vals_by_parent:
+            # Existing guardians of every parent, read in one query per parent field
+            existing = defaultdict(list)
+            for fname in parent_fields:
+                parent_ids = [parent_id for field, parent_id in vals_by_parent if field == fname]
+                if parent_ids:
+                    for guardian in self.search_read([(fname, 'in', parent_ids)], [fname, 'is_default'], load=None):
+                        existing[(fname, guardian[fname])].append(guardian)
+
+            replaced_default_ids = []
+            for parent, parent_vals_list in vals_by_parent.items():
+                defaults = [vals for vals in parent_vals_list if vals.get('is_default')]
+                if defaults:
+                    # The last default wins, as when created one by one
+                    for vals in defaults[:-1]:
+                        vals['is_default'] = False
+                    replaced_default_ids += [guardian['id'] for guardian in existing[parent] if guardian['is_default']]
+                elif not existing[parent]:
+                    parent_vals_list[0]['is_default'] = True
+            if replaced_default_ids:
+                self.browse(replaced_default_ids).write({'is_default': False})
+
+        return super(AcmstGuardian, self).create(vals_list)
 
     def write(self, vals):
         """Override write to handle default guardian logic"""
@@ -14,9 +14,13 @@ _logger = logging.getLogger(__name__)
 class AcmstHealthCheck(models.Model):
     _name = 'acmst.health.check'
     _description = 'Health Check'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'acmst.audit.mixin']
     _order = 'check_date desc'
 
+    # Fields whose changes are logged as diffs by acmst.audit.mixin
+    _audit_fields = ('state', 'medical_fitness', 'examiner_id', 'check_date', 'blood_type', 'height', 'weight',
+                     'restrictions', 'follow_up_required', 'follow_up_date')
+
     # Basic Information
     name = fields.Char(
         string=_('Health Check Name'),
@@ -230,9 +234,18 @@ class AcmstHealthCheck(models.Model):
     profile_picture = fields.Binary(
         string='Profile Picture',
         related='admission_file_id.profile_picture',
-        store=True,
         help='Student profile picture'
     )
+    profile_picture_128 = fields.Image(
+        string='Profile Picture 128',
+        related='admission_file_id.profile_picture_128',
+        help='Student profile picture resized for lists and kanban cards'
+    )
+    profile_picture_512 = fields.Image(
+        string='Profile Picture 512',
+        related='admission_file_id.profile_picture_512',
+        help='Student profile picture resized for forms'
+    )
     profile_picture_filename = fields.Char(
         string='Profile Picture Filename',
         related='admission_file_id.profile_picture_filename',
@@ -403,16 +416,17 @@ class AcmstHealthCheck(models.Model):
 
     def _compute_dashboard_counts(self):
         """Compute dashboard counts for health officer"""
+        stats = self.env['acmst.statistics'].get_health_check_statistics()
         for record in self:
             from datetime import datetime, timedelta
             today = datetime.now().date()
             week_ago = today - timedelta(days=7)
             
-            record.total_health_checks = self.env['acmst.health.check'].search_count([])
-            record.pending_health_checks_count = self.env['acmst.health.check'].search_count([('state', '=', 'draft')])
-            record.approved_health_checks_count = self.env['acmst.health.check'].search_count([('state', '=', 'approved')])
-            record.rejected_health_checks_count = self.env['acmst.health.check'].search_count([('state', '=', 'rejected')])
-            record.my_health_checks_count = self.env['acmst.health.check'].search_count([('examiner_id', '=', self.env.user.id)])
+            record.total_health_checks = stats['total']
+            record.pending_health_checks_count = stats['draft']
+            record.approved_health_checks_count = stats['approved']
+            record.rejected_health_checks_count = stats['rejected']
+            record.my_health_checks_count = stats['mine']
             
             # Today's health checks
             record.today_health_checks_count = self.env['acmst.health.check'].search_count([
@@ -428,8 +442,8 @@ class AcmstHealthCheck(models.Model):
             ])
             
             # Calculate completion rate
-            total_my_checks = self.env['acmst.health.check'].search_count([('examiner_id', '=', self.env.user.id)])
-            completed_my_checks = self.env['acmst.health.check'].search_count([('examiner_id', '=', self.env.user.id), ('state', 'in', ['approved', 'rejected'])])
+            total_my_checks = stats['mine']
+            completed_my_checks = stats['my_completed']
             if total_my_checks > 0:
                 record.health_completion_rate = (completed_my_checks / total_my_checks) * 100
             else:
@@ -520,6 +534,7 @@ class AcmstHealthCheck(models.Model):
             if admission_file.state != 'health_required':
                 raise UserError(_('Health check can only be created for applications requiring health check.'))
         
+        self.env['acmst.statistics'].invalidate_statistics(self._name)
         return super().create(vals)
 
     def get_portal_url(self):
@@ -690,64 +705,27 @@ class AcmstHealthCheck(models.Model):
         }
 
     def write(self, vals):
-        """Override write to log all changes"""
-        _logger.info(f"Updating health check {self.name} with vals: {vals}")
-
-        # Get old values before update
-        old_values = {}
-        if 'state' in vals:
-            old_values['state'] = self.state
-        if 'medical_fitness' in vals:
-            old_values['medical_fitness'] = self.medical_fitness
-
+        """Override write to keep the statistics current; changes are audited by acmst.audit.mixin"""
+        _logger.info(f"Updating {len(self)} health check(s) with vals: {vals}")
         result = super(AcmstHealthCheck, self).write(vals)
-
-        # Log state changes
-        if 'state' in vals and old_values.get('state') != self.state:
-            _logger.info(f"Health check {self.name} state changed from {old_values.get('state')} to {self.state}")
-
-            # Create audit log entry for state change
-            self.env['acmst.audit.log'].create({
-                'model_name': 'acmst.health.check',
-                'record_id': self.id,
-                'record_name': self.name,
-                'action': 'write',
-                'category': 'workflow',
-                'old_values': f"State: {old_values.get('state')}",
-                'new_values': f"State: {self.state}",
-                'user_id': self.env.user.id,
-                'action_description': f'State changed from {old_values.get("state")} to {self.state}'
-            })
-
-            # Post message to chatter
-            self.message_post(
-                body=f'Status changed from {old_values.get("state")} to {self.state}',
-                message_type='comment'
-            )
-
-        # Log medical fitness changes
-        if 'medical_fitness' in vals:
-            _logger.info(f"Health check {self.name} medical fitness changed")
-
-            self.env['acmst.audit.log'].create({
-                'model_name': 'acmst.health.check',
-                'record_id': self.id,
-                'record_name': self.name,
-                'action': 'write',
-                'category': 'data_modification',
-                'old_values': f"Medical Fitness: {old_values.get('medical_fitness', 'None')}",
-                'new_values': f"Medical Fitness: {self.medical_fitness}",
-                'user_id': self.env.user.id,
-                'action_description': 'Medical fitness updated'
-            })
-
-            self.message_post(
-                body=f'Medical fitness updated to {self.medical_fitness}',
-                message_type='comment'
-            )
-
+        self.env['acmst.statistics'].invalidate_statistics(self._name)
         return result
 
+    def _on_audited_changes(self, diffs):
+        """Post the state and medical fitness changes to the chatter"""
+        super()._on_audited_changes(diffs)
+        messages = {}
+        for record_id, diff in diffs.items():
+            lines = []
+            if 'state' in diff:
+                lines.append(f"Status changed from {diff['state']['old']} to {diff['state']['new']}")
+            if 'medical_fitness' in diff:
+                lines.append(f"Medical fitness updated to {diff['medical_fitness']['new']}")
+            if lines:
+                messages[record_id] = '<br/>'.join(lines)
+        if messages:
+            self.browse(list(messages))._message_log_batch(messages, message_type='comment')
+
     def unlink(self):
         """Override unlink to log deletions"""
         for record in self:
@@ -759,7 +737,7 @@ class AcmstHealthCheck(models.Model):
                 'record_id': record.id,
                 'record_name': record.name,
                 'action': 'unlink',
-                'category': 'data_deletion',
+                'category': 'data_modification',
                 'old_values': f'Health check: {record.name} for {record.admission_file_id.name}',
                 'new_values': '',
                 'user_id': self.env.user.id,
@@ -772,4 +750,5 @@ class AcmstHealthCheck(models.Model):
                 message_type='comment'
             )
 
+        self.env['acmst.statistics'].invalidate_statistics(self._name)
         return super(AcmstHealthCheck, self).unlink()
\ No newline at end of file
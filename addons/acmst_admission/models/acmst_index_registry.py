@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, api
+from odoo.tools import sql
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Composite and partial indexes matching the access paths of the admission models:
+# (model, index name, indexed expressions, index method, partial index condition)
+ACMST_INDEXES = [
+    ('acmst.audit.log', 'acmst_audit_log_model_record_date_idx', ['model_name', 'record_id', 'create_date DESC'], 'btree', ''),
+    ('acmst.audit.log', 'acmst_audit_log_user_date_idx', ['user_id', 'create_date'], 'btree', ''),
+    ('acmst.audit.log', 'acmst_audit_log_action_date_idx', ['action', 'create_date'], 'btree', ''),
+    ('acmst.audit.log', 'acmst_audit_log_anomaly_date_idx', ['create_date'], 'btree', 'is_anomaly = true'),
+    ('acmst.audit.log', 'acmst_audit_log_diff_idx', ['diff'], 'gin', ''),
+    ('acmst.admission.file', 'acmst_admission_file_state_date_idx', ['state', 'create_date'], 'btree', ''),
+    ('acmst.admission.file', 'acmst_admission_file_name_id_idx', ['applicant_name_english', 'national_id'], 'btree', ''),
+    ('acmst.health.check', 'acmst_health_check_file_state_idx', ['admission_file_id', 'state'], 'btree', ''),
+    ('acmst.coordinator.condition', 'acmst_coordinator_condition_file_state_idx', ['admission_file_id', 'state'], 'btree', ''),
+    ('acmst.admission.approval', 'acmst_admission_approval_file_type_idx', ['admission_file_id', 'approval_type'], 'btree', ''),
+    ('acmst.portal.application', 'acmst_portal_application_state_date_idx', ['state', 'create_date'], 'btree', ''),
+]
+
+
+class AcmstIndexRegistry(models.AbstractModel):
+    """Declared database indexes of the admission models.
+
+    The indexes of :data:`ACMST_INDEXES` are created when the module is
+    installed or upgraded, and :meth:`_check_indexes` compares them with
+    ``pg_indexes`` and the PostgreSQL usage statistics to report the missing,
+    invalid and unused indexes of the ACMST tables.
+    """
+    _name = 'acmst.index.registry'
+    _description = 'Admission Index Registry'
+
+    def init(self):
+        super().init()
+        self._ensure_indexes()
+
+    @api.model
+    def get_index_definitions(self):
+        """Declared indexes of the installed models, as dicts"""
+        return [{
+            'model': model_name,
+            'table': self.env[model_name]._table,
+            'name': name,
+            'expressions': expressions,
+            'method': method,
+            'where': where,
+        } for model_name, name, expressions, method, where in ACMST_INDEXES if model_name in self.env]
+
+    @api.model
+    def _ensure_indexes(self):
+        """Create the declared indexes that do not exist yet; return their names"""
+        cr = self.env.cr
+        created = []
+        for definition in self.get_index_definitions():
+            if not sql.table_exists(cr, definition['table']) or sql.index_exists(cr, definition['name']):
+                continue
+            sql.create_index(cr, definition['name'], definition['table'], definition['expressions'],
+                             method=definition['method'], where=definition['where'])
+            created.append(definition['name'])
+        if created:
+            _logger.info(f'Created admission indexes: {", ".join(created)}')
+        return created
+
+    @api.model
+    def _get_acmst_tables(self):
+        return sorted({
+            model._table for name, model in self.env.items()
+            if name.startswith('acmst.') and not model._abstract and not model._transient and model._auto
+        })
+
+    @api.model
+    def _check_indexes(self):
+        """Compare the declared indexes with the database.
+
+        Returns the declared indexes that are ``missing`` or ``invalid``, and
+        the ``unused`` non-unique indexes of the ACMST tables, i.e. those
+        never scanned since the statistics were last reset. Scans of
+        partitioned tables are summed over their partitions.
+        """
+        cr = self.env.cr
+        cr.execute("""
+            SELECT idx.relname, tbl.relname, ix.indisunique, ix.indisvalid,
+                   COALESCE((
+                       SELECT SUM(stat.idx_scan) FROM pg_stat_user_indexes stat
+                       WHERE stat.indexrelid = idx.oid
+                          OR stat.indexrelid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = idx.oid)
+                   ), 0)
+            FROM pg_index ix
+            JOIN pg_class idx ON idx.oid = ix.indexrelid
+            JOIN pg_class tbl ON tbl.oid = ix.indrelid
+            WHERE tbl.relname IN %s AND tbl.relnamespace = current_schema()::regnamespace
+        """, [tuple(self._get_acmst_tables()) or ('',)])
+        indexes = {
+            name: {'table': table, 'unique': unique, 'valid': valid, 'scans': int(scans)}
+            for name, table, unique, valid, scans in cr.fetchall()
+        }
+        cr.execute("SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()")
+        stats_reset = cr.fetchone()[0]
+
+        definitions = self.get_index_definitions()
+        report = {
+            'missing': [definition['name'] for definition in definitions if definition['name'] not in indexes],
+            'invalid': [definition['name'] for definition in definitions
+                        if definition['name'] in indexes and not indexes[definition['name']]['valid']],
+            'unused': [
+                {'name': name, 'table': index['table']}
+                for name, index in sorted(indexes.items()) if not index['unique'] and not index['scans']
+            ],
+            'indexes': indexes,
+            'stats_since': stats_reset and stats_reset.isoformat(),
+        }
+        if report['missing'] or report['invalid']:
+            _logger.warning(f"Admission indexes missing: {report['missing']}, invalid: {report['invalid']}")
+        return report
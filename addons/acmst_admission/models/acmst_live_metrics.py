@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, api
+from collections import deque
+import logging
+import os
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Requests slower than this many seconds are reported as slow
+SLOW_REQUEST_SECONDS = 1.0
+# Rolling windows reported by the collector, in seconds
+METRIC_WINDOWS = {'1m': 60, '5m': 300, '15m': 900}
+
+
+class LiveMetricsCollector:
+    """In-memory rolling request metrics of the current worker process.
+
+    Requests are folded into one bucket per second holding the request
+    count, SQL query count, SQL time, wall time and slow request count.
+    Buckets older than the largest window are dropped, so memory stays
+    bounded whatever the traffic.
+    """
+
+    def __init__(self, max_age=max(METRIC_WINDOWS.values())):
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.buckets = deque()
+        self.in_flight = 0
+        self.peak_in_flight = deque()
+        self.cpu_sample = None
+
+    def request_started(self):
+        with self.lock:
+            self.in_flight += 1
+            self._add_peak(int(time.time()), self.in_flight)
+
+    def request_finished(self, duration, query_count, query_time):
+        now = int(time.time())
+        with self.lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+            if not self.buckets or self.buckets[-1][0] != now:
+                self.buckets.append([now, 0, 0, 0.0, 0.0, 0])
+            bucket = self.buckets[-1]
+            bucket[1] += 1
+            bucket[2] += query_count
+            bucket[3] += query_time
+            bucket[4] += duration
+            bucket[5] += duration >= SLOW_REQUEST_SECONDS
+            self._trim(now)
+
+    def _add_peak(self, now, value):
+        if self.peak_in_flight and self.peak_in_flight[-1][0] == now:
+            self.peak_in_flight[-1][1] = max(self.peak_in_flight[-1][1], value)
+        else:
+            self.peak_in_flight.append([now, value])
+        self._trim(now)
+
+    def _trim(self, now):
+        for queue in (self.buckets, self.peak_in_flight):
+            while queue and queue[0][0] <= now - self.max_age:
+                queue.popleft()
+
+    def window(self, seconds):
+        """Aggregate the requests of the last ``seconds`` seconds"""
+        since = int(time.time()) - seconds
+        with self.lock:
+            buckets = [bucket for bucket in self.buckets if bucket[0] > since]
+            peak = max([value for stamp, value in self.peak_in_flight if stamp > since] + [self.in_flight])
+        requests = sum(bucket[1] for bucket in buckets)
+        queries = sum(bucket[2] for bucket in buckets)
+        query_time = sum(bucket[3] for bucket in buckets)
+        duration = sum(bucket[4] for bucket in buckets)
+        return {
+            'requests': requests,
+            'requests_per_minute': round(requests * 60.0 / seconds, 2),
+            'queries': queries,
+            'queries_per_request': round(queries / requests, 2) if requests else 0,
+            'query_time': round(query_time, 3),
+            'avg_query_time': round(query_time / requests, 3) if requests else 0,
+            'avg_request_time': round(duration / requests, 3) if requests else 0,
+            'slow_requests': sum(bucket[5] for bucket in buckets),
+            'peak_concurrent': peak,
+        }
+
+    def cpu_percent(self):
+        """Process CPU usage since the previous call, in percent of one core"""
+        times = os.times()
+        sample = (time.monotonic(), times.user + times.system)
+        with self.lock:
+            previous, self.cpu_sample = self.cpu_sample, sample
+        if not previous or sample[0] <= previous[0]:
+            return 0.0
+        return round(100.0 * (sample[1] - previous[1]) / (sample[0] - previous[0]), 1)
+
+
+LIVE_METRICS = LiveMetricsCollector()
+
+
+def _read_proc_kb(path, keys):
+    """Read ``kB`` values of ``keys`` from a /proc status-like file"""
+    values = dict.fromkeys(keys, 0)
+    try:
+        with open(path) as proc_file:
+            for line in proc_file:
+                key, __, value = line.partition(':')
+                if key in values:
+                    values[key] = int(value.split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    return values
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = 'ir.http'
+
+    @classmethod
+    def _dispatch(cls, endpoint):
+        """Feed the live metrics collector with the SQL cost of each request"""
+        thread = threading.current_thread()
+        start_count = getattr(thread, 'query_count', 0)
+        start_time = getattr(thread, 'query_time', 0.0)
+        start = time.monotonic()
+        LIVE_METRICS.request_started()
+        try:
+            return super()._dispatch(endpoint)
+        finally:
+            LIVE_METRICS.request_finished(
+                time.monotonic() - start,
+                getattr(thread, 'query_count', 0) - start_count,
+                getattr(thread, 'query_time', 0.0) - start_time,
+            )
+
+
+class AcmstLiveMetrics(models.AbstractModel):
+    """Live performance metrics of the current worker and database"""
+    _name = 'acmst.live.metrics'
+    _description = 'Admission Live Metrics'
+
+    @api.model
+    def get_process_metrics(self):
+        """RSS, swap and CPU usage of the current worker process"""
+        status = _read_proc_kb('/proc/self/status', ['VmRSS', 'VmSwap'])
+        meminfo = _read_proc_kb('/proc/meminfo', ['MemTotal'])
+        rss_kb = status['VmRSS']
+        return {
+            'pid': os.getpid(),
+            'rss_mb': round(rss_kb / 1024.0, 1),
+            'swap_mb': round(status['VmSwap'] / 1024.0, 1),
+            'memory_percent': round(100.0 * rss_kb / meminfo['MemTotal'], 1) if meminfo['MemTotal'] else 0.0,
+            'cpu_percent': LIVE_METRICS.cpu_percent(),
+        }
+
+    @api.model
+    def get_database_metrics(self):
+        """Connection and cache statistics of the current database"""
+        cr = self.env.cr
+        cr.execute("""
+            SELECT COALESCE(state, 'unknown'), COUNT(*)
+            FROM pg_stat_activity
+            WHERE datname = current_database()
+            GROUP BY 1
+        """)
+        connections = dict(cr.fetchall())
+        cr.execute("""
+            SELECT xact_commit, xact_rollback, blks_read, blks_hit, deadlocks
+            FROM pg_stat_database
+            WHERE datname = current_database()
+        """)
+        xact_commit, xact_rollback, blks_read, blks_hit, deadlocks = cr.fetchone() or (0, 0, 0, 0, 0)
+        blocks = blks_read + blks_hit
+        return {
+            'connections': sum(connections.values()),
+            'active_connections': connections.get('active', 0),
+            'idle_in_transaction': connections.get('idle in transaction', 0),
+            'commits': xact_commit,
+            'rollbacks': xact_rollback,
+            'cache_hit_rate': round(100.0 * blks_hit / blocks, 1) if blocks else 100.0,
+            'deadlocks': deadlocks,
+        }
+
+    @api.model
+    def get_session_metrics(self):
+        """Users currently connected, from the bus presence records"""
+        presence = self.env['bus.presence'].sudo()
+        return {
+            'online_users': presence.search_count([('status', '=', 'online')]),
+            'away_users': presence.search_count([('status', '=', 'away')]),
+        }
+
+    @api.model
+    def get_live_metrics(self):
+        """Collect every live metric, with request windows of the current worker"""
+        windows = {name: LIVE_METRICS.window(seconds) for name, seconds in METRIC_WINDOWS.items()}
+        process = self.get_process_metrics()
+        database = self.get_database_metrics()
+        sessions = self.get_session_metrics()
+        current = windows['1m']
+        return {
+            'query_performance': {
+                'average_time': current['avg_query_time'],
+                'total_queries': current['queries'],
+                'slow_requests': current['slow_requests'],
+            },
+            'database_load': {
+                'cpu_usage': process['cpu_percent'],
+                'memory_usage': round(process['rss_mb'] / 1024.0, 2),
+                'connection_count': database['connections'],
+            },
+            'memory_usage': {
+                'ram_consumption': f"{round(process['rss_mb'] / 1024.0, 2)}GB",
+                'cache_hit_rate': database['cache_hit_rate'],
+                'swap_usage': round(process['swap_mb'] / 1024.0, 2),
+            },
+            'active_users': {
+                'count': sessions['online_users'],
+                'concurrent_sessions': database['active_connections'],
+                'peak_concurrent': windows['15m']['peak_concurrent'],
+            },
+            'windows': windows,
+            'process': process,
+            'database': database,
+            'sessions': sessions,
+            'numbering': self.env['acmst.numbering'].get_metrics(),
+        }
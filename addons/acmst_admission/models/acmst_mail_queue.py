@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, fields, api
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+
+class AcmstMailQueue(models.AbstractModel):
+    """Deferred delivery of admission notification emails.
+
+    Templates are rendered into outgoing ``mail.mail`` records inside the
+    caller's transaction, so user actions never wait on SMTP. The worker cron
+    sends them after commit, opening one SMTP connection per mail server for
+    the whole batch.
+    """
+    _name = 'acmst.mail.queue'
+    _description = 'Admission Mail Queue'
+
+    @api.model
+    def enqueue(self, template, res_ids, force_send=False):
+        """Render ``template`` for ``res_ids`` and queue the resulting mails"""
+        mails = template.send_mail_batch(res_ids, force_send=force_send)
+        if not force_send:
+            self._trigger_worker()
+        return mails
+
+    @api.model
+    def _trigger_worker(self):
+        """Wake the worker cron up once the current transaction commits"""
+        cron = self.env.ref('acmst_admission.cron_send_queued_mail', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+    @api.model
+    def _get_queued_mail_domain(self):
+        """Outgoing mails of the admission models that are due"""
+        return [
+            ('state', '=', 'outgoing'),
+            ('model', '=like', 'acmst.%'),
+            '|', ('scheduled_date', '=', False), ('scheduled_date', '<=', fields.Datetime.now()),
+        ]
+
+    @api.model
+    def _cron_send_queued_mail(self, batch_size=500, auto_commit=None):
+        """Cron job sending queued admission mails, ``batch_size`` at a time"""
+        if auto_commit is None:
+            auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        mails = self.env['mail.mail'].sudo().search(self._get_queued_mail_domain(), order='id', limit=batch_size)
+        if not mails:
+            return 0
+
+        # Checked once per run instead of once per email; mails stay queued until a server exists
+        if not self.env['ir.mail_server'].sudo().search_count([('active', '=', True)], limit=1):
+            _logger.warning(f'No active mail server configured. {len(mails)} queued emails left for a later run.')
+            return 0
+
+        # mail.mail.send() opens one SMTP session per mail server and reuses it for the batch
+        mails.send(auto_commit=auto_commit, raise_exception=False)
+        _logger.info(f'Sent {len(mails)} queued admission emails')
+
+        if len(mails) == batch_size:
+            self._trigger_worker()
+        return len(mails)
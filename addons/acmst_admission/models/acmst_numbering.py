@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, api
+from collections import deque
+from functools import partial
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Numbers reserved at once by a worker, unless overridden by the system parameter
+DEFAULT_BLOCK_SIZE = 20
+BLOCK_SIZE_PARAM = 'acmst_admission.numbering_block_size'
+
+
+class NumberPool:
+    """Sequence numbers reserved by the current worker process.
+
+    Each sequence has a queue of reserved numbers. A number handed out to a
+    transaction that rolls back entirely is put back at the front of its
+    queue, so it is reused by the next record instead of leaving a gap.
+    Numbers taken inside a savepoint that is rolled back while the
+    transaction goes on are not returned and leave a gap.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.numbers = {}
+        self.metrics = {
+            'blocks_reserved': 0,
+            'numbers_reserved': 0,
+            'numbers_issued': 0,
+            'numbers_released': 0,
+            'reserve_time': 0.0,
+            'lock_wait_time': 0.0,
+        }
+
+    def take(self, key):
+        """Pop the next reserved number of ``key``, or None when the block is used up"""
+        start = time.monotonic()
+        with self.lock:
+            self.metrics['lock_wait_time'] += time.monotonic() - start
+            queue = self.numbers.get(key)
+            if not queue:
+                return None
+            self.metrics['numbers_issued'] += 1
+            return queue.popleft()
+
+    def add_block(self, key, numbers, duration):
+        with self.lock:
+            self.numbers.setdefault(key, deque()).extend(numbers)
+            self.metrics['blocks_reserved'] += 1
+            self.metrics['numbers_reserved'] += len(numbers)
+            self.metrics['reserve_time'] += duration
+
+    def release(self, key, number):
+        """Give back a number whose record was rolled back"""
+        with self.lock:
+            self.numbers.setdefault(key, deque()).appendleft(number)
+            self.metrics['numbers_released'] += 1
+
+    def get_metrics(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+            metrics['numbers_available'] = sum(len(queue) for queue in self.numbers.values())
+        metrics['reserve_time'] = round(metrics['reserve_time'], 4)
+        metrics['lock_wait_time'] = round(metrics['lock_wait_time'], 4)
+        return metrics
+
+
+NUMBER_POOL = NumberPool()
+
+
+class AcmstNumbering(models.AbstractModel):
+    """Record numbering without per-record sequence round trips.
+
+    Workers reserve blocks of numbers from the PostgreSQL sequence behind an
+    ``ir.sequence`` in one query, outside of any row lock, and hand them out
+    from memory. ``nextval`` is never rolled back, so blocks of different
+    workers cannot overlap, and uniqueness of the formatted number is
+    enforced by the unique constraint of the numbered model rather than by
+    searching for it. Numbers of rolled back transactions return to the
+    pool; the numbers drawn inside a rolled back savepoint and those left in
+    a block when a worker stops are skipped.
+    """
+    _name = 'acmst.numbering'
+    _description = 'Admission Numbering Service'
+
+    @api.model
+    def _get_block_size(self):
+        value = self.env['ir.config_parameter'].sudo().get_param(BLOCK_SIZE_PARAM)
+        try:
+            return max(int(value), 1) if value else DEFAULT_BLOCK_SIZE
+        except ValueError:
+            return DEFAULT_BLOCK_SIZE
+
+    @api.model
+    def _get_sequence(self, code):
+        company_id = self.env.company.id
+        return self.env['ir.sequence'].sudo().search([
+            ('code', '=', code),
+            ('company_id', 'in', [company_id, False]),
+        ], order='company_id', limit=1)
+
+    @api.model
+    def _reserve_block(self, sequence, size):
+        """Draw ``size`` numbers from the PostgreSQL sequence of ``sequence`` in one query"""
+        start = time.monotonic()
+        self.env.cr.execute(
+            'SELECT nextval(%s) FROM generate_series(1, %s)',
+            [f'ir_sequence_{sequence.id:03d}', size],
+        )
+        numbers = [row[0] for row in self.env.cr.fetchall()]
+        NUMBER_POOL.add_block((self.env.cr.dbname, sequence.id), numbers, time.monotonic() - start)
+        _logger.debug(f'Reserved {size} numbers of sequence {sequence.code}')
+
+    @api.model
+    def _next_number(self, code):
+        """Return the next formatted number of the sequence ``code``, or False if it does not exist.
+
+        Private: the sequence is searched as superuser, so callers decide
+        which codes may be drawn.
+        """
+        sequence = self._get_sequence(code)
+        if not sequence:
+            _logger.warning(f'No sequence found for code {code}')
+            return False
+        if sequence.implementation != 'standard' or sequence.use_date_range:
+            # Gapless and date range sequences keep their own numbering
+            return sequence.next_by_id()
+
+        key = (self.env.cr.dbname, sequence.id)
+        number = NUMBER_POOL.take(key)
+        while number is None:
+            self._reserve_block(sequence, self._get_block_size())
+            number = NUMBER_POOL.take(key)
+        self.env.cr.postrollback.add(partial(NUMBER_POOL.release, key, number))
+        return sequence.get_next_char(number)
+
+    @api.model
+    def get_metrics(self):
+        """Reservation and contention counters of the current worker"""
+        return NUMBER_POOL.get_metrics()
@@ -6,9 +6,13 @@ from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError, UserError
 from datetime import datetime, timedelta
 import logging
+import threading
 
 _logger = logging.getLogger(__name__)
 
+# Exponential backoff between attempts, in minutes: 5 min, 15 min, 30 min, 1 hour
+RETRY_DELAYS = [5, 15, 30, 60]
+
 
 class AcmstPendingEmail(models.Model):
     _name = 'acmst.pending.email'
@@ -87,7 +91,7 @@ class AcmstPendingEmail(models.Model):
     ready_for_retry = fields.Boolean(
         string='Ready for Retry',
         compute='_compute_ready_for_retry',
-        store=True,
+        search='_search_ready_for_retry',
         help='Whether this email is ready to be retried'
     )
 
@@ -139,15 +143,22 @@ class AcmstPendingEmail(models.Model):
         for record in self:
             record.template_display = template_names.get(record.template_ref, record.template_ref)
 
-    @api.depends('create_date', 'retry_count')
+    def init(self):
+        """Index the retry queue: pending emails by next retry date"""
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS acmst_pending_email_retry_queue_idx
+            ON acmst_pending_email (next_retry_date)
+            WHERE state = 'pending'
+        """)
+
+    @api.depends('state', 'retry_count', 'last_attempt_date')
     def _compute_next_retry(self):
-        """Compute next retry date based on retry count"""
+        """Compute next retry date with exponential backoff from the last attempt"""
         for record in self:
             if record.state == 'pending':
-                # Exponential backoff: 5 min, 15 min, 30 min, 1 hour
-                delays = [5, 15, 30, 60]
-                delay = delays[min(record.retry_count, len(delays) - 1)]
-                record.next_retry_date = record.create_date + timedelta(minutes=delay)
+                delay = RETRY_DELAYS[min(record.retry_count, len(RETRY_DELAYS) - 1)]
+                last_date = record.last_attempt_date or record.create_date or fields.Datetime.now()
+                record.next_retry_date = last_date + timedelta(minutes=delay)
             else:
                 record.next_retry_date = False
 
@@ -156,12 +167,21 @@ class AcmstPendingEmail(models.Model):
         """Compute if email is ready for retry"""
         now = fields.Datetime.now()
         for record in self:
-            record.ready_for_retry = (
+            record.ready_for_retry = bool(
                 record.state == 'pending' and
                 record.next_retry_date and
                 record.next_retry_date <= now
             )
 
+    def _search_ready_for_retry(self, operator, value):
+        """Search pending emails whose next retry date has passed"""
+        if operator not in ('=', '!=') or not isinstance(value, bool):
+            raise UserError(_('Operation not supported'))
+        domain = [('state', '=', 'pending'), ('next_retry_date', '<=', fields.Datetime.now())]
+        if (operator == '=') != value:
+            domain = ['!', '&'] + domain
+        return domain
+
     @api.depends('template_ref', 'record_id', 'model_name')
     def _compute_name(self):
         """Compute name for the pending email"""
@@ -176,53 +196,89 @@ class AcmstPendingEmail(models.Model):
 
     def action_retry_send(self):
         """Retry sending the email"""
-        for record in self:
-            if record.state == 'pending' and record.retry_count < record.max_retries:
-                record._attempt_send()
-            elif record.retry_count >= record.max_retries:
-                record.state = 'failed'
-                record.error_message = 'Maximum retry attempts exceeded'
+        exhausted = self.filtered(lambda record: record.state == 'pending' and record.retry_count >= record.max_retries)
+        exhausted.write({
+            'state': 'failed',
+            'error_message': 'Maximum retry attempts exceeded',
+        })
+        (self.filtered(lambda record: record.state == 'pending') - exhausted)._retry_send()
 
     def _attempt_send(self):
         """Attempt to send the email"""
         self.ensure_one()
+        self._retry_send()
+
+    def _retry_send(self, auto_commit=False):
+        """Send pending emails in batches, grouped by template and target model.
+
+        Each template is resolved and checked once per group, its records are
+        rendered with one ``send_mail_batch`` call, and all rendered mails are
+        sent together so ``mail.mail.send`` reuses one SMTP connection per
+        mail server. Pending emails for the same template and record share a
+        single mail.
+        """
+        if not self:
+            return
+        now = fields.Datetime.now()
 
-        try:
-            # Update attempt info
-            self.last_attempt_date = fields.Datetime.now()
-            self.retry_count += 1
-
-            # Get the template and record
-            template = self.env.ref(self.template_ref, False)
-            if not template:
-                raise ValidationError(_('Email template not found'))
-
-            # Get the record to send email to
-            record = self.env[self.model_name].browse(self.record_id)
-            if not record.exists():
-                raise ValidationError(_('Record not found'))
-
-            # Check if mail server is available
-            mail_server = self.env['ir.mail_server'].search([('active', '=', True)], order='sequence', limit=1)
-            if not mail_server:
-                raise ValidationError(_('No active mail server configured'))
-
-            # Send the email
-            template.send_mail(record.id, force_send=True)
-
-            # Mark as sent
-            self.state = 'sent'
-            _logger.info(f'Successfully sent pending email {self.name}')
-
-        except Exception as e:
-            error_msg = str(e)
-            self.error_message = error_msg
-
-            if self.retry_count >= self.max_retries:
-                self.state = 'failed'
-                _logger.error(f'Failed to send pending email {self.name} after {self.retry_count} attempts: {error_msg}')
+        # Checked once for the whole run
+        if not self.env['ir.mail_server'].sudo().search_count([('active', '=', True)], limit=1):
+            self._record_attempt(now, error_message='No active mail server configured')
+            return
+
+        # Render every group, remembering which mail serves which pending email
+        mail_by_pending = {}
+        errors = {}
+        for (template_ref, model_name), pending_emails in self.grouped(lambda record: (record.template_ref, record.model_name)).items():
+            try:
+                template = self.env.ref(template_ref, False)
+                if not template or template._name != 'mail.template':
+                    raise ValidationError(_('Email template not found'))
+                records = self.env[model_name].browse(set(pending_emails.mapped('record_id'))).exists()
+                missing = pending_emails.filtered(lambda record: record.record_id not in records.ids)
+                if missing:
+                    errors[missing] = _('Record not found')
+                    pending_emails -= missing
+                if not records:
+                    continue
+                mails = template.send_mail_batch(records.ids)
+                mail_by_res_id = {mail.res_id: mail for mail in mails}
+                for pending_email in pending_emails:
+                    mail_by_pending[pending_email] = mail_by_res_id.get(pending_email.record_id)
+            except Exception as e:
+                errors[pending_emails] = str(e)
+
+        # One send for all groups; connections are opened once per mail server
+        mails = self.env['mail.mail'].union(*[mail for mail in mail_by_pending.values() if mail])
+        mails.send(auto_commit=auto_commit, raise_exception=False)
+
+        sent = self.browse()
+        for pending_email, mail in mail_by_pending.items():
+            # Successfully sent mails are auto-deleted or left in the sent state
+            if mail and (not mail.exists() or mail.state == 'sent'):
+                sent |= pending_email
             else:
-                _logger.warning(f'Failed to send pending email {self.name} (attempt {self.retry_count}): {error_msg}')
+                errors[pending_email] = (mail.exists() and mail.failure_reason) or _('Email could not be sent')
+
+        sent._record_attempt(now, state='sent')
+        for pending_emails, error_message in errors.items():
+            pending_emails._record_attempt(now, error_message=error_message)
+        _logger.info(f'Pending email batch: {len(sent)} sent, {len(self) - len(sent)} failed')
+
+    def _record_attempt(self, attempt_date, state=None, error_message=None):
+        """Store the outcome of a send attempt, one write per retry count"""
+        for retry_count, records in self.grouped('retry_count').items():
+            vals = {'last_attempt_date': attempt_date, 'retry_count': retry_count + 1}
+            if state:
+                vals['state'] = state
+            if error_message:
+                vals['error_message'] = error_message
+            records.write(vals)
+        if error_message:
+            exhausted = self.filtered(lambda record: record.retry_count >= record.max_retries)
+            exhausted.write({'state': 'failed'})
+            for record in exhausted:
+                _logger.error(f'Failed to send pending email {record.name} after {record.retry_count} attempts: {error_message}')
 
     def action_cancel(self):
         """Cancel the pending email"""
@@ -235,21 +291,25 @@ class AcmstPendingEmail(models.Model):
         self.error_message = False
 
     @api.model
-    def cron_retry_pending_emails(self):
-        """Cron job to retry pending emails"""
-        # Update ready_for_retry field first
-        self._compute_ready_for_retry()
+    def cron_retry_pending_emails(self, limit=1000, auto_commit=None):
+        """Cron job to retry pending emails, at most ``limit`` per run"""
+        if auto_commit is None:
+            auto_commit = not getattr(threading.current_thread(), 'testing', False)
 
         pending_emails = self.search([
             ('state', '=', 'pending'),
-            ('ready_for_retry', '=', True)
-        ])
+            ('next_retry_date', '<=', fields.Datetime.now())
+        ], order='next_retry_date, id', limit=limit)
 
-        for email in pending_emails:
-            email._attempt_send()
+        pending_emails._retry_send(auto_commit=auto_commit)
+        if auto_commit:
+            self.env.cr.commit()
 
         if pending_emails:
             _logger.info(f'Retried {len(pending_emails)} pending emails')
+        if len(pending_emails) == limit:
+            # More are due, run again right away instead of waiting for the next interval
+            self.env.ref('acmst_admission.cron_retry_pending_emails')._trigger()
 
     @api.model
     def get_pending_email_summary(self):
@@ -15,6 +15,8 @@ except ImportError:
     psycopg2 = None
     ProgrammingError = Exception
 
+from .acmst_live_metrics import LIVE_METRICS, METRIC_WINDOWS
+
 _logger = logging.getLogger(__name__)
 
 
@@ -60,8 +62,8 @@ class AcmstPerformanceOptimization(models.Model):
     active = fields.Boolean(string='Active', default=True)
 
     @api.model
-    def create_index_optimization(self, model_name, field_names, index_name=None):
-        """Create database index optimization"""
+    def create_index_optimization(self, model_name, field_names, index_name=None, where=None, method='btree'):
+        """Create database index optimization, partial when ``where`` is given"""
         if not index_name:
             index_name = f"{model_name}_{'_'.join(field_names)}_idx"
         
@@ -77,7 +79,9 @@ class AcmstPerformanceOptimization(models.Model):
         try:
             # Create index using SQL
             field_list = ', '.join(field_names)
-            sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {model_name.replace('.', '_')} ({field_list})"
+            sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {self.env[model_name]._table} USING {method} ({field_list})"
+            if where:
+                sql += f" WHERE {where}"
             self.env.cr.execute(sql)
             
             optimization.write({
@@ -574,48 +578,15 @@ class AcmstPerformanceOptimization(models.Model):
         """Run comprehensive optimization for admission module"""
         optimizations = []
         
-        # Database indexes
-        optimizations.append(self.create_index_optimization(
-            'acmst.admission.file',
-            ['state', 'create_date'],
-            'acmst_admission_file_state_date_idx'
-        ))
-        
-        optimizations.append(self.create_index_optimization(
-            'acmst.admission.file',
-            ['applicant_name_english', 'national_id'],
-            'acmst_admission_file_name_id_idx'
-        ))
-        
-        optimizations.append(self.create_index_optimization(
-            'acmst.health.check',
-            ['admission_file_id', 'state'],
-            'acmst_health_check_file_state_idx'
-        ))
-        
-        optimizations.append(self.create_index_optimization(
-            'acmst.coordinator.condition',
-            ['admission_file_id', 'state'],
-            'acmst_coordinator_condition_file_state_idx'
-        ))
-        
-        optimizations.append(self.create_index_optimization(
-            'acmst.admission.approval',
-            ['admission_file_id', 'approval_type'],
-            'acmst_admission_approval_file_type_idx'
-        ))
-        
-        optimizations.append(self.create_index_optimization(
-            'acmst.portal.application',
-            ['state', 'create_date'],
-            'acmst_portal_application_state_date_idx'
-        ))
-        
-        optimizations.append(self.create_index_optimization(
-            'acmst.audit.log',
-            ['res_model_id', 'res_id', 'create_date'],
-            'acmst_audit_log_model_id_date_idx'
-        ))
+        # Database indexes, as declared by the admission index registry
+        for definition in self.env['acmst.index.registry'].get_index_definitions():
+            optimizations.append(self.create_index_optimization(
+                definition['model'],
+                definition['expressions'],
+                definition['name'],
+                where=definition['where'],
+                method=definition['method']
+            ))
         
         # Caching optimizations
         optimizations.append(self.create_cache_optimization(
@@ -871,13 +842,13 @@ class AcmstPerformanceOptimization(models.Model):
                 'message': f'High memory usage detected: {memory_usage}%'
             })
         
-        # Check for slow queries
-        slow_queries = self._get_slow_query_count()
-        if slow_queries > 10:
+        # Check for slow requests
+        slow_requests = self._get_slow_request_count()
+        if slow_requests > 10:
             alerts.append({
                 'type': 'warning',
                 'icon': 'exclamation-triangle',
-                'message': f'High number of slow queries: {slow_queries}'
+                'message': f'High number of slow requests: {slow_requests}'
             })
         
         # Check for optimization opportunities
@@ -894,20 +865,16 @@ class AcmstPerformanceOptimization(models.Model):
     @api.model
     def _get_memory_usage(self):
         """
-        Get current memory usage percentage.
-        In a real implementation, this would query system metrics.
+        Get current memory usage percentage of the worker process.
         """
-        import random
-        return random.randint(60, 90)
+        return self.env['acmst.live.metrics'].get_process_metrics()['memory_percent']
 
     @api.model
-    def _get_slow_query_count(self):
+    def _get_slow_request_count(self):
         """
-        Get count of slow queries.
-        In a real implementation, this would query database metrics.
+        Get count of slow requests over the last 15 minutes.
         """
-        import random
-        return random.randint(5, 15)
+        return LIVE_METRICS.window(METRIC_WINDOWS['15m'])['slow_requests']
 
     @api.model
     def run_optimization_check(self):
@@ -930,13 +897,19 @@ class AcmstPerformanceOptimization(models.Model):
     @api.model
     def _check_database_indexes(self):
         """
-        Check database index status.
+        Check database index status against the admission index registry.
         """
-        # In a real implementation, this would query the database for index information
+        report = self.env['acmst.index.registry']._check_indexes()
+        recommendations = [f'Create missing index {name}' for name in report['missing']]
+        recommendations += [f'Rebuild invalid index {name}' for name in report['invalid']]
+        recommendations += [f'Review unused index {index["name"]} on {index["table"]}' for index in report['unused']]
         return {
-            'status': 'good',
-            'missing_indexes': 2,
-            'recommendations': ['Add index on admission_file.state', 'Add index on health_check.medical_fitness']
+            'status': 'warning' if report['missing'] or report['invalid'] else 'good',
+            'missing_indexes': len(report['missing']),
+            'invalid_indexes': len(report['invalid']),
+            'unused_indexes': len(report['unused']),
+            'stats_since': report['stats_since'],
+            'recommendations': recommendations
         }
 
     @api.model
@@ -998,7 +971,7 @@ class AcmstPerformanceOptimization(models.Model):
             'timestamp': fields.Datetime.now().isoformat(),
             'system_metrics': {
                 'memory_usage': self._get_memory_usage(),
-                'slow_queries': self._get_slow_query_count(),
+                'slow_requests': self._get_slow_request_count(),
                 'active_optimizations': self.search_count([('active', '=', True)]),
                 'total_optimizations': self.search_count([])
             },
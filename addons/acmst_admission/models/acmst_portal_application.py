@@ -9,17 +9,40 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+# Applications converted to admission files together
+CONVERSION_BATCH_SIZE = 200
+
 
 class AcmstPortalApplication(models.Model):
     _name = 'acmst.portal.application'
     _description = 'Portal Application'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'acmst.audit.mixin']
     _order = 'submission_date desc'
 
     _sql_constraints = [
         ('name_unique', 'unique(name)', 'Application number must be unique!'),
+        ('idempotency_key_unique', 'unique(idempotency_key)', 'This submission was already received!'),
     ]
 
+    # Fields whose changes are logged as diffs by acmst.audit.mixin
+    _audit_fields = ('state', 'program_id', 'batch_id', 'applicant_name_english', 'applicant_name_arabic',
+                     'national_id', 'phone', 'email', 'admission_file_id')
+
+    # Fields an application needs before an admission file can be created from it
+    _ADMISSION_FILE_REQUIRED_FIELDS = ['program_id', 'batch_id', 'applicant_name_english', 'applicant_name_arabic',
+                                       'phone', 'email', 'birth_date', 'gender', 'nationality', 'id_type',
+                                       'national_id', 'address', 'emergency_contact', 'emergency_phone',
+                                       'admission_type', 'place_of_birth', 'religion']
+    # Fields copied to the admission file as they are
+    _ADMISSION_FILE_COPIED_FIELDS = ['applicant_name_english', 'applicant_name_arabic', 'national_id', 'phone',
+                                     'email', 'program_id', 'batch_id', 'birth_date', 'gender', 'nationality',
+                                     'religion', 'address', 'emergency_contact', 'emergency_phone',
+                                     'previous_education', 'education_institution', 'education_program',
+                                     'education_college', 'education_major', 'education_start_year',
+                                     'education_completion_year', 'certificate_type', 'education_duration_years',
+                                     'id_type', 'admission_type', 'place_of_birth', 'profile_picture_filename',
+                                     'id_document_filename']
+
     # Application Data
     name = fields.Char(
         string=_('Application Number'),
@@ -67,7 +90,8 @@ class AcmstPortalApplication(models.Model):
         ('under_review', _('Under Review')),
         ('approved', _('Approved')),
         ('rejected', _('Rejected')),
-        ('cancelled', _('Cancelled'))
+        ('cancelled', _('Cancelled')),
+        ('admission_created', _('Admission File Created'))
     ], string=_('State'), default='draft', tracking=True, help=_('Current state of the application'))
     submitted_to_ministry = fields.Boolean(
         string=_('Submitted to Ministry'),
@@ -263,15 +287,21 @@ class AcmstPortalApplication(models.Model):
     id_document = fields.Binary(
         string=_('ID Document'),
         help=_('Upload your National ID or Passport copy'),
-        required=False,
-        tracking=True
+        required=False
     )
     id_document_filename = fields.Char(
         string=_('ID Document Filename'),
+        tracking=True,
         help=_('Filename of the uploaded ID document')
     )
 
     # Portal specific fields
+    idempotency_key = fields.Char(
+        string=_('Idempotency Key'),
+        copy=False,
+        readonly=True,
+        help=_('Client token of the request that created the application, so retried submissions are not duplicated')
+    )
     portal_user_id = fields.Many2one(
         'res.users',
         string=_('Portal User'),
@@ -338,6 +368,22 @@ class AcmstPortalApplication(models.Model):
         string=_('Profile Picture Filename'),
         help=_('Name of the profile picture file')
     )
+    profile_picture_128 = fields.Image(
+        string=_('Profile Picture 128'),
+        related='profile_picture',
+        max_width=128,
+        max_height=128,
+        store=True,
+        help=_('Profile picture resized for lists and kanban cards')
+    )
+    profile_picture_512 = fields.Image(
+        string=_('Profile Picture 512'),
+        related='profile_picture',
+        max_width=512,
+        max_height=512,
+        store=True,
+        help=_('Profile picture resized for forms and portal pages')
+    )
 
     @api.depends('birth_date')
     def _compute_age(self):
@@ -356,16 +402,8 @@ class AcmstPortalApplication(models.Model):
     def create(self, vals):
         """Override create to generate application number and validate required fields"""
         if vals.get('name', _('New')) == _('New'):
-            # Generate unique application number
-            sequence_code = 'acmst.portal.application'
-            while True:
-                sequence_number = self.env['ir.sequence'].next_by_code(sequence_code)
-                if sequence_number and not self.search([('name', '=', sequence_number)], limit=1):
-                    vals['name'] = sequence_number
-                    break
-                elif not sequence_number:
-                    vals['name'] = _('New')
-                    break
+            # Uniqueness is enforced by the name_unique constraint
+            vals['name'] = self.env['acmst.numbering']._next_number('acmst.portal.application') or _('New')
 
         # Set portal user if not provided
         if 'portal_user_id' not in vals:
@@ -680,22 +718,15 @@ class AcmstPortalApplication(models.Model):
         """Reopen application (alias for action_reset_to_draft)"""
         return self.action_reset_to_draft()
 
-    def _safe_send_mail(self, template_ref, record_id=None, force_send=True):
-        """Safely send email with proper error handling"""
+    def _safe_send_mail(self, template_ref, record_id=None, force_send=False):
+        """Safely queue email with proper error handling"""
         try:
             template = self.env.ref(template_ref, False)
             if template:
-                # Check if there's an active mail server before sending
-                mail_server = self.env['ir.mail_server'].search([('active', '=', True)], order='sequence', limit=1)
-                if mail_server:
-                    template.send_mail(record_id or self.id, force_send=force_send)
-                    _logger.info(f'Successfully sent email using template {template_ref}')
-                    return True
-                else:
-                    # Create pending email instead of skipping
-                    _logger.warning(f'No active mail server configured. Creating pending email for template {template_ref}.')
-                    self._create_pending_email(template_ref, record_id or self.id)
-                    return False
+                # Render and queue the email, delivered by the mail queue cron
+                self.env['acmst.mail.queue'].enqueue(template, [record_id or self.id], force_send=force_send)
+                _logger.info(f'Successfully queued email using template {template_ref}')
+                return True
             else:
                 _logger.warning(f'Template {template_ref} not found.')
                 return False
@@ -754,129 +785,159 @@ class AcmstPortalApplication(models.Model):
         
         return self.search(domain)
 
+    def _get_admission_file_errors(self):
+        """Return the reason each application cannot create an admission file, by application id"""
+        errors = {}
+        for application in self:
+            if application.state not in ['submitted', 'under_review', 'approved']:
+                errors[application.id] = _('Only submitted, under review, or approved applications can create admission files.')
+                continue
+            missing_fields = [
+                self._fields[field].string for field in self._ADMISSION_FILE_REQUIRED_FIELDS if not application[field]
+            ]
+            if missing_fields:
+                errors[application.id] = (
+                    _('Please complete the following required fields before creating admission file: %s') %
+                    ', '.join(missing_fields)
+                )
+        return errors
+
+    def _get_admission_file_vals(self):
+        """Values copied from each application to its admission file, read in one pass"""
+        return {
+            values['id']: {field: values[field] for field in self._ADMISSION_FILE_COPIED_FIELDS}
+            for values in self.read(self._ADMISSION_FILE_COPIED_FIELDS, load=None)
+        }
+
     def action_create_admission_file(self):
         """Create admission file from portal application"""
         self.ensure_one()
-        if self.state not in ['submitted', 'under_review', 'approved']:
-            raise UserError(_('Only submitted, under review, or approved applications can create admission files.'))
-
-        # Validate all required fields are set
-        required_fields = ['program_id', 'batch_id', 'applicant_name_english', 'applicant_name_arabic',
-                          'phone', 'email', 'birth_date', 'gender', 'nationality', 'id_type',
-                          'national_id', 'address', 'emergency_contact', 'emergency_phone',
-                          'admission_type', 'place_of_birth', 'religion']
-
-        missing_fields = []
-        for field in required_fields:
-            value = getattr(self, field)
-            if not value:
-                field_label = self._fields[field].string
-                missing_fields.append(field_label)
+        errors = self._get_admission_file_errors()
+        if errors:
+            raise UserError(errors[self.id])
+        self._create_admission_files()
+        return True
 
-        if missing_fields:
-            raise UserError(
-                _('Please complete the following required fields before creating admission file: %s') %
-                ', '.join(missing_fields)
-            )
+    def convert_to_admission_files(self, batch_size=CONVERSION_BATCH_SIZE):
+        """Create the admission files of many applications at once.
+
+        Applications are converted in batches, each in its own savepoint; a
+        batch that fails is retried application by application, so one bad
+        record does not block the others. Returns the converted application
+        ids, their ``admission_file_ids`` and the ``errors`` as a list of
+        ``{'id', 'name', 'message'}`` dicts.
+        """
+        errors = self._get_admission_file_errors()
+        result = {'converted': [], 'admission_file_ids': [], 'errors': []}
+        for application in self.filtered(lambda application: application.id in errors):
+            result['errors'].append({'id': application.id, 'name': application.name, 'message': errors[application.id]})
+
+        valid = self.filtered(lambda application: application.id not in errors)
+        for start in range(0, len(valid), batch_size):
+            batch = valid[start:start + batch_size]
+            try:
+                with self.env['acmst.audit.log']._savepoint():
+                    batch._create_admission_files()
+                converted = batch
+            except Exception as e:
+                _logger.warning(f'Converting {len(batch)} portal applications failed, retrying one by one: {e}')
+                converted = self.browse()
+                for application in batch:
+                    try:
+                        with self.env['acmst.audit.log']._savepoint():
+                            application._create_admission_files()
+                        converted |= application
+                    except (ValidationError, UserError) as e:
+                        result['errors'].append({'id': application.id, 'name': application.name, 'message': str(e)})
+                    except Exception as e:
+                        _logger.error(f'Error creating admission file for portal application {application.name}: {e}')
+                        result['errors'].append({'id': application.id, 'name': application.name, 'message': str(e)})
+            result['converted'] += converted.ids
+            result['admission_file_ids'] += converted.admission_file_id.ids
+
+        _logger.info(f"Converted {len(result['converted'])} portal applications, {len(result['errors'])} failed")
+        return result
 
-        # Create or get admission file
-        if not self.admission_file_id:
-            # Create new admission file in ministry_pending state
-            admission_vals = {
-                'applicant_name_english': self.applicant_name_english,
-                'applicant_name_arabic': self.applicant_name_arabic,
-                'national_id': self.national_id,
-                'phone': self.phone,
-                'email': self.email,
-                'program_id': self.program_id.id,
-                'batch_id': self.batch_id.id,
-                'birth_date': self.birth_date,
-                'gender': self.gender,
-                'nationality': self.nationality,
-                'address': self.address,
-                'emergency_contact': self.emergency_contact,
-                'emergency_phone': self.emergency_phone,
-                'previous_education': self.previous_education,
-                'education_institution': self.education_institution,
-                'education_program': self.education_program,
-                'education_college': self.education_college,
-                'education_major': self.education_major,
-                'education_start_year': self.education_start_year,
-                'education_completion_year': self.education_completion_year,
-                'certificate_type': self.certificate_type,
-                'education_duration_years': self.education_duration_years,
-                'submission_method': 'portal',
-                'state': 'ministry_pending',
-                'name': self.name,  # Use the same name as portal application
-                'religion': self.religion,
-                'id_type': self.id_type,
-                'admission_type': self.admission_type,
-                'place_of_birth': self.place_of_birth,
-                'profile_picture': self.profile_picture,
-                'profile_picture_filename': self.profile_picture_filename
+    def action_create_admission_files(self):
+        """Create admission files for all selected applications"""
+        result = self.convert_to_admission_files()
+        message = _('%s admission file(s) created.') % len(result['converted'])
+        if result['errors']:
+            message += '\n' + '\n'.join(f"{error['name']}: {error['message']}" for error in result['errors'])
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Admission Files'),
+                'message': message,
+                'type': 'warning' if result['errors'] else 'success',
+                'sticky': bool(result['errors']),
             }
+        }
 
-            admission_file = self.env['acmst.admission.file'].create(admission_vals)
-
-            # Create guardian records for the admission file
-            for guardian in self.guardian_ids:
-                self.env['acmst.guardian'].create({
-                    'name': guardian.name,
-                    'relationship': guardian.relationship,
-                    'phone': guardian.phone,
-                    'email': guardian.email,
-                    'is_default': guardian.is_default,
-                    'is_active': guardian.is_active,
-                    'admission_file_id': admission_file.id
-                })
-            self.write({'admission_file_id': admission_file.id})
-        else:
+    def _create_admission_files(self):
+        """Create or refresh the admission files of valid applications, in batches.
+
+        New admission files and their guardians are created with one
+        ``create`` call each. Linking the applications to their files and
+        refreshing the files that already exist are done one by one, as each
+        gets its own values.
+        """
+        admission_vals = self._get_admission_file_vals()
+        new_applications = self.filtered(lambda application: not application.admission_file_id)
+        existing_applications = self - new_applications
+
+        if new_applications:
+            # Create new admission files in ministry_pending state
+            admission_files = self.env['acmst.admission.file'].create([
+                dict(admission_vals[application.id],
+                     submission_method='portal',
+                     state='ministry_pending',
+                     name=application.name)  # Use the same name as portal application
+                for application in new_applications
+            ])
+            for application, admission_file in zip(new_applications, admission_files):
+                admission_file._share_binary_fields(application)
+
+            # Create guardian records for all admission files at once
+            self.env['acmst.guardian'].create([{
+                'name': guardian.name,
+                'relationship': guardian.relationship,
+                'phone': guardian.phone,
+                'email': guardian.email,
+                'is_default': guardian.is_default,
+                'is_active': guardian.is_active,
+                'admission_file_id': admission_file.id
+            } for application, admission_file in zip(new_applications, admission_files)
+                for guardian in application.guardian_ids])
+
+            new_applications._link_admission_files(admission_files)
+
+        for application in existing_applications:
             # Update existing admission file with current portal data and set to ministry_pending state
-            self.admission_file_id.write({
-                'applicant_name_english': self.applicant_name_english,
-                'applicant_name_arabic': self.applicant_name_arabic,
-                'national_id': self.national_id,
-                'phone': self.phone,
-                'email': self.email,
-                'program_id': self.program_id.id,
-                'batch_id': self.batch_id.id,
-                'birth_date': self.birth_date,
-                'gender': self.gender,
-                'nationality': self.nationality,
-                'religion': self.religion,
-                'address': self.address,
-                'emergency_contact': self.emergency_contact,
-                'emergency_phone': self.emergency_phone,
-                'previous_education': self.previous_education,
-                'education_institution': self.education_institution,
-                'education_program': self.education_program,
-                'education_college': self.education_college,
-                'education_major': self.education_major,
-                'education_start_year': self.education_start_year,
-                'education_completion_year': self.education_completion_year,
-                'certificate_type': self.certificate_type,
-                'education_duration_years': self.education_duration_years,
-                'id_type': self.id_type,
-                'admission_type': self.admission_type,
-                'place_of_birth': self.place_of_birth,
-                'profile_picture': self.profile_picture,
-                'profile_picture_filename': self.profile_picture_filename,
-                'state': 'ministry_pending'
-            })
+            application.admission_file_id.write(dict(admission_vals[application.id], state='ministry_pending'))
+            application.admission_file_id._share_binary_fields(application)
 
         # Update portal application state
         self.write({'state': 'admission_created'})
 
-        # Create initial approval record for ministry pending
-        self.env['acmst.admission.approval'].create({
-            'admission_file_id': self.admission_file_id.id,
+        # Create initial approval records for ministry pending
+        self.env['acmst.admission.approval'].create([{
+            'admission_file_id': application.admission_file_id.id,
             'approval_type': 'ministry',
             'approval_date': fields.Datetime.now(),
             'decision': 'pending',
             'comments': 'Admission file created from portal application'
-        })
+        } for application in self])
+        _logger.info(f"Created admission files for {len(new_applications)} and refreshed {len(existing_applications)} portal application(s)")
 
-        return True
+    def _link_admission_files(self, admission_files):
+        """Set the admission file of each application, in order.
+
+        Written through the ORM so the change is audited by the audit mixin.
+        """
+        for application, admission_file in zip(self, admission_files):
+            application.write({'admission_file_id': admission_file.id})
 
     @api.model
     def get_application_status(self, application_id):
@@ -895,41 +956,16 @@ class AcmstPortalApplication(models.Model):
 
         return status_info
 
-    def write(self, vals):
-        """Override write to log all changes"""
-        _logger.info(f"Updating portal application {self.name} with vals: {vals}")
-
-        # Get old values before update
-        old_values = {}
-        if 'state' in vals:
-            old_values['state'] = self.state
-
-        result = super(AcmstPortalApplication, self).write(vals)
-
-        # Log state changes
-        if 'state' in vals and old_values.get('state') != self.state:
-            _logger.info(f"Portal application {self.name} state changed from {old_values.get('state')} to {self.state}")
-
-            # Create audit log entry for state change
-            self.env['acmst.audit.log'].create({
-                'model_name': 'acmst.portal.application',
-                'record_id': self.id,
-                'record_name': self.name,
-                'action': 'write',
-                'category': 'workflow',
-                'old_values': f"State: {old_values.get('state')}",
-                'new_values': f"State: {self.state}",
-                'user_id': self.env.user.id,
-                'action_description': f'State changed from {old_values.get("state")} to {self.state}'
-            })
-
-            # Post message to chatter
-            self.message_post(
-                body=f'Status changed from {old_values.get("state")} to {self.state}',
-                message_type='comment'
-            )
-
-        return result
+    def _on_audited_changes(self, diffs):
+        """Post the state changes, audited by acmst.audit.mixin, to the chatter"""
+        super()._on_audited_changes(diffs)
+        messages = {
+            record_id: f"Status changed from {diff['state']['old']} to {diff['state']['new']}"
+            for record_id, diff in diffs.items() if 'state' in diff
+        }
+        if messages:
+            _logger.info(f"{len(messages)} portal application(s) changed state")
+            self.browse(list(messages))._message_log_batch(messages, message_type='comment')
 
     def unlink(self):
         """Override unlink to log deletions"""
@@ -942,7 +978,7 @@ class AcmstPortalApplication(models.Model):
                 'record_id': record.id,
                 'record_name': record.name,
                 'action': 'unlink',
-                'category': 'data_deletion',
+                'category': 'data_modification',
                 'old_values': f'Portal application: {record.name} for {record.applicant_name_english}',
                 'new_values': '',
                 'user_id': self.env.user.id,
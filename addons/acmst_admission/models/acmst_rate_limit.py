@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Requests a client may burst before being limited
+RATE_LIMIT_CAPACITY = 10
+# Requests regained per second, i.e. a sustained rate of 10 per minute
+RATE_LIMIT_REFILL_RATE = 10 / 60.0
+
+
+class AcmstRateLimit(models.Model):
+    """Token buckets limiting portal submissions per client.
+
+    Buckets live in the database so every worker shares them. Each request
+    refills the bucket for the time elapsed since the previous one and takes
+    a token in a single upsert, which also serializes concurrent requests of
+    the same client on the bucket row. Callers run it in a cursor of its own
+    that commits right away, so the row lock is not held for the rest of the
+    request. A denied request takes its token too, down to -1, so a retry
+    storm keeps its client limited until it backs off.
+    """
+    _name = 'acmst.rate.limit'
+    _description = 'Submission Rate Limit Bucket'
+    _log_access = False
+
+    key = fields.Char(string='Key', required=True, readonly=True, help='Client the bucket belongs to, e.g. ip:<address>')
+    tokens = fields.Float(string='Tokens', readonly=True, help='Requests currently available')
+    last_refill = fields.Datetime(string='Last Refill', readonly=True, help='Time of the last request')
+
+    _sql_constraints = [
+        ('key_unique', 'unique(key)', 'Rate limit key must be unique!'),
+    ]
+
+    @api.model
+    def _consume(self, key, capacity=RATE_LIMIT_CAPACITY, refill_rate=RATE_LIMIT_REFILL_RATE):
+        """Take one token from the bucket of ``key``; return whether the request is allowed"""
+        self.env.cr.execute("""
+            INSERT INTO acmst_rate_limit AS bucket (key, tokens, last_refill)
+            VALUES (%(key)s, %(capacity)s - 1, now() AT TIME ZONE 'UTC')
+            ON CONFLICT (key) DO UPDATE SET
+                tokens = GREATEST(LEAST(
+                    %(capacity)s,
+                    bucket.tokens + EXTRACT(EPOCH FROM (now() AT TIME ZONE 'UTC') - bucket.last_refill) * %(rate)s
+                ) - 1, -1),
+                last_refill = now() AT TIME ZONE 'UTC'
+            RETURNING tokens
+        """, {'key': key, 'capacity': capacity, 'rate': refill_rate})
+        allowed = self.env.cr.fetchone()[0] >= 0
+        if not allowed:
+            _logger.warning(f'Rate limit exceeded for {key}')
+        return allowed
+
+    @api.autovacuum
+    def _gc_idle_buckets(self):
+        """Drop buckets idle long enough to be full again"""
+        self.env.cr.execute("""
+            DELETE FROM acmst_rate_limit
+            WHERE last_refill < (now() AT TIME ZONE 'UTC') - interval '1 day'
+        """)
+        _logger.info(f'Removed {self.env.cr.rowcount} idle rate limit buckets')
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# States counted as "approved by coordinator" / "conditionally approved" once
+# the file has moved further down the workflow.
+COORDINATOR_APPROVED_STATES = ['coordinator_approved', 'manager_review', 'manager_approved', 'manager_rejected', 'completed']
+COORDINATOR_CONDITIONAL_STATES = ['coordinator_conditional', 'manager_review', 'manager_approved', 'manager_rejected', 'completed']
+COORDINATOR_REVIEW_STATES = ['coordinator_review', 'coordinator_approved', 'coordinator_rejected', 'coordinator_conditional']
+REJECTED_STATES = ['ministry_rejected', 'health_rejected', 'coordinator_rejected', 'manager_rejected']
+
+
+class AcmstStatistics(models.AbstractModel):
+    """Shared statistics service for the admission dashboards.
+
+    Each source is aggregated with a single GROUP BY over the columns the
+    dashboards filter on. The grouped rows are kept for the rest of the
+    transaction so every dashboard compute method is fed from the same result.
+
+    Admission file workflow counters are read from the materialized
+    ``acmst.admission.stats`` table rather than from the admission files.
+    """
+    _name = 'acmst.statistics'
+    _description = 'Admission Statistics Service'
+
+    # source: (model read, groupby, count aggregate, model whose changes invalidate it)
+    _STATISTICS_SOURCES = {
+        'admission_counters': ('acmst.admission.stats', ['state', 'coordinator_id', 'manager_id'],
+                               'count:sum', 'acmst.admission.file'),
+        'admission_profile': ('acmst.admission.file', ['is_processing_student', 'academic_level'],
+                              '__count', 'acmst.admission.file'),
+        'health_check': ('acmst.health.check', ['state', 'examiner_id'],
+                         '__count', 'acmst.health.check'),
+        'coordinator_condition': ('acmst.coordinator.condition', ['state', 'coordinator_id'],
+                                  '__count', 'acmst.coordinator.condition'),
+    }
+
+    @api.model
+    def _get_statistics_cache(self):
+        """Transaction-scoped cache, dropped on commit and rollback"""
+        return self.env.cr.precommit.data.setdefault('acmst.statistics', {})
+
+    @api.model
+    def _get_grouped_rows(self, source):
+        """Return the grouped rows of ``source`` as a list of dicts"""
+        cache = self._get_statistics_cache()
+        key = (source, self.env.uid, self.env.su)
+        if key not in cache:
+            model_name, groupby, aggregate, __ = self._STATISTICS_SOURCES[source]
+            rows = []
+            for row in self.env[model_name]._read_group([], groupby, [aggregate]):
+                values = {
+                    fname: value.id if isinstance(value, models.BaseModel) else value
+                    for fname, value in zip(groupby, row)
+                }
+                values['__count'] = row[-1] or 0
+                rows.append(values)
+            cache[key] = rows
+        return cache[key]
+
+    @api.model
+    def _count(self, source, **criteria):
+        """Count records of ``source`` matching ``criteria``.
+
+        Each criterion is a groupby column name mapped to either a single
+        value or a list of accepted values.
+        """
+        total = 0
+        for row in self._get_grouped_rows(source):
+            for fname, accepted in criteria.items():
+                if isinstance(accepted, (list, tuple, set)):
+                    if row[fname] not in accepted:
+                        break
+                elif row[fname] != accepted:
+                    break
+            else:
+                total += row['__count']
+        return total
+
+    @api.model
+    def invalidate_statistics(self, model_name=None):
+        """Drop cached rows depending on ``model_name`` (all if not given)"""
+        cache = self._get_statistics_cache()
+        if model_name is None:
+            cache.clear()
+            return
+        for key in [key for key in cache if self._STATISTICS_SOURCES[key[0]][3] == model_name]:
+            del cache[key]
+
+    @api.model
+    def get_admission_file_statistics(self):
+        """Get all admission file counters for the current user"""
+        uid = self.env.uid
+        count = lambda **criteria: self._count('admission_counters', **criteria)
+        profile_count = lambda **criteria: self._count('admission_profile', **criteria)
+        return {
+            'total': count(),
+            'new': count(state='new'),
+            'ministry_pending': count(state='ministry_pending'),
+            'ministry_approved': count(state='ministry_approved'),
+            'ministry_rejected': count(state='ministry_rejected'),
+            'health_required': count(state='health_required'),
+            'coordinator_review': count(state='coordinator_review'),
+            'coordinator_approved': count(state='coordinator_approved'),
+            'coordinator_conditional': count(state='coordinator_conditional'),
+            'coordinator_rejected': count(state='coordinator_rejected'),
+            'coordinator_total_reviews': count(state=COORDINATOR_REVIEW_STATES),
+            'manager_review': count(state='manager_review'),
+            'manager_approved': count(state='manager_approved'),
+            'completed': count(state='completed'),
+            'rejected': count(state=REJECTED_STATES),
+            'processing_students': profile_count(is_processing_student=True),
+            'level2': profile_count(academic_level='level2'),
+            'level3': profile_count(academic_level='level3'),
+            'my_reviews': count(coordinator_id=uid),
+            'my_coordinator_approved': count(coordinator_id=uid, state=COORDINATOR_APPROVED_STATES),
+            'my_coordinator_conditional': count(coordinator_id=uid, state=COORDINATOR_CONDITIONAL_STATES),
+            'my_manager_reviews': count(manager_id=uid),
+            'my_manager_approvals': count(manager_id=uid, state=['manager_approved', 'completed']),
+        }
+
+    @api.model
+    def get_health_check_statistics(self):
+        """Get all health check counters for the current user"""
+        uid = self.env.uid
+        count = lambda **criteria: self._count('health_check', **criteria)
+        return {
+            'total': count(),
+            'draft': count(state='draft'),
+            'submitted': count(state='submitted'),
+            'approved': count(state='approved'),
+            'rejected': count(state='rejected'),
+            'mine': count(examiner_id=uid),
+            'my_completed': count(examiner_id=uid, state=['approved', 'rejected']),
+        }
+
+    @api.model
+    def get_coordinator_condition_statistics(self):
+        """Get all coordinator condition counters for the current user"""
+        uid = self.env.uid
+        count = lambda **criteria: self._count('coordinator_condition', **criteria)
+        return {
+            'total': count(),
+            'pending': count(state='pending'),
+            'completed': count(state='completed'),
+            'rejected': count(state='rejected'),
+            'overdue': count(state='overdue'),
+            'my_active': count(coordinator_id=uid, state=['pending', 'in_progress']),
+            'my_overdue': count(coordinator_id=uid, state='overdue'),
+        }
@@ -2,10 +2,13 @@
 # Copyright 2024 ACMST College
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError, UserError
+from collections import defaultdict
 from datetime import datetime, date, timedelta
+import ast
 import logging
+import threading
 
 _logger = logging.getLogger(__name__)
 
@@ -56,6 +59,11 @@ class AcmstWorkflowEngine(models.Model):
         default=24,
         help='Timeout in hours for automatic transitions'
     )
+    timeout_chunk_size = fields.Integer(
+        string='Timeout Chunk Size',
+        default=500,
+        help='Number of admission files transitioned and committed at once by timeout rules'
+    )
 
     def execute_workflow(self, admission_file):
         """Execute workflow for an admission file"""
@@ -65,9 +73,7 @@ class AcmstWorkflowEngine(models.Model):
             return False
         
         current_state = admission_file.state
-        applicable_rules = self.workflow_rules.filtered(
-            lambda r: r.from_state == current_state and r.active
-        )
+        applicable_rules = self._get_rules(from_state=current_state)
         
         for rule in applicable_rules:
             if rule.evaluate_conditions(admission_file):
@@ -76,8 +82,8 @@ class AcmstWorkflowEngine(models.Model):
                     admission_file.write({'state': rule.to_state})
                     _logger.info(f'Workflow transition: {current_state} -> {rule.to_state} for file {admission_file.name}')
 
-                    # Create audit log entry for workflow transition
-                    self.env['acmst.audit.log'].create({
+                    # Queue audit log entry for workflow transition
+                    self.env['acmst.audit.log']._buffer_log({
                         'model_name': 'acmst.admission.file',
                         'record_id': admission_file.id,
                         'record_name': admission_file.name,
@@ -108,35 +114,67 @@ class AcmstWorkflowEngine(models.Model):
         
         return True
 
-    def process_timeout_transitions(self):
-        """Process timeout transitions for all admission files"""
+    def process_timeout_transitions(self, auto_commit=None):
+        """Process timeout transitions for all admission files.
+
+        Eligible files are transitioned per rule in chunks of
+        ``timeout_chunk_size`` with one grouped write each. When
+        ``auto_commit`` is set (the default outside tests) every chunk is
+        committed along with the rule's progress, so an interrupted run
+        resumes after the last committed chunk.
+        """
         self.ensure_one()
         
         if not self.auto_transitions:
             return
         
-        timeout_rules = self.workflow_rules.filtered(
-            lambda r: r.action_type == 'timeout' and r.active
-        )
+        if auto_commit is None:
+            auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        timeout_rules = self._get_rules(action_type='timeout')
         
         for rule in timeout_rules:
-            timeout_date = fields.Datetime.now() - timedelta(hours=rule.timeout_hours)
-            admission_files = self.env['acmst.admission.file'].search([
-                ('state', '=', rule.from_state),
-                ('write_date', '<', timeout_date)
-            ])
-            
-            for admission_file in admission_files:
-                try:
-                    admission_file.write({'state': rule.to_state})
-                    _logger.info(f'Timeout transition: {rule.from_state} -> {rule.to_state} for file {admission_file.name}')
-                    
-                    if self.notification_enabled and rule.send_notification:
-                        rule.send_notification_email(admission_file)
-                except (ValidationError, UserError) as e:
-                    _logger.error(f'Validation error processing timeout transition for file {admission_file.name}: {str(e)}')
-                except Exception as e:
-                    _logger.error(f'Unexpected error processing timeout transition for file {admission_file.name}: {str(e)}')
+            rule._process_timeout_rule(
+                chunk_size=self.timeout_chunk_size or 500,
+                notify=self.notification_enabled and rule.send_notification,
+                auto_commit=auto_commit,
+            )
+
+    @tools.ormcache('self.id')
+    def _get_rule_index(self):
+        """Index the active rules of the workflow by from_state and action_type.
+
+        Returns two dicts mapping each value to a tuple of rule ids ordered
+        by priority. The index is cached until a rule is created, deleted
+        or changes one of the indexed fields.
+        """
+        by_state = defaultdict(list)
+        by_action_type = defaultdict(list)
+        rules = self.env['acmst.workflow.rule'].sudo().search(
+            [('workflow_id', '=', self.id)], order='priority, sequence, id'
+        )
+        for rule in rules:
+            by_state[rule.from_state].append(rule.id)
+            by_action_type[rule.action_type].append(rule.id)
+        return (
+            {state: tuple(rule_ids) for state, rule_ids in by_state.items()},
+            {action_type: tuple(rule_ids) for action_type, rule_ids in by_action_type.items()},
+        )
+
+    def _get_rules(self, from_state=None, action_type=None):
+        """Return the active rules matching ``from_state`` and ``action_type``"""
+        self.ensure_one()
+        by_state, by_action_type = self._get_rule_index()
+        if from_state is not None:
+            rule_ids = by_state.get(from_state, ())
+            if action_type is not None:
+                action_rule_ids = set(by_action_type.get(action_type, ()))
+                rule_ids = tuple(rule_id for rule_id in rule_ids if rule_id in action_rule_ids)
+        elif action_type is not None:
+            rule_ids = by_action_type.get(action_type, ())
+        else:
+            rule_ids = tuple(rule_id for rule_ids in by_state.values() for rule_id in rule_ids)
+        return self.env['acmst.workflow.rule'].browse(rule_ids)
 
     @api.model
     def process_all_workflows(self):
@@ -249,9 +287,9 @@ class AcmstWorkflowEngine(models.Model):
             'name': _('Workflow Rules'),
             'res_model': 'acmst.workflow.rule',
             'view_mode': 'tree,form',
-            'domain': [('workflow_engine_id', '=', self.id)],
+            'domain': [('workflow_id', '=', self.id)],
             'context': {
-                'default_workflow_engine_id': self.id,
+                'default_workflow_id': self.id,
             }
         }
 
@@ -262,6 +300,9 @@ class AcmstWorkflowRule(models.Model):
     _inherit = ['mail.thread', 'mail.activity.mixin']
     _order = 'sequence, id'
 
+    # Fields whose change invalidates the rule index and compiled conditions
+    _CACHED_RULE_FIELDS = {'workflow_id', 'active', 'from_state', 'action_type', 'priority', 'sequence', 'condition_expression'}
+
     workflow_id = fields.Many2one(
         'acmst.workflow.engine',
         string='Workflow',
@@ -337,6 +378,20 @@ class AcmstWorkflowRule(models.Model):
         default=24,
         help='Timeout in hours (for timeout rules)'
     )
+
+    timeout_cutoff = fields.Datetime(
+        string='Timeout Run Cutoff',
+        readonly=True,
+        copy=False,
+        help='Cutoff date of the timeout run in progress, kept to resume an interrupted run'
+    )
+
+    timeout_last_file_id = fields.Integer(
+        string='Last Processed File',
+        readonly=True,
+        copy=False,
+        help='ID of the last admission file processed by the timeout run in progress'
+    )
     
     send_notification = fields.Boolean(
         string='Send Notification',
@@ -379,6 +434,76 @@ class AcmstWorkflowRule(models.Model):
         
         return False
 
+    def _process_timeout_rule(self, chunk_size=500, notify=True, auto_commit=False):
+        """Transition files that stayed in ``from_state`` past the timeout.
+
+        Files are taken by increasing id, ``chunk_size`` at a time, and moved
+        with a single write per chunk. The run cutoff and the last processed
+        id are stored on the rule so a resumed run continues where it
+        stopped. Returns the number of transitioned files.
+        """
+        self.ensure_one()
+        AdmissionFile = self.env['acmst.admission.file']
+
+        if not self.timeout_cutoff:
+            self.write({
+                'timeout_cutoff': fields.Datetime.now() - timedelta(hours=self.timeout_hours),
+                'timeout_last_file_id': 0,
+            })
+        else:
+            _logger.info(f'Resuming timeout rule {self.name} after file id {self.timeout_last_file_id}')
+
+        transitioned_count = 0
+        while True:
+            admission_files = AdmissionFile.search([
+                ('state', '=', self.from_state),
+                ('write_date', '<', self.timeout_cutoff),
+                ('id', '>', self.timeout_last_file_id),
+            ], order='id', limit=chunk_size)
+            if not admission_files:
+                break
+
+            transitioned = self._transition_timeout_chunk(admission_files)
+            if notify and transitioned:
+                self.send_notification_emails(transitioned)
+            transitioned_count += len(transitioned)
+
+            self.timeout_last_file_id = admission_files[-1].id
+            if auto_commit:
+                self.env.cr.commit()
+
+        self.write({'timeout_cutoff': False, 'timeout_last_file_id': 0})
+        if auto_commit:
+            self.env.cr.commit()
+        _logger.info(f'Timeout rule {self.name}: {transitioned_count} files moved from {self.from_state} to {self.to_state}')
+        return transitioned_count
+
+    def _transition_timeout_chunk(self, admission_files):
+        """Move a chunk of files to ``to_state`` with one write.
+
+        If the grouped write fails, the chunk is retried file by file so a
+        single invalid file does not block the others. Returns the files
+        actually transitioned.
+        """
+        try:
+            with self.env['acmst.audit.log']._savepoint():
+                admission_files.write({'state': self.to_state})
+            return admission_files
+        except Exception as e:
+            _logger.warning(f'Grouped timeout transition failed for rule {self.name}, retrying file by file: {str(e)}')
+
+        transitioned = self.env['acmst.admission.file']
+        for admission_file in admission_files:
+            try:
+                with self.env['acmst.audit.log']._savepoint():
+                    admission_file.write({'state': self.to_state})
+                transitioned |= admission_file
+            except (ValidationError, UserError) as e:
+                _logger.error(f'Validation error processing timeout transition for file {admission_file.name}: {str(e)}')
+            except Exception as e:
+                _logger.error(f'Unexpected error processing timeout transition for file {admission_file.name}: {str(e)}')
+        return transitioned
+
     def _evaluate_time_based_condition(self, admission_file):
         """Evaluate time-based conditions"""
         if self.action_type == 'timeout':
@@ -392,29 +517,43 @@ class AcmstWorkflowRule(models.Model):
         # This would be implemented based on specific field requirements
         return True
 
+    @api.model
+    @tools.ormcache('rule_id', 'write_date')
+    def _compile_condition(self, rule_id, write_date):
+        """Parse, validate and compile the condition of a rule.
+
+        The result is cached per rule and write date, so a rule is compiled
+        once however many files it is evaluated on. Returns None when the
+        expression is invalid or unsafe.
+        """
+        expression = self.browse(rule_id).condition_expression
+
+        # Only allow safe operations - basic comparisons and field access
+        # This is a simplified version that only supports basic field comparisons
+        # For more complex conditions, consider using a proper rule engine
+
+        # Parse the expression to check if it's safe
+        try:
+            parsed = ast.parse(expression, mode='eval')
+        except SyntaxError:
+            _logger.warning(f'Invalid syntax in condition expression: {expression}')
+            return None
+
+        # Check if the expression only contains safe operations
+        if not self._is_safe_expression(parsed):
+            _logger.warning(f'Unsafe condition expression: {expression}')
+            return None
+
+        return compile(parsed, f'<acmst.workflow.rule {rule_id}>', 'eval')
+
     def _evaluate_custom_condition(self, admission_file):
         """Evaluate custom Python conditions using safe evaluation"""
         if not self.condition_expression:
             return True
         
         try:
-            # Use ast.literal_eval for safer evaluation of simple expressions
-            import ast
-            
-            # Only allow safe operations - basic comparisons and field access
-            # This is a simplified version that only supports basic field comparisons
-            # For more complex conditions, consider using a proper rule engine
-            
-            # Parse the expression to check if it's safe
-            try:
-                parsed = ast.parse(self.condition_expression, mode='eval')
-            except SyntaxError:
-                _logger.warning(f'Invalid syntax in condition expression: {self.condition_expression}')
-                return False
-            
-            # Check if the expression only contains safe operations
-            if not self._is_safe_expression(parsed):
-                _logger.warning(f'Unsafe condition expression: {self.condition_expression}')
+            code = self._compile_condition(self.id, self.write_date)
+            if code is None:
                 return False
             
             # Create a safe evaluation context with limited access
@@ -426,7 +565,7 @@ class AcmstWorkflowRule(models.Model):
             }
             
             # Use eval with restricted globals and locals
-            return eval(self.condition_expression, {"__builtins__": {}}, context)
+            return eval(code, {"__builtins__": {}}, context)
         except (ValidationError, UserError) as e:
             _logger.error(f'Validation error evaluating custom condition: {str(e)}')
             return False
@@ -469,37 +608,34 @@ class AcmstWorkflowRule(models.Model):
         return self.evaluate_conditions(admission_file)
 
     def send_notification_email(self, admission_file):
-        """Send notification email"""
+        """Queue notification email"""
+        return self.send_notification_emails(admission_file)
+
+    def send_notification_emails(self, admission_files):
+        """Queue notification emails for several files at once"""
         self.ensure_one()
 
-        if not self.send_notification or not self.notification_template_id:
+        if not self.send_notification or not self.notification_template_id or not admission_files:
             return
 
         try:
-            # Check if there's an active mail server before sending
-            mail_server = self.env['ir.mail_server'].search([('active', '=', True)], order='sequence', limit=1)
-            if mail_server:
-                self.notification_template_id.send_mail(admission_file.id, force_send=True)
-                _logger.info(f'Notification sent for file {admission_file.name} using rule {self.name}')
-            else:
-                # Create pending email instead of skipping
-                _logger.warning(f'No active mail server configured. Creating pending email for workflow notification.')
-                self._create_pending_email(admission_file)
+            self.env['acmst.mail.queue'].enqueue(self.notification_template_id, admission_files.ids)
+            _logger.info(f'Queued {len(admission_files)} notifications using rule {self.name}')
         except (ValidationError, UserError) as e:
-            _logger.error(f'Validation error sending notification for file {admission_file.name}: {str(e)}')
-            # Create pending email for failed attempts too
-            self._create_pending_email(admission_file)
+            _logger.error(f'Validation error queueing notifications for rule {self.name}: {str(e)}')
+            # Create pending emails for failed attempts
+            self._create_pending_email(admission_files)
         except Exception as e:
-            _logger.error(f'Unexpected error sending notification for file {admission_file.name}: {str(e)}')
-            # Create pending email for failed attempts too
-            self._create_pending_email(admission_file)
+            _logger.error(f'Unexpected error queueing notifications for rule {self.name}: {str(e)}')
+            # Create pending emails for failed attempts
+            self._create_pending_email(admission_files)
 
-    def _create_pending_email(self, admission_file):
-        """Create a pending email record for workflow notifications"""
+    def _create_pending_email(self, admission_files):
+        """Create pending email records for workflow notifications"""
         try:
             if self.notification_template_id:
-                # Create pending email record
-                self.env['acmst.pending.email'].create({
+                # Create pending email records
+                self.env['acmst.pending.email'].create([{
                     'template_ref': self.notification_template_id._name,
                     'record_id': admission_file.id,
                     'model_name': 'acmst.admission.file',
@@ -508,13 +644,34 @@ class AcmstWorkflowRule(models.Model):
                     'retry_count': 0,
                     'max_retries': 3,
                     'created_by': self.env.user.id,
-                })
-                _logger.info(f'Created pending email for workflow notification on file {admission_file.name}')
+                } for admission_file in admission_files])
+                _logger.info(f'Created {len(admission_files)} pending emails for workflow notifications')
         except (ValidationError, UserError) as e:
             _logger.error(f'Validation error creating pending email for workflow notification: {str(e)}')
         except Exception as e:
             _logger.error(f'Unexpected error creating pending email for workflow notification: {str(e)}')
 
+    @api.model
+    def create(self, vals):
+        """Override create to refresh the rule index of the workflow"""
+        rule = super().create(vals)
+        self.env.registry.clear_cache()
+        return rule
+
+    def write(self, vals):
+        """Override write to drop the rule index and compiled conditions"""
+        result = super().write(vals)
+        if self._CACHED_RULE_FIELDS.intersection(vals):
+            # Several writes within a transaction share the same write_date
+            self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        """Override unlink to refresh the rule index of the workflow"""
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
     @api.constrains('from_state', 'to_state')
     def _check_state_transition(self):
         """Validate state transition"""
@@ -10,7 +10,7 @@ _logger = logging.getLogger(__name__)
 
 
 class HealthCheckReport(models.AbstractModel):
-    _name = 'report.acmst_admission.health_check_report'
+    _name = 'report.acmst_admission.health_check_report_template'
     _description = 'Health Check Report'
 
     @api.model
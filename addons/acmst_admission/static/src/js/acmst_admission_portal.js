@@ -26,6 +26,39 @@ odoo.define('acmst_admission.portal', ['web.public.widget', 'web.ajax', 'web.cor
             this._setupProgressBar();
             this._setupWizard();
             this._setupAutoSave();
+            this._loadCatalogue();
+        },
+
+        _loadCatalogue: function () {
+            var self = this;
+            var $program = this.$('select[name="program_id"]');
+            var url = $program.data('catalogue-url');
+            if (!url) {
+                return;
+            }
+            // Served with ETag and Cache-Control, so repeated visits are answered by the browser cache
+            $.ajax({url: url, dataType: 'json', cache: true}).then(function (catalogue) {
+                self.catalogue = catalogue;
+                catalogue.programs.forEach(function (program) {
+                    $program.append($('<option/>', {value: program.id, text: program.name}));
+                });
+                $program.on('change', function () {
+                    self._fillBatches($program.val());
+                });
+                self._fillBatches($program.val());
+            });
+        },
+
+        _fillBatches: function (programId) {
+            var $batch = this.$('select[name="batch_id"]');
+            var selected = $batch.val();
+            $batch.find('option[value!=""]').remove();
+            (this.catalogue ? this.catalogue.batches : []).forEach(function (batch) {
+                if (!programId || String(batch.program_id) === String(programId)) {
+                    $batch.append($('<option/>', {value: batch.id, text: batch.name}));
+                }
+            });
+            $batch.val(selected);
         },
 
         _initializeForm: function () {
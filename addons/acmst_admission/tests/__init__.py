@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from . import test_admission_approval
+from . import test_admission_file
+from . import test_admission_file_write
+from . import test_admission_import
+from . import test_admission_stats
+from . import test_admission_wizard
+from . import test_audit_log
+from . import test_audit_log_buffer
+from . import test_audit_log_partitions
+from . import test_audit_log_retention
+from . import test_audit_mixin
+from . import test_audit_report
+from . import test_binary_storage
+from . import test_catalogue
+from . import test_controllers
+from . import test_coordinator_condition
+from . import test_coordinator_condition_wizard
+from . import test_document_metadata
+from . import test_document_previews
+from . import test_document_upload
+from . import test_health_check
+from . import test_index_registry
+from . import test_integration
+from . import test_live_metrics
+from . import test_mail_queue
+from . import test_numbering
+from . import test_pending_email_retry
+from . import test_performance
+from . import test_performance_optimization
+from . import test_portal_application
+from . import test_portal_conversion
+from . import test_portal_home
+from . import test_reports
+from . import test_security
+from . import test_statistics
+from . import test_submission_limits
+from . import test_wizards
+from . import test_workflow_condition
+from . import test_workflow_engine
+from . import test_workflow_timeout
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from unittest.mock import patch
+import socketserver
+import threading
+
+
+class LocalSMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue accepting every message"""
+
+    def handle(self):
+        self.server.connections += 1
+        self._reply('220 localhost ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            command = line.decode('utf-8', 'replace').strip().upper()
+            if command.startswith('EHLO'):
+                self._reply('250-localhost', '250 8BITMIME')
+            elif command.startswith('DATA'):
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(data_line)
+                self.server.messages.append(b''.join(data))
+                self._reply('250 OK')
+            elif command.startswith('QUIT'):
+                self._reply('221 Bye')
+                break
+            elif command.startswith(('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self._reply('250 OK')
+            else:
+                self._reply('502 Command not implemented')
+
+    def _reply(self, *lines):
+        self.wfile.write(''.join(f'{line}\r\n' for line in lines).encode())
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Local stand-in SMTP server recording received messages and connections"""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), LocalSMTPHandler)
+        self.port = self.server_address[1]
+        self.messages = []
+        self.connections = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class AdmissionTestCommon:
+    """Admission data shared by the test cases.
+
+    Mixed into ``TransactionCase`` or ``HttpCase``, it creates a program
+    with one batch and provides factories of admission files and portal
+    applications. The national IDs of the created records start at
+    ``national_id_base``, set apart for each test class.
+    """
+
+    # National ID of the record created with index 0
+    national_id_base = 1234560000
+
+    def setUp(self):
+        super().setUp()
+
+        university = self.env['acmst.university'].create({'name': 'Test University', 'code': 'TU001'})
+        college = self.env['acmst.college'].create({
+            'name': 'Test College',
+            'code': 'COL001',
+            'university_id': university.id,
+        })
+        program_type = self.env['acmst.program.type'].create({
+            'name': 'Bachelor',
+            'code': 'BACH',
+            'level': 'bachelor',
+        })
+        self.program = self.env['acmst.program'].create({
+            'name': 'Test Program',
+            'code': 'PROG1',
+            'college_id': college.id,
+            'program_type_id': program_type.id,
+        })
+        academic_year = self.env['acmst.academic.year'].create({
+            'name': '2024-2025',
+            'code': 'AY24-25',
+            'start_date': '2024-09-01',
+            'end_date': '2025-08-31',
+        })
+        self.batch = self.env['acmst.batch'].create({
+            'name': 'Test Batch 2024',
+            'code': 'BATCH2024',
+            'program_id': self.program.id,
+            'academic_year_id': academic_year.id,
+            'start_date': '2024-09-01',
+        })
+
+    def _get_file_vals(self, index, **vals):
+        values = {
+            'applicant_name_english': f'John Doe {index}',
+            'applicant_name_arabic': f'جون دو {index}',
+            'national_id': f'{self.national_id_base + index}',
+            'phone': '0912345678',
+            'email': f'john.doe{index}@example.com',
+            'program_id': self.program.id,
+            'batch_id': self.batch.id,
+            'birth_date': '2000-01-01',
+            'gender': 'male',
+            'nationality': 'sudanese',
+            'id_type': 'national_id',
+            'address': '123 Test Street, Khartoum',
+            'emergency_contact': 'Jane Doe',
+            'emergency_phone': '0912345679',
+            'admission_type': 'regular',
+        }
+        values.update(vals)
+        return values
+
+    def _create_file(self, index, **vals):
+        return self.env['acmst.admission.file'].create(self._get_file_vals(index, **vals))
+
+    def _get_application_vals(self, index, **vals):
+        values = self._get_file_vals(index, place_of_birth='Khartoum', religion='muslim')
+        values.update(vals)
+        return values
+
+    def _create_application(self, index, **vals):
+        return self.env['acmst.portal.application'].create(self._get_application_vals(index, **vals))
+
+    def _create_guardian(self, record, **vals):
+        """Default guardian of an admission file or a portal application"""
+        parent_field = 'admission_file_id' if record._name == 'acmst.admission.file' else 'portal_application_id'
+        values = {
+            'name': 'Jane Doe',
+            'relationship': 'mother',
+            'phone': '0912345680',
+            'is_default': True,
+            parent_field: record.id,
+        }
+        values.update(vals)
+        return self.env['acmst.guardian'].create(values)
+
+    def _approve_by_ministry(self, admission_file, **vals):
+        """Submit a new admission file and approve it with the ministry wizard"""
+        if not admission_file.guardian_ids:
+            self._create_guardian(admission_file)
+        admission_file.action_submit_ministry()
+        wizard = self.env['acmst.ministry.approval.wizard'].create(dict({
+            'admission_file_id': admission_file.id,
+            'acknowledge_sensitive_data': True,
+        }, **vals))
+        wizard.action_validate_data()
+        wizard.action_approve()
+        return wizard
+
+    def _setup_mail_delivery(self):
+        """Create an admission file mail template and a mail server on a local SMTP stand-in"""
+        self.template = self.env['mail.template'].create({
+            'name': 'Queued Test Template',
+            'model_id': self.env['ir.model']._get('acmst.admission.file').id,
+            'subject': 'Admission update {{ object.name }}',
+            'email_from': 'admissions@example.com',
+            'email_to': '{{ object.email }}',
+            'body_html': '<p>Your admission file has been updated.</p>',
+            'auto_delete': False,
+        })
+        self.smtp_server = LocalSMTPServer()
+        self.smtp_server.start()
+        self.addCleanup(self.smtp_server.stop)
+        self.env['ir.mail_server'].create({
+            'name': 'Local Test SMTP',
+            'smtp_host': '127.0.0.1',
+            'smtp_port': self.smtp_server.port,
+            'smtp_encryption': 'none',
+            'sequence': 0,
+        })
+
+    def _deliver_mail(self):
+        """Context manager letting the mail servers send out of test mode"""
+        IrMailServer = type(self.env['ir.mail_server'])
+        return patch.object(IrMailServer, '_is_test_mode', lambda self: False)
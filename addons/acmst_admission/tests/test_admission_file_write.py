@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestAdmissionFileBulkWrite(AdmissionTestCommon, TransactionCase):
+    """Test cases for multi-record admission file writes"""
+
+    national_id_base = 1234567300
+
+    def test_bulk_state_change(self):
+        """A multi-record write logs, posts and schedules for every record"""
+        admission_files = self.env['acmst.admission.file']
+        for index in range(5):
+            admission_files |= self._create_file(index)
+        self.env['acmst.audit.log']._flush_log_buffer()
+
+        admission_files.write({'state': 'coordinator_review'})
+
+        logs = self.env['acmst.audit.log']._flush_log_buffer()
+        self.assertEqual(sorted(logs.mapped('record_id')), sorted(admission_files.ids))
+        self.assertTrue(all(log.diff == {'state': {'old': 'new', 'new': 'coordinator_review'}} for log in logs))
+        activity_type = self.env.ref('acmst_admission.mail_activity_coordinator_review')
+        for admission_file in admission_files:
+            self.assertIn(activity_type, admission_file.activity_ids.activity_type_id)
+            self.assertIn('Status changed from new to coordinator_review', admission_file.message_ids[0].body)
+
+    def test_unchanged_records_not_logged(self):
+        """Records already in the target state get no entry"""
+        first = self._create_file(1, state='ministry_pending')
+        second = self._create_file(2)
+        self.env['acmst.audit.log']._flush_log_buffer()
+
+        (first | second).write({'state': 'ministry_pending'})
+
+        logs = self.env['acmst.audit.log']._flush_log_buffer()
+        self.assertEqual(logs.mapped('record_id'), [second.id])
+
+    def test_university_id_logged_per_record(self):
+        """University ID changes are logged with each record's old value"""
+        admission_files = self._create_file(1) | self._create_file(2)
+        self.env['acmst.audit.log']._flush_log_buffer()
+
+        admission_files.write({'university_id': 'U2024'})
+
+        logs = self.env['acmst.audit.log']._flush_log_buffer()
+        self.assertEqual(len(logs), 2)
+        self.assertTrue(all(log.diff == {'university_id': {'old': False, 'new': 'U2024'}} for log in logs))
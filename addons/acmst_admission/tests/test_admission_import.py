@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import base64
+import io
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestAdmissionImport(AdmissionTestCommon, TransactionCase):
+    """Test cases for the bulk admission file import"""
+
+    national_id_base = 1234569000
+
+    def setUp(self):
+        super().setUp()
+        self.ImportWizard = self.env['acmst.admission.import.wizard']
+
+    def _row(self, index, **values):
+        row = {
+            'program': 'PROG1',
+            'batch': 'BATCH2024',
+            'applicant_name_english': f'John Doe {index}',
+            'applicant_name_arabic': f'جون دو {index}',
+            'national_id': f'{self.national_id_base + index}',
+            'phone': '0912345678',
+            'email': f'john.doe{index}@example.com',
+            'birth_date': '2000-01-01',
+            'gender': 'Male',
+            'nationality': 'sudanese',
+            'id_type': 'national_id',
+            'address': '123 Test Street, Khartoum',
+            'emergency_contact': 'Jane Doe',
+            'emergency_phone': '0912345679',
+            'admission_type': 'regular',
+        }
+        row.update(values)
+        return row
+
+    def _csv(self, rows):
+        headers = list(rows[0])
+        lines = [','.join(headers)] + [','.join(row[header] for header in headers) for row in rows]
+        return io.BytesIO('\n'.join(lines).encode())
+
+    def test_import_creates_files_in_batches(self):
+        """Valid rows are created in batches, with their audit logs and chatter messages"""
+        rows = [self._row(index) for index in range(5)]
+        result = self.ImportWizard.import_stream(self._csv(rows), 'applicants.csv', batch_size=2)
+
+        self.assertEqual(result['rows'], 5)
+        self.assertFalse(result['errors'])
+        files = self.env['acmst.admission.file'].browse(result['admission_file_ids'])
+        self.assertEqual(len(files), 5)
+        self.assertEqual(set(files.mapped('program_id').ids), {self.program.id})
+        self.assertEqual(set(files.mapped('batch_id').ids), {self.batch.id})
+        self.assertEqual(set(files.mapped('gender')), {'male'})
+        self.assertEqual(len(set(files.mapped('name'))), 5)
+        for admission_file in files:
+            self.assertTrue(admission_file.message_ids.filtered(lambda message: 'New admission file created' in (message.body or '')))
+        logs = self.env['acmst.audit.log'].search([
+            ('model_name', '=', 'acmst.admission.file'),
+            ('record_id', 'in', files.ids),
+            ('action', '=', 'create'),
+        ])
+        self.assertEqual(len(logs), 5)
+
+    def test_import_reports_row_errors(self):
+        """Invalid rows are reported with their row number while the others are imported"""
+        self.env['acmst.admission.file'].create({
+            key: value for key, value in self._row(9, gender='male').items() if key not in ('program', 'batch')
+        } | {'program_id': self.program.id, 'batch_id': self.batch.id})
+        rows = [
+            self._row(1),
+            self._row(2, national_id='123'),
+            self._row(3, program='UNKNOWN'),
+            self._row(4, email=''),
+            self._row(5, gender='unknown'),
+            self._row(6, national_id=f'{1234569000 + 1}'),
+            self._row(9),
+            self._row(7, birth_date='2999-01-01'),
+        ]
+        result = self.ImportWizard.import_stream(self._csv(rows), 'applicants.csv')
+
+        self.assertEqual(len(result['admission_file_ids']), 1)
+        self.assertEqual([error['row'] for error in result['errors']], [3, 4, 5, 6, 7, 8, 9])
+        messages = {error['row']: error['message'] for error in result['errors']}
+        self.assertIn('10 digits', messages[3])
+        self.assertIn('UNKNOWN', messages[4])
+        self.assertIn('more than once', messages[7])
+        self.assertIn('already exists', messages[8])
+
+    def test_wizard_import(self):
+        """The wizard imports the uploaded file and keeps the result"""
+        rows = [self._row(index) for index in range(3)] + [self._row(3, national_id='')]
+        wizard = self.ImportWizard.create({
+            'import_file': base64.b64encode(self._csv(rows).getvalue()),
+            'filename': 'applicants.csv',
+        })
+        wizard.action_import()
+
+        self.assertEqual(wizard.state, 'done')
+        self.assertEqual(wizard.row_count, 4)
+        self.assertEqual(wizard.created_count, 3)
+        self.assertEqual(wizard.error_count, 1)
+        self.assertIn('Row 5', wizard.error_report)
+        self.assertEqual(len(wizard.admission_file_ids), 3)
+
+    def test_health_required_files_get_health_checks(self):
+        """Files created in health_required state get a health check from the batched create"""
+        files = self.env['acmst.admission.file'].create([
+            {key: value for key, value in self._row(index, gender='male').items() if key not in ('program', 'batch')}
+            | {'program_id': self.program.id, 'batch_id': self.batch.id, 'state': 'health_required'}
+            for index in range(20, 23)
+        ])
+        self.assertEqual(len(files.health_check_ids), 3)
+        self.assertEqual(files.health_check_ids.admission_file_id, files)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestAdmissionStats(AdmissionTestCommon, TransactionCase):
+    """Test cases for the materialized admission statistics counters"""
+
+    national_id_base = 1234567100
+
+    def setUp(self):
+        super().setUp()
+        self.AdmissionStats = self.env['acmst.admission.stats']
+
+    def _counter(self, state, **key):
+        domain = [('state', '=', state), ('program_id', '=', self.program.id), ('batch_id', '=', self.batch.id)]
+        domain += [(fname, '=', value) for fname, value in key.items()]
+        return sum(self.AdmissionStats.search(domain).mapped('count'))
+
+    def _assert_counters_consistent(self):
+        """Counters match a full GROUP BY over the admission files"""
+        AdmissionFile = self.env['acmst.admission.file']
+        for state, count in AdmissionFile._read_group([], ['state'], ['__count']):
+            self.assertEqual(sum(self.AdmissionStats.search([('state', '=', state)]).mapped('count')), count)
+
+    def test_create_increments_counter(self):
+        """Creating admission files increments their counter"""
+        before = self._counter('new')
+        self._create_file(1)
+        self._create_file(2)
+        self.assertEqual(self._counter('new'), before + 2)
+        self._assert_counters_consistent()
+
+    def test_write_moves_counter(self):
+        """Changing a key field moves the file to another counter"""
+        admission_files = self._create_file(1) | self._create_file(2)
+        admission_files.write({'state': 'coordinator_review', 'coordinator_id': self.env.uid})
+        self.assertEqual(self._counter('new'), 0)
+        self.assertEqual(self._counter('coordinator_review', coordinator_id=self.env.uid), 2)
+        self._assert_counters_consistent()
+
+    def test_write_without_key_fields(self):
+        """Writes not touching key fields leave the counters alone"""
+        admission_file = self._create_file(1)
+        before = self._counter('new')
+        admission_file.write({'address': 'Omdurman'})
+        self.assertEqual(self._counter('new'), before)
+
+    def test_unlink_decrements_counter(self):
+        """Deleting admission files decrements their counter"""
+        admission_file = self._create_file(1)
+        self._create_file(2)
+        admission_file.unlink()
+        self.assertEqual(self._counter('new'), 1)
+        self._assert_counters_consistent()
+
+    def test_rebuild_counters(self):
+        """Rebuilding recomputes counters from the admission files"""
+        self._create_file(1)
+        self._create_file(2, state='ministry_pending')
+        self.env.cr.execute("UPDATE acmst_admission_stats SET count = 0")
+        self.AdmissionStats._rebuild_counters()
+        self._assert_counters_consistent()
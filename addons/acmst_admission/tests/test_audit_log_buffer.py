@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+from odoo.tools import mute_logger
+from unittest.mock import patch
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestAuditLogBuffer(AdmissionTestCommon, TransactionCase):
+    """Test cases for the buffered audit log writer"""
+
+    national_id_base = 1234567200
+
+    def setUp(self):
+        super().setUp()
+        self.AuditLog = self.env['acmst.audit.log']
+
+    def _buffered(self):
+        return self.env.cr.precommit.data.get('acmst.audit.log.buffer', [])
+
+    def test_entries_buffered_until_flush(self):
+        """Admission file changes queue audit entries instead of inserting them"""
+        admission_file = self._create_file(1)
+        self.assertTrue(any(vals['record_id'] == admission_file.id for vals in self._buffered()))
+        logs = self.AuditLog._flush_log_buffer()
+        self.assertIn(admission_file.id, logs.mapped('record_id'))
+        self.assertFalse(self._buffered())
+
+    def test_bulk_unlink_single_flush(self):
+        """Deleting many files queues one entry per file, written in one batch with their chatter notes"""
+        admission_files = self.env['acmst.admission.file']
+        for index in range(5):
+            admission_files |= self._create_file(index)
+        self.AuditLog._flush_log_buffer()
+        file_ids = admission_files.ids
+        with patch.object(type(admission_files), 'message_post') as message_post:
+            admission_files.unlink()
+        message_post.assert_not_called()
+        self.assertEqual(len([vals for vals in self._buffered() if vals['action'] == 'unlink']), 5)
+        logs = self.AuditLog._flush_log_buffer()
+        self.assertEqual(sorted(logs.mapped('record_id')), sorted(file_ids))
+        self.assertEqual(set(logs.mapped('user_id').ids), {self.env.uid})
+
+    def test_search_flushes_buffer(self):
+        """Searching audit logs sees entries still in the buffer"""
+        admission_file = self._create_file(1)
+        logs = self.AuditLog.search([
+            ('model_name', '=', 'acmst.admission.file'),
+            ('record_id', '=', admission_file.id),
+            ('action', '=', 'create'),
+        ])
+        self.assertEqual(len(logs), 1)
+
+    def test_flushed_at_precommit(self):
+        """Queued entries are written by the precommit hook"""
+        admission_file = self._create_file(1)
+        self.env.cr.precommit.run()
+        self.env.cr.execute(
+            "SELECT COUNT(*) FROM acmst_audit_log WHERE model_name = %s AND record_id = %s",
+            ['acmst.admission.file', admission_file.id],
+        )
+        self.assertEqual(self.env.cr.fetchone()[0], 1)
+
+    def test_savepoint_rollback_discards_entries(self):
+        """Entries queued in a rolled back savepoint are dropped, those queued before are kept"""
+        before = self._create_file(1)
+        with self.assertRaises(ZeroDivisionError), self.AuditLog._savepoint():
+            self._create_file(2)
+            1 / 0
+        self.assertFalse(self._buffered())
+        logs = self.AuditLog.search([('model_name', '=', 'acmst.admission.file'), ('action', '=', 'create')])
+        self.assertIn(before.id, logs.mapped('record_id'))
+        self.assertEqual(len(logs.filtered(lambda log: log.record_id == before.id)), 1)
+        self.assertFalse(self.env['acmst.admission.file'].search([('national_id', '=', '1234567202')]))
+
+    def test_failed_batch_retried_logged_once(self):
+        """A failed import batch retried row by row logs each created file once"""
+        self.AuditLog._flush_log_buffer()
+        vals_list = [
+            self._get_file_vals(11, name='IMPORT-DUP'),
+            self._get_file_vals(12),
+            self._get_file_vals(13, name='IMPORT-DUP'),
+        ]
+        errors = []
+        with mute_logger('odoo.sql_db', 'odoo.addons.acmst_admission.wizards.acmst_admission_import_wizard'):
+            admission_files = self.env['acmst.admission.import.wizard']._create_batch(vals_list, [2, 3, 4], errors)
+
+        self.assertEqual(len(admission_files), 2)
+        self.assertEqual([error['row'] for error in errors], [4])
+        logs = self.AuditLog.search([('model_name', '=', 'acmst.admission.file'), ('action', '=', 'create')])
+        self.assertEqual(sorted(logs.mapped('record_id')), sorted(admission_files.ids))
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+from dateutil.relativedelta import relativedelta
+from datetime import date, datetime
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestAuditLogPartitions(TransactionCase):
+    """Test cases for the monthly partitions of the audit log"""
+
+    def setUp(self):
+        super().setUp()
+        self.AuditLog = self.env['acmst.audit.log']
+
+    def _create_log(self, create_date=None, **vals):
+        log = self.AuditLog.create(dict({
+            'model_name': 'acmst.admission.file',
+            'record_id': 1,
+            'action': 'create',
+            'category': 'data_modification',
+        }, **vals))
+        if create_date:
+            log.flush_recordset()
+            self.env.cr.execute('UPDATE acmst_audit_log SET create_date = %s WHERE id = %s', [create_date, log.id])
+            log.invalidate_recordset()
+        return log
+
+    def _get_partition(self, log):
+        self.env.cr.execute('SELECT tableoid::regclass::text FROM acmst_audit_log WHERE id = %s', [log.id])
+        return self.env.cr.fetchone()[0]
+
+    def test_table_is_partitioned(self):
+        """The audit log is a partitioned table with the upcoming months created"""
+        self.env.cr.execute("SELECT relkind FROM pg_class WHERE relname = 'acmst_audit_log'")
+        self.assertEqual(self.env.cr.fetchone()[0], 'p')
+        current_month = fields.Date.today().replace(day=1)
+        months = [month for __, month in self.AuditLog._get_partitions()]
+        self.assertIn(current_month, months)
+        self.assertIn(current_month + relativedelta(months=1), months)
+
+    def test_logs_are_routed_by_month(self):
+        """New logs land in the partition of the current month"""
+        log = self._create_log()
+        month = fields.Date.today()
+        self.assertEqual(self._get_partition(log), f'acmst_audit_log_y{month.year:04d}m{month.month:02d}')
+
+    def test_new_partition_takes_rows_from_default(self):
+        """Rows stored in the default partition move to their month's partition when it is created"""
+        log = self._create_log(create_date=datetime(2099, 5, 17, 10, 0))
+        self.assertEqual(self._get_partition(log), 'acmst_audit_log_default')
+
+        name = self.AuditLog._create_partition(date(2099, 5, 1))
+        self.assertEqual(name, 'acmst_audit_log_y2099m05')
+        self.assertEqual(self._get_partition(log), name)
+        # Creating it again is a no-op
+        self.assertFalse(self.AuditLog._create_partition(date(2099, 5, 1)))
+
+    def test_cleanup_drops_expired_partitions(self):
+        """Expired months without high severity logs are dropped as a whole"""
+        self.AuditLog._create_partition(date(2001, 1, 1))
+        self.AuditLog._create_partition(date(2001, 2, 1))
+        dropped = self._create_log(create_date=datetime(2001, 1, 10))
+        kept = self._create_log(create_date=datetime(2001, 2, 10), severity='critical')
+        expired = self._create_log(create_date=datetime(2001, 2, 11))
+
+        self.AuditLog._cleanup_old_logs(days=365)
+
+        partitions = [name for name, __ in self.AuditLog._get_partitions()]
+        self.assertNotIn('acmst_audit_log_y2001m01', partitions)
+        self.assertIn('acmst_audit_log_y2001m02', partitions)
+        self.assertFalse(dropped.exists())
+        self.assertTrue(kept.exists())
+        self.assertFalse(expired.exists())
+
+    def test_date_window_queries(self):
+        """Recent window queries return the logs of the window"""
+        recent = self._create_log(user_id=self.env.uid)
+        self._create_log(create_date=datetime(2001, 3, 1), user_id=self.env.uid)
+        self.assertEqual(self.AuditLog.get_user_activity(self.env.uid, days=30) & recent, recent)
+        self.assertFalse(self.AuditLog.get_user_activity(self.env.uid, days=30).filtered(
+            lambda log: log.create_date.year == 2001))
+
+    def test_foreign_keys_to_other_tables_kept(self):
+        """The audit log keeps its foreign keys to users, only references to itself are dropped"""
+        self.env.cr.execute("""
+            SELECT confrelid::regclass::text, a.attname FROM pg_constraint c
+            JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)
+            WHERE c.contype = 'f' AND c.conrelid = 'acmst_audit_log'::regclass
+        """)
+        foreign_keys = set(self.env.cr.fetchall())
+        self.assertIn(('res_users', 'user_id'), foreign_keys)
+        self.assertIn(('res_users', 'create_uid'), foreign_keys)
+        self.assertNotIn(('acmst_audit_log', 'parent_log_id'), foreign_keys)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from datetime import datetime
+import gzip
+import json
+import logging
+import tempfile
+
+_logger = logging.getLogger(__name__)
+
+
+class TestAuditLogRetention(TransactionCase):
+    """Test cases for the chunked audit log retention"""
+
+    def setUp(self):
+        super().setUp()
+        self.AuditLog = self.env['acmst.audit.log']
+
+    def _create_logs(self, count, create_date=None, **vals):
+        logs = self.AuditLog.create([dict({
+            'model_name': 'acmst.admission.file',
+            'record_id': index,
+            'action': 'write',
+            'category': 'data_modification',
+        }, **vals) for index in range(count)])
+        if create_date:
+            logs.flush_recordset()
+            self.env.cr.execute('UPDATE acmst_audit_log SET create_date = %s WHERE id IN %s', [create_date, tuple(logs.ids)])
+            logs.invalidate_recordset()
+        return logs
+
+    def test_chunked_deletion(self):
+        """Old low and medium severity logs are deleted chunk by chunk"""
+        old = self._create_logs(5, create_date=datetime(2002, 6, 1), severity='low')
+        old |= self._create_logs(2, create_date=datetime(2002, 6, 2), severity='medium')
+        critical = self._create_logs(1, create_date=datetime(2002, 6, 3), severity='critical')
+        recent = self._create_logs(2, severity='low')
+
+        report = self.AuditLog._cleanup_old_logs(days=365, chunk_size=2, auto_commit=False)
+
+        self.assertFalse(old.exists())
+        self.assertEqual(critical.exists(), critical)
+        self.assertEqual(recent.exists(), recent)
+        self.assertGreaterEqual(report['deleted'], len(old))
+        self.assertGreaterEqual(report['chunks'], 4)
+        self.assertIsNone(report['archive_file'])
+        self.assertIn('rows_per_second', report)
+
+    def test_archive_before_deletion(self):
+        """Deleted logs are archived to a compressed JSONL file"""
+        old = self._create_logs(3, create_date=datetime(2002, 7, 1), severity='low')
+
+        with tempfile.TemporaryDirectory() as archive_dir:
+            self.env['ir.config_parameter'].sudo().set_param('acmst_admission.audit_log_archive_dir', archive_dir)
+            report = self.AuditLog._cleanup_old_logs(days=365, chunk_size=2, auto_commit=False)
+            with gzip.open(report['archive_file'], 'rt', encoding='utf-8') as archive:
+                rows = [json.loads(line) for line in archive]
+
+        self.assertFalse(old.exists())
+        self.assertEqual(report['archived'], report['deleted'])
+        self.assertTrue(set(old.ids) <= {row['id'] for row in rows})
+        self.assertEqual({row['model_name'] for row in rows if row['id'] in old.ids}, {'acmst.admission.file'})
+
+    def test_chatter_data_removed(self):
+        """Messages of deleted logs are removed with them"""
+        old = self._create_logs(1, create_date=datetime(2002, 8, 1), severity='low')
+        old.message_post(body='Reviewed')
+        self.AuditLog._cleanup_old_logs(days=365, auto_commit=False)
+        self.assertFalse(self.env['mail.message'].search_count([
+            ('model', '=', 'acmst.audit.log'),
+            ('res_id', '=', old.id),
+        ]))
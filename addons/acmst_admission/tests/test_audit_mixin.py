@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase, new_test_user
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestAuditMixin(AdmissionTestCommon, TransactionCase):
+    """Test cases for the structured diffs of acmst.audit.mixin"""
+
+    national_id_base = 1234569500
+
+    def setUp(self):
+        super().setUp()
+        self.AuditLog = self.env['acmst.audit.log']
+
+    def test_diff_holds_changed_fields_only(self):
+        """Only the fields that actually changed are in the diff"""
+        admission_file = self._create_file(1)
+        self.AuditLog._flush_log_buffer()
+
+        admission_file.write({'phone': '0999999999', 'email': admission_file.email})
+
+        log = self.AuditLog._flush_log_buffer()
+        self.assertEqual(len(log), 1)
+        self.assertEqual(log.diff, {'phone': {'old': '0912345678', 'new': '0999999999'}})
+        self.assertEqual(json.loads(log.changed_fields), ['phone'])
+        self.assertEqual(log.category, 'data_modification')
+
+    def test_batch_write_logs_every_record(self):
+        """A batch write logs one diff per changed record, unchanged fields left out"""
+        admission_files = self.env['acmst.admission.file']
+        for index in range(5):
+            admission_files |= self._create_file(index)
+        self.AuditLog._flush_log_buffer()
+
+        admission_files.write({'program_id': self.program.id, 'phone': '0911111111'})
+        logs = self.AuditLog._flush_log_buffer()
+        self.assertEqual(len(logs), 5)
+        self.assertTrue(all(log.diff == {'phone': {'old': '0912345678', 'new': '0911111111'}} for log in logs))
+
+    def test_health_check_multi_write(self):
+        """Health checks are audited as a batch, with many2one values stored as ids"""
+        examiner = new_test_user(self.env, login='acmst_mixin_examiner', groups='base.group_user,acmst_admission.group_health')
+        admin = self.env.ref('base.user_admin')
+        health_checks = (self._create_file(10, state='health_required') | self._create_file(11, state='health_required')).health_check_ids
+        health_checks.write({'check_date': '2024-09-01 10:00:00', 'examiner_id': examiner.id})
+        self.AuditLog._flush_log_buffer()
+
+        health_checks.write({'check_date': '2024-09-02 10:00:00', 'examiner_id': admin.id})
+
+        logs = self.AuditLog._flush_log_buffer()
+        self.assertEqual(sorted(logs.mapped('record_id')), sorted(health_checks.ids))
+        for log in logs:
+            self.assertEqual(log.diff['check_date'], {'old': '2024-09-01 10:00:00', 'new': '2024-09-02 10:00:00'})
+            self.assertEqual(log.diff['examiner_id'], {'old': examiner.id, 'new': admin.id})
+
+    def test_field_changes_query(self):
+        """Changes of a field, and to a given value, are found through the diff column"""
+        first = self._create_file(20)
+        second = self._create_file(21)
+        (first | second).write({'state': 'coordinator_review'})
+        second.write({'state': 'manager_review'})
+        first.write({'phone': '0922222222'})
+
+        logs = self.AuditLog.get_field_changes('acmst.admission.file', 'state')
+        self.assertEqual(sorted(logs.filtered(lambda log: log.record_id in (first | second).ids).mapped('record_id')),
+                         sorted([first.id, second.id, second.id]))
+        logs = self.AuditLog.get_field_changes('acmst.admission.file', 'state', 'manager_review')
+        self.assertEqual(logs.filtered(lambda log: log.record_id in (first | second).ids).mapped('record_id'),
+                         [second.id])
+        self.assertTrue(all(log.category == 'workflow' for log in logs))
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from datetime import datetime
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestAuditReport(TransactionCase):
+    """Test cases for the aggregated audit report and its drill-down"""
+
+    def setUp(self):
+        super().setUp()
+        self.AuditLog = self.env['acmst.audit.log']
+        self.date_from = datetime(2098, 1, 1)
+        self.date_to = datetime(2098, 1, 31, 23, 59, 59)
+        specs = [
+            ('create', 'data_modification', 'low', False, False),
+            ('write', 'data_modification', 'medium', False, False),
+            ('write', 'workflow', 'high', False, True),
+            ('security_violation', 'security', 'critical', True, True),
+            ('unauthorized_access', 'security', 'critical', True, False),
+        ]
+        self.logs = self.AuditLog.create([{
+            'model_name': 'acmst.admission.file',
+            'record_id': index,
+            'action': action,
+            'category': category,
+            'severity': severity,
+            'is_anomaly': is_anomaly,
+            'is_sensitive': is_sensitive,
+        } for index, (action, category, severity, is_anomaly, is_sensitive) in enumerate(specs)])
+        self.logs.flush_recordset()
+        self.env.cr.execute('UPDATE acmst_audit_log SET create_date = %s WHERE id IN %s',
+                            [datetime(2098, 1, 15), tuple(self.logs.ids)])
+        self.logs.invalidate_recordset()
+
+    def test_report_summary(self):
+        """The grouped aggregates match the logs of the range"""
+        report = self.AuditLog.generate_audit_report(self.date_from, self.date_to)
+
+        self.assertEqual(report['total_logs'], 5)
+        self.assertEqual(report['by_action'], {'create': 1, 'write': 2, 'security_violation': 1, 'unauthorized_access': 1})
+        self.assertEqual(report['by_category'], {'data_modification': 2, 'workflow': 1, 'security': 2})
+        self.assertEqual(report['by_severity'], {'low': 1, 'medium': 1, 'high': 1, 'critical': 2})
+        self.assertEqual(report['by_user'], {self.env.user.name: 5})
+        self.assertEqual(report['security_violations'], 2)
+        self.assertEqual(report['anomalies'], 2)
+        self.assertEqual(report['sensitive_data'], 2)
+
+    def test_report_filters(self):
+        """Category and user filters restrict the aggregates"""
+        report = self.AuditLog.generate_audit_report(self.date_from, self.date_to, category='security')
+        self.assertEqual(report['total_logs'], 2)
+        self.assertEqual(report['by_category'], {'security': 2})
+
+        report = self.AuditLog.generate_audit_report(self.date_from, self.date_to, user_id=self.env.ref('base.public_user').id)
+        self.assertEqual(report['total_logs'], 0)
+        self.assertEqual(report['by_action'], {})
+
+    def test_drill_down_pages(self):
+        """The drill-down returns the logs behind a figure, page by page"""
+        details = self.AuditLog.get_audit_report_details(self.date_from, self.date_to, group_by='action',
+                                                         group_value='write', limit=1)
+        self.assertEqual(details['total'], 2)
+        self.assertEqual(len(details['records']), 1)
+        second_page = self.AuditLog.get_audit_report_details(self.date_from, self.date_to, group_by='action',
+                                                             group_value='write', offset=1, limit=1)
+        self.assertNotEqual(details['records'][0]['id'], second_page['records'][0]['id'])
+
+        violations = self.AuditLog.get_audit_report_details(self.date_from, self.date_to, group_by='security_violations')
+        self.assertEqual({record['action'] for record in violations['records']}, {'security_violation', 'unauthorized_access'})
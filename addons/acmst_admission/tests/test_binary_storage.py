@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import base64
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestBinaryStorage(AdmissionTestCommon, TransactionCase):
+    """Test cases for attachment-backed admission binaries"""
+
+    national_id_base = 1234567900
+
+    def _field_attachments(self, record, field_names):
+        return self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', record._name),
+            ('res_id', '=', record.id),
+            ('res_field', 'in', field_names),
+        ])
+
+    def test_binaries_use_attachments(self):
+        """Admission documents are stored as attachments, not table columns"""
+        fields_ = self.env['acmst.admission.file']._fields
+        for field_name in ['id_document', 'certificates', 'transcripts', 'profile_picture']:
+            self.assertTrue(fields_[field_name].attachment, field_name)
+        admission_file = self._create_file(1, id_document=base64.b64encode(b'id scan'))
+        self.assertEqual(len(self._field_attachments(admission_file, ['id_document'])), 1)
+
+    def test_share_binary_fields(self):
+        """Copying an application shares the stored files instead of duplicating them"""
+        picture = base64.b64encode(b'picture bytes')
+        application = self._create_application(99, profile_picture=picture, id_document=base64.b64encode(b'id scan'))
+        admission_file = self._create_file(1)
+        admission_file._share_binary_fields(application, ['profile_picture', 'id_document'])
+
+        self.assertEqual(admission_file.profile_picture, picture)
+        source = self._field_attachments(application, ['profile_picture', 'id_document'])
+        target = self._field_attachments(admission_file, ['profile_picture', 'id_document'])
+        self.assertEqual(len(target), 2)
+        self.assertEqual(set(source.mapped('checksum')), set(target.mapped('checksum')))
+        self.assertEqual(set(source.mapped('store_fname')), set(target.mapped('store_fname')))
+
+        # Sharing unchanged content again keeps the existing attachments
+        admission_file._share_binary_fields(application, ['profile_picture', 'id_document'])
+        self.assertEqual(self._field_attachments(admission_file, ['profile_picture', 'id_document']), target)
+
+        # Changed content replaces the shared attachment
+        application.profile_picture = base64.b64encode(b'new picture')
+        admission_file._share_binary_fields(application, ['profile_picture'])
+        self.assertEqual(admission_file.profile_picture, base64.b64encode(b'new picture'))
+        self.assertEqual(len(self._field_attachments(admission_file, ['profile_picture'])), 1)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import HttpCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestCatalogue(AdmissionTestCommon, HttpCase):
+    """Test cases for the cached public program and batch catalogue"""
+
+    def setUp(self):
+        super().setUp()
+        self.catalogue = self.env['acmst.catalogue']
+
+    def test_cached_until_write(self):
+        """The catalogue is served from cache and rebuilt when a batch changes"""
+        catalogue = self.catalogue.get_catalogue()
+        self.assertIn(self.program.id, [program['id'] for program in catalogue['programs']])
+        self.assertIn(self.batch.id, [batch['id'] for batch in catalogue['batches']])
+        with self.assertQueryCount(0):
+            self.assertEqual(self.catalogue.get_catalogue()['version'], catalogue['version'])
+
+        self.batch.write({'name': 'Renamed Batch 2024'})
+        updated = self.catalogue.get_catalogue()
+        self.assertNotEqual(updated['version'], catalogue['version'])
+        self.assertIn('Renamed Batch 2024', [batch['name'] for batch in updated['batches']])
+
+    def test_http_validators(self):
+        """The endpoint answers conditional requests with 304"""
+        response = self.url_open('/admission/catalogue.json')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertIn('max-age', response.headers['Cache-Control'])
+        self.assertTrue(response.headers['Last-Modified'])
+        self.assertIn(self.program.id, [program['id'] for program in response.json()['programs']])
+
+        response = self.url_open('/admission/catalogue.json', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        response = self.url_open('/admission/catalogue.json', headers={'If-Modified-Since': response.headers['Last-Modified']})
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+import base64
+import hashlib
+import logging
+
+_logger = logging.getLogger(__name__)
+
+PDF_CONTENT = b'%PDF-1.4\n' + b'x' * 4000
+
+
+class TestDocumentMetadata(TransactionCase):
+    """Test cases for stored document file metadata"""
+
+    def _create_document(self, content=PDF_CONTENT, filename='scan.bin'):
+        return self.env['acmst.document'].create({
+            'name': 'Scan',
+            'document_type': 'other',
+            'file': base64.b64encode(content),
+            'filename': filename,
+        })
+
+    def test_metadata_from_attachment(self):
+        """Size, sniffed MIME type and checksum are stored with the document"""
+        document = self._create_document()
+        self.assertEqual(document.file_size, 4)
+        self.assertEqual(document.mimetype, 'application/pdf')
+        self.assertEqual(document.checksum, hashlib.sha1(PDF_CONTENT).hexdigest())
+
+    def test_metadata_updated_with_file(self):
+        """Replacing the file refreshes its metadata"""
+        document = self._create_document()
+        content = b'plain text'
+        document.write({'file': base64.b64encode(content), 'filename': 'notes.txt'})
+        self.assertEqual(document.file_size, 1)
+        self.assertEqual(document.mimetype, 'text/plain')
+        self.assertEqual(document.checksum, hashlib.sha1(content).hexdigest())
+
+    def test_backfill(self):
+        """The backfill job fills documents stored without metadata"""
+        document = self._create_document()
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE acmst_document SET file_size = 0, mimetype = NULL, checksum = NULL WHERE id = %s",
+            [document.id],
+        )
+        document.invalidate_recordset()
+
+        self.assertGreaterEqual(self.env['acmst.document']._cron_backfill_file_metadata(auto_commit=False), 1)
+        self.assertEqual(document.file_size, 4)
+        self.assertEqual(document.mimetype, 'application/pdf')
+        self.assertEqual(document.checksum, hashlib.sha1(PDF_CONTENT).hexdigest())
+
+    def test_backfill_skips_documents_without_file(self):
+        """Documents whose file attachment is gone are not scanned again"""
+        document = self._create_document()
+        self.env.flush_all()
+        self.env.cr.execute(
+            "DELETE FROM ir_attachment WHERE res_model = 'acmst.document' AND res_field = 'file' AND res_id = %s",
+            [document.id],
+        )
+        self.env.cr.execute("UPDATE acmst_document SET checksum = NULL WHERE id = %s", [document.id])
+        self.env.invalidate_all()
+
+        self.env['acmst.document']._cron_backfill_file_metadata(auto_commit=False)
+        self.assertFalse(document.checksum)
+        self.assertEqual(self.env['acmst.document']._cron_backfill_file_metadata(auto_commit=False), 0)
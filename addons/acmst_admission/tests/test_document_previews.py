@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+from odoo.tools.image import base64_to_image
+from PIL import Image
+import base64
+import io
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestDocumentPreviews(AdmissionTestCommon, TransactionCase):
+    """Test cases for document thumbnails and resized profile pictures"""
+
+    national_id_base = 1234568000
+
+    def _image(self, width=1024, height=768):
+        output = io.BytesIO()
+        Image.new('RGB', (width, height), color='blue').save(output, format='PNG')
+        return base64.b64encode(output.getvalue())
+
+    def _create_document(self, content, filename):
+        return self.env['acmst.document'].create({
+            'name': filename,
+            'document_type': 'other',
+            'file': content,
+            'filename': filename,
+        })
+
+    def test_image_document_thumbnails(self):
+        """Image documents get downscaled thumbnails from the background job"""
+        document = self._create_document(self._image(), 'scan.png')
+        self.assertEqual(document.preview_state, 'pending')
+        self.env['acmst.document']._cron_generate_previews(auto_commit=False)
+        self.assertEqual(document.preview_state, 'done')
+        self.assertEqual(base64_to_image(document.thumbnail_128).size, (128, 96))
+        self.assertEqual(base64_to_image(document.thumbnail_512).size, (512, 384))
+
+        # Replacing the file schedules new previews
+        document.write({'file': self._image(200, 200)})
+        self.assertEqual(document.preview_state, 'pending')
+        self.assertFalse(document.thumbnail_128)
+
+    def test_document_without_preview(self):
+        """Documents that are neither images nor PDFs are marked as having no preview"""
+        document = self._create_document(base64.b64encode(b'plain text notes'), 'notes.txt')
+        self.env['acmst.document']._cron_generate_previews(auto_commit=False)
+        self.assertEqual(document.preview_state, 'none')
+        self.assertFalse(document.thumbnail_128)
+
+    def test_profile_picture_sizes(self):
+        """Profile pictures are stored in list and form sizes"""
+        admission_file = self._create_file(1, profile_picture=self._image(2048, 1024))
+        self.assertEqual(base64_to_image(admission_file.profile_picture_128).size, (128, 64))
+        self.assertEqual(base64_to_image(admission_file.profile_picture_512).size, (512, 256))
+        self.assertIn('/admission/preview/acmst.admission.file/', admission_file.get_picture_url())
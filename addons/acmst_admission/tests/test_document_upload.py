@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+from odoo.exceptions import ValidationError, UserError
+from odoo.addons.acmst_admission.models.acmst_document_upload import (
+    MAX_UPLOAD_SIZE, MAX_OPEN_UPLOADS, MAX_PENDING_UPLOAD_SIZE,
+)
+import base64
+import hashlib
+import io
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestDocumentUpload(AdmissionTestCommon, TransactionCase):
+    """Test cases for chunked document uploads"""
+
+    national_id_base = 1234567800
+
+    def setUp(self):
+        super().setUp()
+        self.Upload = self.env['acmst.document.upload']
+
+    def test_chunked_upload(self):
+        """Chunks are appended in order and the result becomes a filestore attachment"""
+        content = b'%PDF-1.4\n' + b'x' * 3000
+        upload = self.Upload.start_upload('transcript.pdf', len(content), document_type='transcript')
+        chunks = [content[:1000], content[1000:2000], content[2000:]]
+        for index, chunk in enumerate(chunks):
+            status = upload.write_chunk(index, io.BytesIO(chunk))
+        self.assertEqual(status['state'], 'done')
+        attachment = upload.attachment_id
+        self.assertEqual(attachment.raw, content)
+        self.assertEqual(attachment.file_size, len(content))
+        self.assertEqual(attachment.checksum, hashlib.sha1(content).hexdigest())
+        self.assertEqual(attachment.mimetype, 'application/pdf')
+
+    def test_resend_and_out_of_order_chunks(self):
+        """Resent chunks are acknowledged, skipped chunks are refused"""
+        upload = self.Upload.start_upload('id.png', 20)
+        upload.write_chunk(0, io.BytesIO(b'a' * 10))
+        status = upload.write_chunk(0, io.BytesIO(b'a' * 10))
+        self.assertEqual(status['next_chunk'], 1)
+        self.assertEqual(status['received_size'], 10)
+        with self.assertRaises(UserError):
+            upload.write_chunk(2, io.BytesIO(b'b' * 10))
+
+    def test_size_limits(self):
+        """Uploads larger than announced or than the maximum are refused"""
+        with self.assertRaises(ValidationError):
+            self.Upload.start_upload('big.pdf', MAX_UPLOAD_SIZE + 1)
+        upload = self.Upload.start_upload('small.pdf', 5)
+        with self.assertRaises(ValidationError):
+            upload.write_chunk(0, io.BytesIO(b'too many bytes'))
+        self.assertEqual(upload.received_size, 0)
+
+    def test_client_quota(self):
+        """A client cannot keep too many uploads or too many pending bytes open"""
+        for index in range(MAX_OPEN_UPLOADS):
+            self.Upload.start_upload(f'doc{index}.pdf', 10, ip_address='192.0.2.10')
+        with self.assertRaises(ValidationError):
+            self.Upload.start_upload('one-more.pdf', 10, ip_address='192.0.2.10')
+        # Other clients are not affected
+        self.Upload.start_upload('other.pdf', 10, ip_address='192.0.2.11')
+
+        size = MAX_UPLOAD_SIZE
+        for index in range(MAX_PENDING_UPLOAD_SIZE // size):
+            self.Upload.start_upload(f'big{index}.pdf', size, session_key='session-a')
+        with self.assertRaises(ValidationError):
+            self.Upload.start_upload('big-more.pdf', size, session_key='session-a')
+
+    def test_link_to_application(self):
+        """Finished uploads become documents of the application without copying the file"""
+        application = self._create_application(0)
+        content = b'certificate content'
+        upload = self.Upload.upload_stream('certificate.txt', io.BytesIO(content), document_type='academic_certificate')
+        attachment = upload.attachment_id
+        documents = upload.link_to_application(application)
+        self.assertEqual(documents.portal_application_id, application)
+        self.assertEqual(documents.document_type, 'academic_certificate')
+        self.assertEqual(upload.state, 'linked')
+        self.assertEqual(attachment.res_model, 'acmst.document')
+        self.assertEqual(attachment.res_id, documents.id)
+        self.assertEqual(base64.b64decode(documents.file), content)
+
+    def test_token_lookup(self):
+        """Uploads are found by token and unknown tokens are refused"""
+        upload = self.Upload.start_upload('id.png', 20)
+        self.assertEqual(self.Upload._get_by_token(upload.access_token), upload)
+        with self.assertRaises(UserError):
+            self.Upload._get_by_token('unknown-token')
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.tools import sql
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestIndexRegistry(TransactionCase):
+    """Test cases for the declared indexes of the admission models"""
+
+    def setUp(self):
+        super().setUp()
+        self.Registry = self.env['acmst.index.registry']
+
+    def _get_indexdef(self, name):
+        self.env.cr.execute('SELECT indexdef FROM pg_indexes WHERE indexname = %s', [name])
+        row = self.env.cr.fetchone()
+        return row and row[0]
+
+    def test_declared_indexes_exist(self):
+        """Every declared index is created at install and nothing is reported missing"""
+        report = self.Registry._check_indexes()
+        self.assertFalse(report['missing'])
+        self.assertFalse(report['invalid'])
+        for definition in self.Registry.get_index_definitions():
+            self.assertTrue(self._get_indexdef(definition['name']), definition['name'])
+
+    def test_audit_log_access_paths(self):
+        """The audit log indexes match its access paths, the anomaly one being partial"""
+        indexdef = self._get_indexdef('acmst_audit_log_model_record_date_idx')
+        self.assertIn('(model_name, record_id, create_date DESC)', indexdef)
+        indexdef = self._get_indexdef('acmst_audit_log_anomaly_date_idx')
+        self.assertIn('WHERE (is_anomaly = true)', indexdef)
+
+    def test_missing_index_is_reported_and_recreated(self):
+        """A dropped index is reported missing and recreated by _ensure_indexes"""
+        self.env.cr.execute('DROP INDEX acmst_admission_file_state_date_idx')
+        report = self.Registry._check_indexes()
+        self.assertIn('acmst_admission_file_state_date_idx', report['missing'])
+        self.assertEqual(self.env['acmst.performance.optimization']._check_database_indexes()['status'], 'warning')
+
+        self.assertEqual(self.Registry._ensure_indexes(), ['acmst_admission_file_state_date_idx'])
+        self.assertTrue(sql.index_exists(self.env.cr, 'acmst_admission_file_state_date_idx'))
+        self.assertFalse(self.Registry._ensure_indexes())
+
+    def test_unused_indexes_report(self):
+        """Unused indexes are reported by name and table, never the unique ones"""
+        report = self.Registry._check_indexes()
+        for index in report['unused']:
+            self.assertEqual(report['indexes'][index['name']]['table'], index['table'])
+            self.assertFalse(report['indexes'][index['name']]['unique'])
+            self.assertEqual(report['indexes'][index['name']]['scans'], 0)
@@ -3,847 +3,104 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
 from odoo.tests.common import TransactionCase
-from odoo.exceptions import ValidationError, UserError
-from datetime import datetime, date, timedelta
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
 import logging
 
 _logger = logging.getLogger(__name__)
 
 
-class TestIntegration(TransactionCase):
-    """Test cases for admission integration"""
+class TestIntegration(AdmissionTestCommon, TransactionCase):
+    """End-to-end tests of the admission process"""
 
-    def setUp(self):
-        super().setUp()
-        
-        # Create test data
-        self.program = self.env['acmst.program'].create({
-            'name': 'Test Program',
-            'code': 'TEST001',
-            'description': 'Test program for testing'
-        })
-        
-        self.batch = self.env['acmst.batch'].create({
-            'name': 'Test Batch 2024',
-            'code': 'BATCH2024',
-            'academic_year_id': self.env.ref('base.main_company').id
-        })
-        
-        self.coordinator = self.env['res.users'].create({
-            'name': 'Test Coordinator',
-            'login': 'coordinator',
-            'email': 'coordinator@example.com'
-        })
-        
-        self.health_user = self.env['res.users'].create({
-            'name': 'Test Health User',
-            'login': 'health_user',
-            'email': 'health@example.com'
-        })
-        
-        self.manager = self.env['res.users'].create({
-            'name': 'Test Manager',
-            'login': 'manager',
-            'email': 'manager@example.com'
-        })
+    national_id_base = 1234571100
 
-    def test_complete_admission_workflow(self):
-        """Test complete admission workflow integration"""
-        # Create admission file
-        admission_file = self.env['acmst.admission.file'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568',
-            'coordinator_id': self.coordinator.id
-        })
-        
-        # Test initial state
-        self.assertEqual(admission_file.state, 'draft')
-        
-        # Submit application
-        admission_file.action_submit()
-        self.assertEqual(admission_file.state, 'submitted')
-        
-        # Ministry approval
-        admission_file.action_ministry_approve()
-        self.assertEqual(admission_file.state, 'ministry_approved')
-        
-        # Health check required
-        admission_file.action_health_required()
-        self.assertEqual(admission_file.state, 'health_required')
-        
-        # Create health check
-        health_check = self.env['acmst.health.check'].create({
-            'admission_file_id': admission_file.id,
-            'examiner_id': self.health_user.id,
-            'height': 175.0,
-            'weight': 70.0,
-            'medical_fitness': 'fit',
-            'blood_type': 'O+',
-            'has_chronic_diseases': False,
-            'takes_medications': False,
-            'has_allergies': False,
-            'has_disabilities': False,
-            'follow_up_required': False,
-            'medical_notes': 'No issues found',
-            'restrictions': 'None'
-        })
-        
-        # Submit health check
+    def _approve_health_check(self, admission_file):
+        health_check = admission_file.health_check_ids
+        health_check.write({'height': 175.0, 'weight': 70.0, 'medical_fitness': 'fit'})
         health_check.action_submit()
-        self.assertEqual(health_check.state, 'submitted')
-        
-        # Approve health check
         health_check.action_approve()
-        self.assertEqual(health_check.state, 'approved')
-        self.assertEqual(admission_file.state, 'health_approved')
-        
-        # Coordinator review
-        admission_file.action_coordinator_review()
-        self.assertEqual(admission_file.state, 'coordinator_review')
-        
-        # Create coordinator conditions
-        condition = self.env['acmst.coordinator.condition'].create({
-            'admission_file_id': admission_file.id,
-            'coordinator_id': self.coordinator.id,
-            'subject_name': 'Mathematics',
-            'subject_code': 'MATH101',
-            'level': 'bachelor',
-            'description': 'Complete mathematics prerequisite',
-            'deadline': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
-            'notes': 'Must be completed before enrollment'
-        })
-        
-        # Complete condition
-        condition.action_complete()
-        self.assertEqual(condition.state, 'completed')
-        
-        # Manager approval
-        admission_file.action_manager_approve()
-        self.assertEqual(admission_file.state, 'manager_approved')
-        
-        # Complete admission
-        admission_file.action_complete()
-        self.assertEqual(admission_file.state, 'completed')
-        self.assertTrue(admission_file.student_id)
+        return health_check
 
-    def test_portal_application_to_admission_file_integration(self):
-        """Test portal application to admission file integration"""
-        # Create portal application
-        application = self.env['acmst.portal.application'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568'
-        })
-        
-        # Submit application
-        application.action_submit()
-        self.assertEqual(application.state, 'submitted')
-        
-        # Review application
-        application.action_review()
-        self.assertEqual(application.state, 'under_review')
-        
-        # Approve application
-        application.action_approve()
-        self.assertEqual(application.state, 'approved')
-        
-        # Create admission file
-        application.action_create_admission_file()
-        self.assertEqual(application.state, 'admission_created')
-        self.assertTrue(application.admission_file_id)
-        
-        # Check admission file details
-        admission_file = application.admission_file_id
-        self.assertEqual(admission_file.applicant_name, 'John Doe')
-        self.assertEqual(admission_file.national_id, '1234567890')
-        self.assertEqual(admission_file.program_id, self.program)
-        self.assertEqual(admission_file.batch_id, self.batch)
+    def test_complete_admission_workflow(self):
+        """Test an admission file from creation to completion"""
+        admission_file = self._create_file(0)
 
-    def test_health_check_integration(self):
-        """Test health check integration"""
-        # Create admission file
-        admission_file = self.env['acmst.admission.file'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568'
-        })
-        
-        # Set to health required state
-        admission_file.action_ministry_approve()
-        admission_file.action_health_required()
+        self._approve_by_ministry(admission_file)
         self.assertEqual(admission_file.state, 'health_required')
-        
-        # Create health check
-        health_check = self.env['acmst.health.check'].create({
-            'admission_file_id': admission_file.id,
-            'examiner_id': self.health_user.id,
-            'height': 175.0,
-            'weight': 70.0,
-            'medical_fitness': 'fit',
-            'blood_type': 'O+',
-            'has_chronic_diseases': True,
-            'chronic_diseases_details': 'Diabetes',
-            'takes_medications': True,
-            'medications_details': 'Insulin',
-            'has_allergies': True,
-            'allergies_details': 'Peanuts',
-            'has_disabilities': True,
-            'disabilities_details': 'Mobility impairment',
-            'follow_up_required': True,
-            'follow_up_date': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
-            'medical_notes': 'Regular checkup required',
-            'restrictions': 'No heavy lifting'
-        })
-        
-        # Test health check workflow
-        health_check.action_submit()
-        self.assertEqual(health_check.state, 'submitted')
-        
-        health_check.action_approve()
-        self.assertEqual(health_check.state, 'approved')
-        self.assertEqual(admission_file.state, 'health_approved')
-        
-        # Test health check summary
-        summary = health_check.get_health_summary()
-        self.assertEqual(summary['applicant_name'], 'John Doe')
-        self.assertEqual(summary['height'], 175.0)
-        self.assertEqual(summary['weight'], 70.0)
-        self.assertEqual(summary['blood_type'], 'O+')
-        self.assertEqual(summary['medical_fitness'], 'Medically Fit')
-        self.assertTrue(summary['has_chronic_diseases'])
-        self.assertTrue(summary['takes_medications'])
-        self.assertTrue(summary['has_allergies'])
-        self.assertTrue(summary['has_disabilities'])
-        self.assertTrue(summary['follow_up_required'])
 
-    def test_coordinator_condition_integration(self):
-        """Test coordinator condition integration"""
-        # Create admission file
-        admission_file = self.env['acmst.admission.file'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568',
-            'coordinator_id': self.coordinator.id
-        })
-        
-        # Set to coordinator review state
-        admission_file.action_ministry_approve()
-        admission_file.action_health_required()
-        admission_file.action_health_approved()
-        admission_file.action_coordinator_review()
+        self._approve_health_check(admission_file)
         self.assertEqual(admission_file.state, 'coordinator_review')
-        
-        # Create coordinator conditions
-        condition1 = self.env['acmst.coordinator.condition'].create({
-            'admission_file_id': admission_file.id,
-            'coordinator_id': self.coordinator.id,
-            'subject_name': 'Mathematics',
-            'subject_code': 'MATH101',
-            'level': 'bachelor',
-            'description': 'Complete mathematics prerequisite',
-            'deadline': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
-            'notes': 'Must be completed before enrollment'
-        })
-        
-        condition2 = self.env['acmst.coordinator.condition'].create({
-            'admission_file_id': admission_file.id,
-            'coordinator_id': self.coordinator.id,
-            'subject_name': 'Physics',
-            'subject_code': 'PHYS101',
-            'level': 'bachelor',
-            'description': 'Complete physics prerequisite',
-            'deadline': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
-            'notes': 'Must be completed before enrollment'
-        })
-        
-        # Test condition workflow
-        condition1.action_complete()
-        self.assertEqual(condition1.state, 'completed')
-        
-        condition2.action_complete()
-        self.assertEqual(condition2.state, 'completed')
-        
-        # Test condition statistics
-        stats = self.env['acmst.coordinator.condition'].get_condition_statistics()
-        self.assertEqual(stats['total'], 2)
-        self.assertEqual(stats['completed'], 2)
-        self.assertEqual(stats['pending'], 0)
-        
-        # Test condition summary
-        summary = condition1.get_condition_summary()
-        self.assertEqual(summary['subject_name'], 'Mathematics')
-        self.assertEqual(summary['subject_code'], 'MATH101')
-        self.assertEqual(summary['level'], 'bachelor')
-        self.assertEqual(summary['status'], 'completed')
-        self.assertEqual(summary['applicant_name'], 'John Doe')
-        self.assertEqual(summary['program_name'], 'Test Program')
-
-    def test_admission_approval_integration(self):
-        """Test admission approval integration"""
-        # Create admission file
-        admission_file = self.env['acmst.admission.file'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568'
-        })
-        
-        # Create multiple approvals
-        ministry_approval = self.env['acmst.admission.approval'].create({
-            'admission_file_id': admission_file.id,
-            'approver_id': self.manager.id,
-            'approval_type': 'ministry',
-            'approval_date': fields.Datetime.now(),
-            'decision': 'approved',
-            'comments': 'Application approved by ministry'
-        })
-        
-        health_approval = self.env['acmst.admission.approval'].create({
-            'admission_file_id': admission_file.id,
-            'approver_id': self.health_user.id,
-            'approval_type': 'health',
-            'approval_date': fields.Datetime.now(),
-            'decision': 'approved',
-            'comments': 'Health check approved'
-        })
-        
-        coordinator_approval = self.env['acmst.admission.approval'].create({
-            'admission_file_id': admission_file.id,
-            'approver_id': self.coordinator.id,
-            'approval_type': 'coordinator',
-            'approval_date': fields.Datetime.now(),
-            'decision': 'conditional',
-            'comments': 'Approved with conditions',
-            'conditions': 'Complete mathematics prerequisite'
-        })
-        
-        manager_approval = self.env['acmst.admission.approval'].create({
-            'admission_file_id': admission_file.id,
-            'approver_id': self.manager.id,
-            'approval_type': 'manager',
-            'approval_date': fields.Datetime.now(),
-            'decision': 'approved',
-            'comments': 'Final approval granted'
-        })
-        
-        # Test approvals integration
-        self.assertEqual(len(admission_file.approval_ids), 4)
-        self.assertIn(ministry_approval, admission_file.approval_ids)
-        self.assertIn(health_approval, admission_file.approval_ids)
-        self.assertIn(coordinator_approval, admission_file.approval_ids)
-        self.assertIn(manager_approval, admission_file.approval_ids)
-        
-        # Test approval details
-        self.assertEqual(ministry_approval.decision, 'approved')
-        self.assertEqual(health_approval.decision, 'approved')
-        self.assertEqual(coordinator_approval.decision, 'conditional')
-        self.assertEqual(manager_approval.decision, 'approved')
-        
-        self.assertEqual(coordinator_approval.conditions, 'Complete mathematics prerequisite')
 
-    def test_workflow_engine_integration(self):
-        """Test workflow engine integration"""
-        # Create workflow engine
-        workflow = self.env['acmst.workflow.engine'].create({
-            'name': 'Test Workflow',
-            'model_id': self.env['ir.model']._get('acmst.admission.file').id,
-            'description': 'Test workflow for admission files'
-        })
-        
-        # Create workflow states
-        state1 = self.env['acmst.workflow.state'].create({
-            'name': 'draft',
-            'workflow_id': workflow.id,
-            'is_initial': True,
-            'description': 'Initial state'
-        })
-        
-        state2 = self.env['acmst.workflow.state'].create({
-            'name': 'submitted',
-            'workflow_id': workflow.id,
-            'is_final': False,
-            'description': 'Submitted state'
-        })
-        
-        state3 = self.env['acmst.workflow.state'].create({
-            'name': 'approved',
-            'workflow_id': workflow.id,
-            'is_final': True,
-            'description': 'Final state'
-        })
-        
-        # Create workflow rules
-        rule1 = self.env['acmst.workflow.rule'].create({
-            'name': 'Test Rule 1',
-            'workflow_id': workflow.id,
-            'trigger_event': 'on_create',
-            'action_type': 'update_field',
-            'action_value': 'draft'
-        })
-        
-        rule2 = self.env['acmst.workflow.rule'].create({
-            'name': 'Test Rule 2',
-            'workflow_id': workflow.id,
-            'trigger_event': 'on_update',
-            'action_type': 'send_email',
-            'action_value': 'test@example.com'
-        })
-        
-        # Test workflow integration
-        self.assertEqual(len(workflow.state_ids), 3)
-        self.assertEqual(len(workflow.rule_ids), 2)
-        self.assertIn(state1, workflow.state_ids)
-        self.assertIn(state2, workflow.state_ids)
-        self.assertIn(state3, workflow.state_ids)
-        self.assertIn(rule1, workflow.rule_ids)
-        self.assertIn(rule2, workflow.rule_ids)
-        
-        # Test workflow actions
-        action1 = workflow.action_view_states()
-        self.assertEqual(action1['type'], 'ir.actions.act_window')
-        self.assertEqual(action1['res_model'], 'acmst.workflow.state')
-        
-        action2 = workflow.action_view_rules()
-        self.assertEqual(action2['type'], 'ir.actions.act_window')
-        self.assertEqual(action2['res_model'], 'acmst.workflow.rule')
+        # The admission workflow moves coordinator approved files to manager review
+        admission_file.action_coordinator_approve()
+        self.assertEqual(admission_file.state, 'manager_review')
 
-    def test_audit_log_integration(self):
-        """Test audit log integration"""
-        # Create admission file
-        admission_file = self.env['acmst.admission.file'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568'
-        })
-        
-        # Create audit logs
-        audit_log1 = self.env['acmst.audit.log'].log_action(
-            action_type='create',
-            res_model='acmst.admission.file',
-            res_id=admission_file.id,
-            description='Admission file created'
-        )
-        
-        audit_log2 = self.env['acmst.audit.log'].log_action(
-            action_type='write',
-            res_model='acmst.admission.file',
-            res_id=admission_file.id,
-            description='Admission file updated',
-            old_value='draft',
-            new_value='submitted'
-        )
-        
-        audit_log3 = self.env['acmst.audit.log'].log_action(
-            action_type='workflow',
-            res_model='acmst.admission.file',
-            res_id=admission_file.id,
-            description='State transition',
-            old_value='draft',
-            new_value='submitted'
+        admission_file.action_manager_approve()
+        self.assertEqual(admission_file.state, 'completed')
+        self.assertEqual(admission_file.student_id.name, 'John Doe 0')
+        self.assertEqual(
+            set(admission_file.approval_ids.filtered(lambda a: a.decision == 'approved').mapped('approval_type')),
+            {'ministry', 'health', 'coordinator', 'manager'},
         )
-        
-        # Test audit log integration
-        self.assertEqual(len(self.env['acmst.audit.log'].search([])), 3)
-        self.assertIn(audit_log1, self.env['acmst.audit.log'].search([]))
-        self.assertIn(audit_log2, self.env['acmst.audit.log'].search([]))
-        self.assertIn(audit_log3, self.env['acmst.audit.log'].search([]))
-        
-        # Test audit log details
-        self.assertEqual(audit_log1.action_type, 'create')
-        self.assertEqual(audit_log2.action_type, 'write')
-        self.assertEqual(audit_log3.action_type, 'workflow')
-        
-        self.assertEqual(audit_log1.description, 'Admission file created')
-        self.assertEqual(audit_log2.description, 'Admission file updated')
-        self.assertEqual(audit_log3.description, 'State transition')
-        
-        # Test audit log actions
-        action = audit_log1.action_view_related_record()
-        self.assertEqual(action['type'], 'ir.actions.act_window')
-        self.assertEqual(action['res_model'], 'acmst.admission.file')
-        self.assertEqual(action['res_id'], admission_file.id)
 
-    def test_wizard_integration(self):
-        """Test wizard integration"""
-        # Create admission file
-        admission_file = self.env['acmst.admission.file'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568',
-            'coordinator_id': self.coordinator.id
-        })
-        
-        # Set to coordinator review state
-        admission_file.action_ministry_approve()
-        admission_file.action_health_required()
-        admission_file.action_health_approved()
-        admission_file.action_coordinator_review()
-        
-        # Create coordinator condition wizard
+    def test_conditional_admission_workflow(self):
+        """Test an admission file approved with conditions"""
+        admission_file = self._create_file(0)
+        self._approve_by_ministry(admission_file)
+        self._approve_health_check(admission_file)
+
+        admission_file.action_coordinator_conditional()
         wizard = self.env['acmst.coordinator.condition.wizard'].create({
             'admission_file_id': admission_file.id,
-            'coordinator_id': self.coordinator.id
-        })
-        
-        # Create wizard lines
-        wizard_line1 = self.env['acmst.coordinator.condition.wizard.line'].create({
-            'wizard_id': wizard.id,
-            'subject_name': 'Mathematics',
-            'subject_code': 'MATH101',
-            'level': 'bachelor',
-            'description': 'Complete mathematics prerequisite',
-            'deadline': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
-            'notes': 'Must be completed before enrollment'
-        })
-        
-        wizard_line2 = self.env['acmst.coordinator.condition.wizard.line'].create({
-            'wizard_id': wizard.id,
-            'subject_name': 'Physics',
-            'subject_code': 'PHYS101',
-            'level': 'bachelor',
-            'description': 'Complete physics prerequisite',
-            'deadline': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
-            'notes': 'Must be completed before enrollment'
+            'send_notification': False,
+            'condition_lines': [(0, 0, {
+                'subject_name': 'Mathematics',
+                'description': 'Complete mathematics course',
+                'deadline': '2099-01-01',
+            })],
         })
-        
-        # Test wizard integration
-        self.assertEqual(wizard.admission_file_id, admission_file)
-        self.assertEqual(wizard.coordinator_id, self.coordinator)
-        self.assertEqual(len(wizard.condition_lines), 2)
-        self.assertIn(wizard_line1, wizard.condition_lines)
-        self.assertIn(wizard_line2, wizard.condition_lines)
-        
-        # Test wizard action
-        result = wizard.action_create_conditions()
-        self.assertEqual(result['type'], 'ir.actions.act_window_close')
-        
-        # Check conditions were created
-        conditions = self.env['acmst.coordinator.condition'].search([
-            ('admission_file_id', '=', admission_file.id)
-        ])
-        self.assertEqual(len(conditions), 2)
-        
-        # Check admission file state
-        self.assertEqual(admission_file.state, 'coordinator_conditional')
+        wizard.action_create_conditions()
+        self.assertEqual(admission_file.state, 'manager_review')
+        self.assertTrue(admission_file.has_pending_conditions)
 
-    def test_report_integration(self):
-        """Test report integration"""
-        # Create admission file
-        admission_file = self.env['acmst.admission.file'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568'
-        })
-        
-        # Create health check
-        health_check = self.env['acmst.health.check'].create({
-            'admission_file_id': admission_file.id,
-            'examiner_id': self.health_user.id,
-            'height': 175.0,
-            'weight': 70.0,
-            'medical_fitness': 'fit',
-            'blood_type': 'O+',
-            'has_chronic_diseases': False,
-            'takes_medications': False,
-            'has_allergies': False,
-            'has_disabilities': False,
-            'follow_up_required': False,
-            'medical_notes': 'No issues found',
-            'restrictions': 'None'
-        })
-        
-        # Create coordinator condition
-        condition = self.env['acmst.coordinator.condition'].create({
-            'admission_file_id': admission_file.id,
-            'coordinator_id': self.coordinator.id,
-            'subject_name': 'Mathematics',
-            'subject_code': 'MATH101',
-            'level': 'bachelor',
-            'description': 'Complete mathematics prerequisite',
-            'deadline': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
-            'notes': 'Must be completed before enrollment'
-        })
-        
-        # Create admission approval
-        approval = self.env['acmst.admission.approval'].create({
-            'admission_file_id': admission_file.id,
-            'approver_id': self.manager.id,
-            'approval_type': 'ministry',
-            'approval_date': fields.Datetime.now(),
-            'decision': 'approved',
-            'comments': 'Application approved by ministry'
-        })
-        
-        # Test report integration
-        reports = [
-            'acmst_admission.admission_file_report',
-            'acmst_admission.health_check_report',
-            'acmst_admission.coordinator_condition_report',
-            'acmst_admission.admission_approval_report'
-        ]
-        
-        for report_name in reports:
-            report = self.env['ir.actions.report']._get_report_from_name(report_name)
-            if report:
-                # Test report rendering
-                if report_name == 'acmst_admission.admission_file_report':
-                    report_html = report._render_qweb_html(admission_file.ids)
-                elif report_name == 'acmst_admission.health_check_report':
-                    report_html = report._render_qweb_html(health_check.ids)
-                elif report_name == 'acmst_admission.coordinator_condition_report':
-                    report_html = report._render_qweb_html(condition.ids)
-                elif report_name == 'acmst_admission.admission_approval_report':
-                    report_html = report._render_qweb_html(approval.ids)
-                
-                self.assertTrue(report_html)
-                self.assertIn('John Doe', report_html[0])
+        admission_file.coordinator_conditions_ids.action_complete()
+        self.assertFalse(admission_file.has_pending_conditions)
 
-    def test_security_integration(self):
-        """Test security integration"""
-        # Create test users with different roles
-        admin_user = self.env['res.users'].create({
-            'name': 'Admin User',
-            'login': 'admin_user',
-            'email': 'admin@example.com',
-            'groups_id': [(6, 0, [self.env.ref('acmst_admission.group_admin').id])]
-        })
-        
-        manager_user = self.env['res.users'].create({
-            'name': 'Manager User',
-            'login': 'manager_user',
-            'email': 'manager@example.com',
-            'groups_id': [(6, 0, [self.env.ref('acmst_admission.group_manager').id])]
-        })
-        
-        coordinator_user = self.env['res.users'].create({
-            'name': 'Coordinator User',
-            'login': 'coordinator_user',
-            'email': 'coordinator@example.com',
-            'groups_id': [(6, 0, [self.env.ref('acmst_admission.group_coordinator').id])]
-        })
-        
-        # Create admission file
-        admission_file = self.env['acmst.admission.file'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568'
+        admission_file.action_manager_approve()
+        self.assertEqual(admission_file.state, 'completed')
+
+    def test_portal_application_to_admission_file_integration(self):
+        """Test a portal application approved by the ministry"""
+        application = self._create_application(0)
+        self._create_guardian(application)
+        application.action_submit()
+
+        wizard = self.env['acmst.ministry.approval.wizard'].create({
+            'portal_application_id': application.id,
+            'acknowledge_sensitive_data': True,
+            'has_university_id': True,
+            'university_id': 'U-2024-100',
         })
-        
-        # Test security integration
-        # Admin user should have full access
-        with self.env.do_in_onchange():
-            self.env = self.env(user=admin_user)
-            admission_file = self.env['acmst.admission.file'].browse(admission_file.id)
-            self.assertTrue(admission_file.exists())
-            admission_file.read(['name', 'state'])
-            admission_file.write({'notes': 'Admin updated'})
-        
-        # Manager user should have limited access
-        with self.env.do_in_onchange():
-            self.env = self.env(user=manager_user)
-            admission_file = self.env['acmst.admission.file'].browse(admission_file.id)
-            self.assertTrue(admission_file.exists())
-            admission_file.read(['name', 'state'])
-            admission_file.write({'notes': 'Manager updated'})
-        
-        # Coordinator user should have limited access
-        with self.env.do_in_onchange():
-            self.env = self.env(user=coordinator_user)
-            admission_file = self.env['acmst.admission.file'].browse(admission_file.id)
-            self.assertTrue(admission_file.exists())
-            admission_file.read(['name', 'state'])
-            admission_file.write({'notes': 'Coordinator updated'})
+        wizard.action_validate_data()
+        wizard.action_approve()
 
-    def test_data_integration(self):
-        """Test data integration"""
-        # Test data loading
-        data_files = [
-            'acmst_admission_data.xml',
-            'acmst_admission_demo.xml'
-        ]
-        
-        for data_file in data_files:
-            # Test data file exists
-            self.assertTrue(True)  # Placeholder for data file validation
-        
-        # Test security groups
-        security_groups = [
-            'acmst_admission.group_admin',
-            'acmst_admission.group_manager',
-            'acmst_admission.group_coordinator',
-            'acmst_admission.group_health',
-            'acmst_admission.group_officer',
-            'acmst_admission.group_portal'
-        ]
-        
-        for group_name in security_groups:
-            group = self.env.ref(group_name)
-            self.assertTrue(group.exists())
-        
-        # Test access rights
-        access_rights = self.env['ir.model.access'].search([
-            ('model_id.model', 'in', [
-                'acmst.admission.file',
-                'acmst.health.check',
-                'acmst.coordinator.condition',
-                'acmst.admission.approval',
-                'acmst.portal.application',
-                'acmst.workflow.engine',
-                'acmst.audit.log'
-            ])
-        ])
-        self.assertTrue(access_rights.exists())
+        admission_file = application.admission_file_id
+        self.assertEqual(application.state, 'approved')
+        self.assertEqual(admission_file.state, 'health_required')
+        self.assertEqual(admission_file.submission_method, 'portal')
+        self.assertEqual(admission_file.university_id, 'U-2024-100')
+        self.assertEqual(admission_file.guardian_ids.name, 'Jane Doe')
+        self.assertEqual(len(admission_file.health_check_ids), 1)
 
-    def test_ui_integration(self):
-        """Test UI integration"""
-        # Test view files
-        view_files = [
-            'acmst_admission_file_views.xml',
-            'acmst_health_check_views.xml',
-            'acmst_coordinator_condition_views.xml',
-            'acmst_admission_approval_views.xml',
-            'acmst_portal_application_views.xml',
-            'acmst_workflow_engine_views.xml',
-            'acmst_audit_log_views.xml',
-            'acmst_admission_menus.xml'
-        ]
-        
-        for view_file in view_files:
-            # Test view file exists
-            self.assertTrue(True)  # Placeholder for view file validation
-        
-        # Test menu structure
-        menu_items = self.env['ir.ui.menu'].search([
-            ('name', 'like', 'Admission')
-        ])
-        self.assertTrue(menu_items.exists())
-        
-        # Test action windows
-        action_windows = self.env['ir.actions.act_window'].search([
-            ('res_model', 'in', [
-                'acmst.admission.file',
-                'acmst.health.check',
-                'acmst.coordinator.condition',
-                'acmst.admission.approval',
-                'acmst.portal.application',
-                'acmst.workflow.engine',
-                'acmst.audit.log'
-            ])
-        ])
-        self.assertTrue(action_windows.exists())
+        self._approve_health_check(admission_file)
+        self.assertEqual(admission_file.state, 'coordinator_review')
 
-    def test_static_assets_integration(self):
-        """Test static assets integration"""
-        # Test CSS files
-        css_files = [
-            'acmst_admission.css',
-            'acmst_admission_portal.css'
-        ]
-        
-        for css_file in css_files:
-            # Test CSS file exists
-            self.assertTrue(True)  # Placeholder for CSS file validation
-        
-        # Test JavaScript files
-        js_files = [
-            'acmst_admission.js',
-            'acmst_admission_portal.js'
-        ]
-        
-        for js_file in js_files:
-            # Test JavaScript file exists
-            self.assertTrue(True)  # Placeholder for JavaScript file validation
-        
-        # Test XML templates
-        xml_templates = [
-            'acmst_admission_portal_templates.xml',
-            'acmst_admission_portal_dashboard.xml',
-            'acmst_admission_form_wizard.xml',
-            'acmst_admission_dashboard.xml',
-            'acmst_admission_progress_tracking.xml'
-        ]
-        
-        for xml_template in xml_templates:
-            # Test XML template exists
-            self.assertTrue(True)  # Placeholder for XML template validation
+    def test_audit_log_integration(self):
+        """Test the workflow changes are in the audit trail"""
+        admission_file = self._create_file(0)
+        self._approve_by_ministry(admission_file)
+
+        trail = self.env['acmst.audit.log'].get_audit_trail('acmst.admission.file', admission_file.id)
+        state_changes = trail.filtered(lambda log: log.diff and 'state' in log.diff)
+        self.assertIn('health_required', state_changes.mapped(lambda log: log.diff['state']['new']))
+        self.assertTrue(trail.filtered(lambda log: log.action == 'approval' and log.is_sensitive))
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.models.acmst_live_metrics import LiveMetricsCollector
+from unittest.mock import patch
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestLiveMetrics(TransactionCase):
+    """Test cases for the live metrics collector"""
+
+    def test_rolling_window(self):
+        """Requests are aggregated per window and expire with age"""
+        collector = LiveMetricsCollector(max_age=900)
+        with patch('odoo.addons.acmst_admission.models.acmst_live_metrics.time.time', return_value=1000.0):
+            collector.request_started()
+            collector.request_finished(0.2, 10, 0.05)
+            collector.request_started()
+            collector.request_finished(1.5, 30, 0.15)
+            window = collector.window(60)
+        self.assertEqual(window['requests'], 2)
+        self.assertEqual(window['queries'], 40)
+        self.assertEqual(window['queries_per_request'], 20)
+        self.assertEqual(window['avg_query_time'], 0.1)
+        self.assertEqual(window['slow_requests'], 1)
+        self.assertEqual(window['peak_concurrent'], 1)
+
+        with patch('odoo.addons.acmst_admission.models.acmst_live_metrics.time.time', return_value=1100.0):
+            self.assertEqual(collector.window(60)['requests'], 0)
+            self.assertEqual(collector.window(300)['requests'], 2)
+
+    def test_live_metrics_are_real(self):
+        """Process and database metrics come from the running system"""
+        metrics = self.env['acmst.live.metrics'].get_live_metrics()
+        self.assertGreater(metrics['process']['rss_mb'], 0)
+        self.assertGreaterEqual(metrics['database']['connections'], 1)
+        self.assertIn('1m', metrics['windows'])
+        self.assertIn('average_time', metrics['query_performance'])
+        self.assertIn('slow_requests', metrics['query_performance'])
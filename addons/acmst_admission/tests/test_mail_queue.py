@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestMailQueue(AdmissionTestCommon, TransactionCase):
+    """Test cases for the queued admission mail delivery"""
+
+    national_id_base = 1234567600
+
+    def setUp(self):
+        super().setUp()
+        self._setup_mail_delivery()
+        self.queue = self.env['acmst.mail.queue']
+
+    def _send_queued_mail(self):
+        with self._deliver_mail():
+            return self.queue._cron_send_queued_mail(auto_commit=False)
+
+    def test_enqueue_does_not_connect(self):
+        """Queueing renders the mails without talking to SMTP"""
+        admission_files = self._create_file(1) | self._create_file(2)
+        mails = self.queue.enqueue(self.template, admission_files.ids)
+        self.assertEqual(len(mails), 2)
+        self.assertEqual(set(mails.mapped('state')), {'outgoing'})
+        self.assertEqual(self.smtp_server.connections, 0)
+
+    def test_worker_sends_batch_over_one_connection(self):
+        """The worker cron delivers the whole batch over one SMTP session"""
+        admission_files = self._create_file(1) | self._create_file(2) | self._create_file(3)
+        mails = self.queue.enqueue(self.template, admission_files.ids)
+
+        self.assertEqual(self._send_queued_mail(), 3)
+
+        self.assertEqual(set(mails.mapped('state')), {'sent'})
+        self.assertEqual(len(self.smtp_server.messages), 3)
+        self.assertEqual(self.smtp_server.connections, 1)
+
+    def test_safe_send_mail_queues(self):
+        """Admission file notifications are queued instead of sent inline"""
+        admission_file = self._create_file(1)
+        self.env['ir.model.data'].create({
+            'module': 'acmst_admission',
+            'name': 'test_queued_template',
+            'model': 'mail.template',
+            'res_id': self.template.id,
+        })
+        self.assertTrue(admission_file._safe_send_mail('acmst_admission.test_queued_template'))
+        self.assertEqual(self.smtp_server.connections, 0)
+        self.assertTrue(self.env['mail.mail'].search([
+            ('model', '=', 'acmst.admission.file'),
+            ('res_id', '=', admission_file.id),
+            ('state', '=', 'outgoing'),
+        ]))
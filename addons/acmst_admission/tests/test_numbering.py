@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.models.acmst_numbering import NUMBER_POOL, NumberPool
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestNumbering(TransactionCase):
+    """Test cases for the block reserving numbering service"""
+
+    def setUp(self):
+        super().setUp()
+        self.sequence = self.env['ir.sequence'].create({
+            'name': 'Test Numbering',
+            'code': 'acmst.test.numbering',
+            'prefix': 'TST',
+            'padding': 4,
+            'implementation': 'standard',
+        })
+        self.env['ir.config_parameter'].sudo().set_param('acmst_admission.numbering_block_size', 5)
+        self.numbering = self.env['acmst.numbering']
+
+    def test_numbers_from_block(self):
+        """Numbers are formatted and drawn from one reserved block"""
+        before = NUMBER_POOL.get_metrics()
+        numbers = [self.numbering._next_number('acmst.test.numbering') for __ in range(7)]
+        after = NUMBER_POOL.get_metrics()
+
+        self.assertEqual(len(set(numbers)), 7)
+        self.assertTrue(all(number.startswith('TST') and len(number) == 7 for number in numbers))
+        self.assertEqual(numbers, sorted(numbers))
+        # Seven numbers with blocks of five need two reservations
+        self.assertEqual(after['blocks_reserved'] - before['blocks_reserved'], 2)
+        self.assertEqual(after['numbers_issued'] - before['numbers_issued'], 7)
+
+    def test_unknown_code(self):
+        """Unknown sequence codes give no number"""
+        self.assertFalse(self.numbering._next_number('acmst.test.unknown'))
+
+    def test_released_numbers_are_reused(self):
+        """Numbers of rolled back records come back first"""
+        pool = NumberPool()
+        pool.add_block('key', [1, 2, 3], 0.0)
+        self.assertEqual(pool.take('key'), 1)
+        self.assertEqual(pool.take('key'), 2)
+        pool.release('key', 2)
+        self.assertEqual(pool.take('key'), 2)
+        self.assertEqual(pool.take('key'), 3)
+        self.assertIsNone(pool.take('key'))
+        self.assertEqual(pool.get_metrics()['numbers_released'], 1)
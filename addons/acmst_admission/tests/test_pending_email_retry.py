@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase, new_test_user
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestPendingEmailRetry(AdmissionTestCommon, TransactionCase):
+    """Test cases for the batched pending email retry engine"""
+
+    national_id_base = 1234567700
+
+    def setUp(self):
+        super().setUp()
+        self._setup_mail_delivery()
+        self.env['ir.model.data'].create({
+            'module': 'acmst_admission',
+            'name': 'test_retry_template',
+            'model': 'mail.template',
+            'res_id': self.template.id,
+        })
+        self.PendingEmail = self.env['acmst.pending.email']
+
+    def _create_pending(self, admission_file, **vals):
+        values = {
+            'template_ref': 'acmst_admission.test_retry_template',
+            'record_id': admission_file.id,
+            'model_name': 'acmst.admission.file',
+            'record_name': admission_file.name,
+        }
+        values.update(vals)
+        pending_email = self.PendingEmail.create(values)
+        pending_email.flush_recordset()
+        self.env.cr.execute(
+            "UPDATE acmst_pending_email SET next_retry_date = now() at time zone 'UTC' - interval '1 minute' WHERE id = %s",
+            [pending_email.id],
+        )
+        pending_email.invalidate_recordset(['next_retry_date'])
+        return pending_email
+
+    def _run_cron(self, **kwargs):
+        with self._deliver_mail():
+            self.PendingEmail.cron_retry_pending_emails(auto_commit=False, **kwargs)
+
+    def test_batch_sent_over_one_connection(self):
+        """Due pending emails are rendered together and sent over one session"""
+        pending_emails = self.PendingEmail
+        for index in range(4):
+            pending_emails |= self._create_pending(self._create_file(index))
+        self.assertEqual(self.PendingEmail.search_count([('ready_for_retry', '=', True)]), 4)
+
+        self._run_cron()
+
+        self.assertEqual(set(pending_emails.mapped('state')), {'sent'})
+        self.assertEqual(set(pending_emails.mapped('retry_count')), {1})
+        self.assertEqual(len(self.smtp_server.messages), 4)
+        self.assertEqual(self.smtp_server.connections, 1)
+
+    def test_missing_record_backs_off(self):
+        """A failed attempt is counted and rescheduled with backoff"""
+        admission_file = self._create_file(1)
+        pending_email = self._create_pending(admission_file, record_id=admission_file.id + 100000)
+
+        self._run_cron()
+
+        self.assertEqual(pending_email.state, 'pending')
+        self.assertEqual(pending_email.retry_count, 1)
+        self.assertEqual(pending_email.error_message, 'Record not found')
+        self.assertGreater(pending_email.next_retry_date, pending_email.last_attempt_date)
+        self.assertFalse(pending_email.ready_for_retry)
+
+    def test_work_capped_per_run(self):
+        """A cron run handles at most ``limit`` pending emails"""
+        for index in range(3):
+            self._create_pending(self._create_file(index))
+
+        self._run_cron(limit=2)
+
+        self.assertEqual(self.PendingEmail.search_count([('state', '=', 'sent')]), 2)
+        self.assertEqual(len(self.smtp_server.messages), 2)
+
+    def test_retry_by_officer(self):
+        """Officers retry pending emails without reading the mail servers themselves"""
+        officer = new_test_user(self.env, login='acmst_retry_officer', groups='base.group_user,acmst_admission.group_officer')
+        admission_file = self._create_file(2)
+        pending_email = self._create_pending(admission_file, record_id=admission_file.id + 100000)
+
+        pending_email.with_user(officer).action_retry_send()
+
+        self.assertEqual(pending_email.retry_count, 1)
+        self.assertEqual(pending_email.error_message, 'Record not found')
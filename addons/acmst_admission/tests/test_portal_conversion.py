@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestPortalConversion(AdmissionTestCommon, TransactionCase):
+    """Test cases for the bulk conversion of portal applications to admission files"""
+
+    national_id_base = 1234568300
+
+    def setUp(self):
+        super().setUp()
+        self.Guardian = self.env['acmst.guardian']
+
+    def _create_guardians(self, application, count):
+        return self.Guardian.create([{
+            'name': f'Guardian {index}',
+            'relationship': 'father',
+            'phone': '0912345670',
+            'portal_application_id': application.id,
+        } for index in range(count)])
+
+    def test_bulk_conversion(self):
+        """Approved applications get their admission files, guardians and approvals in one call"""
+        applications = self.env['acmst.portal.application']
+        for index in range(4):
+            applications |= self._create_application(index, state='approved')
+        for application in applications:
+            self._create_guardians(application, 2)
+
+        result = applications.convert_to_admission_files()
+
+        self.assertEqual(sorted(result['converted']), sorted(applications.ids))
+        self.assertFalse(result['errors'])
+        self.assertEqual(set(applications.mapped('state')), {'admission_created'})
+        for application in applications:
+            admission_file = application.admission_file_id
+            self.assertTrue(admission_file)
+            self.assertEqual(admission_file.name, application.name)
+            self.assertEqual(admission_file.national_id, application.national_id)
+            self.assertEqual(admission_file.state, 'ministry_pending')
+            self.assertEqual(len(admission_file.guardian_ids), 2)
+            self.assertEqual(len(admission_file.guardian_ids.filtered('is_default')), 1)
+            self.assertTrue(self.env['acmst.admission.approval'].search([
+                ('admission_file_id', '=', admission_file.id),
+                ('approval_type', '=', 'ministry'),
+            ]))
+            link_log = self.env['acmst.audit.log'].get_audit_trail(application._name, application.id).filtered(
+                lambda log: log.diff and 'admission_file_id' in log.diff)
+            self.assertEqual(link_log.diff['admission_file_id']['new'], admission_file.id)
+        self.assertEqual(sorted(result['admission_file_ids']), sorted(applications.admission_file_id.ids))
+
+    def test_bulk_conversion_reports_errors(self):
+        """Applications that cannot be converted are reported without blocking the others"""
+        approved = self._create_application(1, state='approved')
+        draft = self._create_application(2)
+
+        result = (approved | draft).convert_to_admission_files()
+
+        self.assertEqual(result['converted'], approved.ids)
+        self.assertEqual([error['id'] for error in result['errors']], draft.ids)
+        self.assertTrue(approved.admission_file_id)
+        self.assertFalse(draft.admission_file_id)
+        self.assertEqual(draft.state, 'draft')
+
+    def test_single_conversion_refreshes_existing_file(self):
+        """Converting again updates the existing admission file instead of creating another one"""
+        application = self._create_application(1, state='approved')
+        application.action_create_admission_file()
+        admission_file = application.admission_file_id
+
+        application.write({'state': 'approved', 'phone': '0999999999'})
+        application.action_create_admission_file()
+
+        self.assertEqual(application.admission_file_id, admission_file)
+        self.assertEqual(admission_file.phone, '0999999999')
+
+    def test_guardian_batch_defaults(self):
+        """A batch of guardians gets one default per parent"""
+        first = self._create_application(1)
+        second = self._create_application(2)
+        self._create_guardians(first, 1)
+        guardians = self.Guardian.create([
+            {'name': 'A', 'relationship': 'father', 'phone': '0912345670', 'portal_application_id': first.id},
+            {'name': 'B', 'relationship': 'mother', 'phone': '0912345670', 'portal_application_id': second.id},
+            {'name': 'C', 'relationship': 'uncle', 'phone': '0912345670', 'portal_application_id': second.id},
+        ])
+        self.assertEqual(len(first.guardian_ids.filtered('is_default')), 1)
+        self.assertFalse(guardians[0].is_default)
+        self.assertTrue(guardians[1].is_default)
+        self.assertFalse(guardians[2].is_default)
+
+        new_default = self.Guardian.create({
+            'name': 'D', 'relationship': 'aunt', 'phone': '0912345670',
+            'portal_application_id': second.id, 'is_default': True,
+        })
+        self.assertEqual(second.guardian_ids.filtered('is_default'), new_default)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import HttpCase, new_test_user
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestPortalHome(AdmissionTestCommon, HttpCase):
+    """Test cases for the portal home application counters"""
+
+    national_id_base = 1234568100
+
+    def setUp(self):
+        super().setUp()
+        self.applicant = new_test_user(
+            self.env, login='applicant', groups='base.group_portal,acmst_admission.group_portal'
+        )
+
+    def _get_application_vals(self, index, **vals):
+        return super()._get_application_vals(index, **dict({'portal_user_id': self.applicant.id}, **vals))
+
+    def test_requested_counters(self):
+        """Only requested counters are returned, counted per state"""
+        self._create_application(1)
+        self._create_application(2, state='submitted')
+        self._create_application(3, state='under_review')
+        self._create_application(4, state='approved')
+        self.authenticate('applicant', 'applicant')
+
+        counters = self.make_jsonrpc_request('/my/counters', {
+            'counters': ['application_count', 'pending_count', 'approved_count'],
+        })
+        self.assertEqual(counters['application_count'], 4)
+        self.assertEqual(counters['pending_count'], 2)
+        self.assertEqual(counters['approved_count'], 1)
+        self.assertNotIn('rejected_count', counters)
+
+        counters = self.make_jsonrpc_request('/my/counters', {'counters': ['rejected_count']})
+        self.assertEqual(counters, {'rejected_count': 0})
@@ -2,608 +2,111 @@
 # Copyright 2024 ACMST College
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo.tests.common import TransactionCase
-from odoo.exceptions import ValidationError, UserError, AccessError
-from datetime import datetime, date, timedelta
+from odoo.tests.common import TransactionCase, new_test_user
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+from odoo.exceptions import AccessError
 import logging
 
 _logger = logging.getLogger(__name__)
 
 
-class TestSecurity(TransactionCase):
-    """Test cases for admission security"""
+class TestSecurity(AdmissionTestCommon, TransactionCase):
+    """Test cases for the access rights and record rules of the admission groups"""
+
+    national_id_base = 1234571000
 
     def setUp(self):
         super().setUp()
-        
-        # Create test data
-        self.program = self.env['acmst.program'].create({
-            'name': 'Test Program',
-            'code': 'TEST001',
-            'description': 'Test program for testing'
-        })
-        
-        self.batch = self.env['acmst.batch'].create({
-            'name': 'Test Batch 2024',
-            'code': 'BATCH2024',
-            'academic_year_id': self.env.ref('base.main_company').id
-        })
-        
-        # Create test users with different roles
-        self.admin_user = self.env['res.users'].create({
-            'name': 'Admin User',
-            'login': 'admin_user',
-            'email': 'admin@example.com',
-            'groups_id': [(6, 0, [self.env.ref('acmst_admission.group_admin').id])]
-        })
-        
-        self.manager_user = self.env['res.users'].create({
-            'name': 'Manager User',
-            'login': 'manager_user',
-            'email': 'manager@example.com',
-            'groups_id': [(6, 0, [self.env.ref('acmst_admission.group_manager').id])]
-        })
-        
-        self.coordinator_user = self.env['res.users'].create({
-            'name': 'Coordinator User',
-            'login': 'coordinator_user',
-            'email': 'coordinator@example.com',
-            'groups_id': [(6, 0, [self.env.ref('acmst_admission.group_coordinator').id])]
-        })
-        
-        self.health_user = self.env['res.users'].create({
-            'name': 'Health User',
-            'login': 'health_user',
-            'email': 'health@example.com',
-            'groups_id': [(6, 0, [self.env.ref('acmst_admission.group_health').id])]
-        })
-        
-        self.officer_user = self.env['res.users'].create({
-            'name': 'Officer User',
-            'login': 'officer_user',
-            'email': 'officer@example.com',
-            'groups_id': [(6, 0, [self.env.ref('acmst_admission.group_officer').id])]
-        })
-        
-        self.portal_user = self.env['res.users'].create({
-            'name': 'Portal User',
-            'login': 'portal_user',
-            'email': 'portal@example.com',
-            'groups_id': [(6, 0, [self.env.ref('acmst_admission.group_portal').id])]
-        })
-        
-        self.admission_file = self.env['acmst.admission.file'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568'
-        })
+        self.admin_user = self._create_user('admin')
+        self.manager_user = self._create_user('manager')
+        self.coordinator_user = self._create_user('coordinator')
+        self.health_user = self._create_user('health')
+        self.officer_user = self._create_user('officer')
+        self.audit_viewer_user = self._create_user('audit_viewer')
+        self.portal_user = new_test_user(
+            self.env, login='acmst_security_portal', groups='base.group_portal,acmst_admission.group_portal')
+
+        self.new_file = self._create_file(0)
+        self.health_file = self._create_file(1, state='health_required')
+        self.coordinator_file = self._create_file(2, state='coordinator_review')
+
+    def _create_user(self, group):
+        return new_test_user(
+            self.env, login=f'acmst_security_{group}', groups=f'base.group_user,acmst_admission.group_{group}')
+
+    def _can(self, user, model, operation):
+        return self.env[model].with_user(user).check_access_rights(operation, raise_exception=False)
 
     def test_admin_user_access(self):
-        """Test admin user access to all models"""
-        # Test admin user can access admission file
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.admin_user)
-            admission_file = self.env['acmst.admission.file'].browse(self.admission_file.id)
-            self.assertTrue(admission_file.exists())
-            
-            # Test admin user can read
-            admission_file.read(['name', 'state'])
-            
-            # Test admin user can write
-            admission_file.write({'notes': 'Admin updated'})
-            
-            # Test admin user can create
-            new_file = self.env['acmst.admission.file'].create({
-                'applicant_name': 'Jane Doe',
-                'national_id': '0987654321',
-                'phone': '+966501234568',
-                'email': 'jane.doe@example.com',
-                'program_id': self.program.id,
-                'batch_id': self.batch.id,
-                'birth_date': '1992-01-01',
-                'gender': 'female',
-                'nationality': 'Saudi',
-                'address': '456 Test Street, Riyadh',
-                'emergency_contact': 'John Doe',
-                'emergency_phone': '+966501234567'
-            })
-            self.assertTrue(new_file.exists())
-            
-            # Test admin user can unlink
-            new_file.unlink()
+        """Test admin users have full access to admission files"""
+        for operation in ('read', 'write', 'create', 'unlink'):
+            self.assertTrue(self._can(self.admin_user, 'acmst.admission.file', operation))
+        files = self.new_file | self.health_file | self.coordinator_file
+        files.with_user(self.admin_user).check_access_rule('write')
 
     def test_manager_user_access(self):
-        """Test manager user access to models"""
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.manager_user)
-            admission_file = self.env['acmst.admission.file'].browse(self.admission_file.id)
-            self.assertTrue(admission_file.exists())
-            
-            # Test manager user can read
-            admission_file.read(['name', 'state'])
-            
-            # Test manager user can write
-            admission_file.write({'notes': 'Manager updated'})
-            
-            # Test manager user can create
-            new_file = self.env['acmst.admission.file'].create({
-                'applicant_name': 'Jane Doe',
-                'national_id': '0987654321',
-                'phone': '+966501234568',
-                'email': 'jane.doe@example.com',
-                'program_id': self.program.id,
-                'batch_id': self.batch.id,
-                'birth_date': '1992-01-01',
-                'gender': 'female',
-                'nationality': 'Saudi',
-                'address': '456 Test Street, Riyadh',
-                'emergency_contact': 'John Doe',
-                'emergency_phone': '+966501234567'
-            })
-            self.assertTrue(new_file.exists())
-            
-            # Test manager user cannot unlink
-            with self.assertRaises(AccessError):
-                new_file.unlink()
+        """Test managers cannot delete admission files nor edit health checks"""
+        self.assertTrue(self._can(self.manager_user, 'acmst.admission.file', 'write'))
+        self.assertFalse(self._can(self.manager_user, 'acmst.admission.file', 'unlink'))
+        self.assertTrue(self._can(self.manager_user, 'acmst.health.check', 'read'))
+        self.assertFalse(self._can(self.manager_user, 'acmst.health.check', 'write'))
 
     def test_coordinator_user_access(self):
-        """Test coordinator user access to models"""
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.coordinator_user)
-            admission_file = self.env['acmst.admission.file'].browse(self.admission_file.id)
-            self.assertTrue(admission_file.exists())
-            
-            # Test coordinator user can read
-            admission_file.read(['name', 'state'])
-            
-            # Test coordinator user can write
-            admission_file.write({'notes': 'Coordinator updated'})
-            
-            # Test coordinator user cannot create
-            with self.assertRaises(AccessError):
-                self.env['acmst.admission.file'].create({
-                    'applicant_name': 'Jane Doe',
-                    'national_id': '0987654321',
-                    'phone': '+966501234568',
-                    'email': 'jane.doe@example.com',
-                    'program_id': self.program.id,
-                    'batch_id': self.batch.id,
-                    'birth_date': '1992-01-01',
-                    'gender': 'female',
-                    'nationality': 'Saudi',
-                    'address': '456 Test Street, Riyadh',
-                    'emergency_contact': 'John Doe',
-                    'emergency_phone': '+966501234567'
-                })
-            
-            # Test coordinator user cannot unlink
-            with self.assertRaises(AccessError):
-                admission_file.unlink()
+        """Test coordinators only see the files under coordinator review or assigned to them"""
+        self.assertFalse(self._can(self.coordinator_user, 'acmst.admission.file', 'create'))
 
-    def test_health_user_access(self):
-        """Test health user access to models"""
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.health_user)
-            admission_file = self.env['acmst.admission.file'].browse(self.admission_file.id)
-            self.assertTrue(admission_file.exists())
-            
-            # Test health user can read
-            admission_file.read(['name', 'state'])
-            
-            # Test health user cannot write
-            with self.assertRaises(AccessError):
-                admission_file.write({'notes': 'Health updated'})
-            
-            # Test health user cannot create
-            with self.assertRaises(AccessError):
-                self.env['acmst.admission.file'].create({
-                    'applicant_name': 'Jane Doe',
-                    'national_id': '0987654321',
-                    'phone': '+966501234568',
-                    'email': 'jane.doe@example.com',
-                    'program_id': self.program.id,
-                    'batch_id': self.batch.id,
-                    'birth_date': '1992-01-01',
-                    'gender': 'female',
-                    'nationality': 'Saudi',
-                    'address': '456 Test Street, Riyadh',
-                    'emergency_contact': 'John Doe',
-                    'emergency_phone': '+966501234567'
-                })
-            
-            # Test health user cannot unlink
-            with self.assertRaises(AccessError):
-                admission_file.unlink()
+        self.coordinator_file.with_user(self.coordinator_user).check_access_rule('write')
+        with self.assertRaises(AccessError):
+            self.new_file.with_user(self.coordinator_user).check_access_rule('read')
 
-    def test_officer_user_access(self):
-        """Test officer user access to models"""
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.officer_user)
-            admission_file = self.env['acmst.admission.file'].browse(self.admission_file.id)
-            self.assertTrue(admission_file.exists())
-            
-            # Test officer user can read
-            admission_file.read(['name', 'state'])
-            
-            # Test officer user can write
-            admission_file.write({'notes': 'Officer updated'})
-            
-            # Test officer user can create
-            new_file = self.env['acmst.admission.file'].create({
-                'applicant_name': 'Jane Doe',
-                'national_id': '0987654321',
-                'phone': '+966501234568',
-                'email': 'jane.doe@example.com',
-                'program_id': self.program.id,
-                'batch_id': self.batch.id,
-                'birth_date': '1992-01-01',
-                'gender': 'female',
-                'nationality': 'Saudi',
-                'address': '456 Test Street, Riyadh',
-                'emergency_contact': 'John Doe',
-                'emergency_phone': '+966501234567'
-            })
-            self.assertTrue(new_file.exists())
-            
-            # Test officer user cannot unlink
-            with self.assertRaises(AccessError):
-                new_file.unlink()
+        self.new_file.coordinator_id = self.coordinator_user
+        self.new_file.with_user(self.coordinator_user).check_access_rule('read')
 
-    def test_portal_user_access(self):
-        """Test portal user access to models"""
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.portal_user)
-            admission_file = self.env['acmst.admission.file'].browse(self.admission_file.id)
-            self.assertTrue(admission_file.exists())
-            
-            # Test portal user can read
-            admission_file.read(['name', 'state'])
-            
-            # Test portal user cannot write
-            with self.assertRaises(AccessError):
-                admission_file.write({'notes': 'Portal updated'})
-            
-            # Test portal user cannot create
-            with self.assertRaises(AccessError):
-                self.env['acmst.admission.file'].create({
-                    'applicant_name': 'Jane Doe',
-                    'national_id': '0987654321',
-                    'phone': '+966501234568',
-                    'email': 'jane.doe@example.com',
-                    'program_id': self.program.id,
-                    'batch_id': self.batch.id,
-                    'birth_date': '1992-01-01',
-                    'gender': 'female',
-                    'nationality': 'Saudi',
-                    'address': '456 Test Street, Riyadh',
-                    'emergency_contact': 'John Doe',
-                    'emergency_phone': '+966501234567'
-                })
-            
-            # Test portal user cannot unlink
-            with self.assertRaises(AccessError):
-                admission_file.unlink()
+    def test_health_user_access(self):
+        """Test health officers only read the files requiring a health check"""
+        self.assertFalse(self._can(self.health_user, 'acmst.admission.file', 'write'))
+        self.assertTrue(self._can(self.health_user, 'acmst.health.check', 'write'))
 
-    def test_health_check_security(self):
-        """Test health check security"""
-        # Create health check
-        health_check = self.env['acmst.health.check'].create({
-            'admission_file_id': self.admission_file.id,
-            'examiner_id': self.admin_user.id,
-            'height': 175.0,
-            'weight': 70.0,
-            'medical_fitness': 'fit'
-        })
-        
-        # Test admin user access
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.admin_user)
-            health_check = self.env['acmst.health.check'].browse(health_check.id)
-            self.assertTrue(health_check.exists())
-            health_check.read(['name', 'state'])
-            health_check.write({'notes': 'Admin updated'})
-            health_check.unlink()
+        self.health_file.with_user(self.health_user).check_access_rule('read')
+        with self.assertRaises(AccessError):
+            self.new_file.with_user(self.health_user).check_access_rule('read')
 
-    def test_coordinator_condition_security(self):
-        """Test coordinator condition security"""
-        # Create coordinator condition
-        condition = self.env['acmst.coordinator.condition'].create({
-            'admission_file_id': self.admission_file.id,
-            'coordinator_id': self.coordinator_user.id,
-            'subject_name': 'Mathematics',
-            'subject_code': 'MATH101',
-            'level': 'bachelor',
-            'description': 'Complete mathematics prerequisite',
-            'deadline': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
-            'notes': 'Must be completed before enrollment'
-        })
-        
-        # Test coordinator user access
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.coordinator_user)
-            condition = self.env['acmst.coordinator.condition'].browse(condition.id)
-            self.assertTrue(condition.exists())
-            condition.read(['name', 'state'])
-            condition.write({'notes': 'Coordinator updated'})
-            condition.unlink()
+        visible = self.env['acmst.admission.file'].with_user(self.health_user).search([
+            ('id', 'in', (self.new_file | self.health_file | self.coordinator_file).ids)])
+        self.assertEqual(visible, self.health_file)
 
-    def test_admission_approval_security(self):
-        """Test admission approval security"""
-        # Create admission approval
-        approval = self.env['acmst.admission.approval'].create({
-            'admission_file_id': self.admission_file.id,
-            'approver_id': self.manager_user.id,
-            'approval_type': 'ministry',
-            'approval_date': fields.Datetime.now(),
-            'decision': 'approved',
-            'comments': 'Application approved by ministry'
-        })
-        
-        # Test manager user access
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.manager_user)
-            approval = self.env['acmst.admission.approval'].browse(approval.id)
-            self.assertTrue(approval.exists())
-            approval.read(['name', 'state'])
-            approval.write({'comments': 'Manager updated'})
-            # Manager cannot unlink
-            with self.assertRaises(AccessError):
-                approval.unlink()
+    def test_officer_user_access(self):
+        """Test officers process files but cannot delete them"""
+        self.assertTrue(self._can(self.officer_user, 'acmst.admission.file', 'create'))
+        self.assertFalse(self._can(self.officer_user, 'acmst.admission.file', 'unlink'))
+        self.assertTrue(self._can(self.officer_user, 'acmst.portal.application', 'write'))
+        self.assertFalse(self._can(self.officer_user, 'acmst.health.check', 'read'))
+
+    def test_portal_user_access(self):
+        """Test portal users only see their own applications"""
+        self.assertFalse(self._can(self.portal_user, 'acmst.admission.file', 'write'))
 
-    def test_portal_application_security(self):
-        """Test portal application security"""
-        # Create portal application
-        application = self.env['acmst.portal.application'].create({
-            'applicant_name': 'John Doe',
-            'national_id': '1234567890',
-            'phone': '+966501234567',
-            'email': 'john.doe@example.com',
-            'program_id': self.program.id,
-            'batch_id': self.batch.id,
-            'birth_date': '1990-01-01',
-            'gender': 'male',
-            'nationality': 'Saudi',
-            'address': '123 Test Street, Riyadh',
-            'emergency_contact': 'Jane Doe',
-            'emergency_phone': '+966501234568'
-        })
-        
-        # Test portal user access
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.portal_user)
-            application = self.env['acmst.portal.application'].browse(application.id)
-            self.assertTrue(application.exists())
-            application.read(['name', 'state'])
-            # Portal user cannot write
-            with self.assertRaises(AccessError):
-                application.write({'notes': 'Portal updated'})
-            # Portal user cannot create
-            with self.assertRaises(AccessError):
-                self.env['acmst.portal.application'].create({
-                    'applicant_name': 'Jane Doe',
-                    'national_id': '0987654321',
-                    'phone': '+966501234568',
-                    'email': 'jane.doe@example.com',
-                    'program_id': self.program.id,
-                    'batch_id': self.batch.id,
-                    'birth_date': '1992-01-01',
-                    'gender': 'female',
-                    'nationality': 'Saudi',
-                    'address': '456 Test Street, Riyadh',
-                    'emergency_contact': 'John Doe',
-                    'emergency_phone': '+966501234567'
-                })
-            # Portal user cannot unlink
-            with self.assertRaises(AccessError):
-                application.unlink()
+        own = self._create_application(3, portal_user_id=self.portal_user.id)
+        other = self._create_application(4)
+        applications = self.env['acmst.portal.application'].with_user(self.portal_user).search([
+            ('id', 'in', (own | other).ids)])
+        self.assertEqual(applications, own)
+        with self.assertRaises(AccessError):
+            other.with_user(self.portal_user).check_access_rule('write')
 
     def test_workflow_engine_security(self):
-        """Test workflow engine security"""
-        # Create workflow engine
-        workflow = self.env['acmst.workflow.engine'].create({
-            'name': 'Test Workflow',
-            'model_id': self.env['ir.model']._get('acmst.admission.file').id,
-            'description': 'Test workflow for admission files'
-        })
-        
-        # Test admin user access
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.admin_user)
-            workflow = self.env['acmst.workflow.engine'].browse(workflow.id)
-            self.assertTrue(workflow.exists())
-            workflow.read(['name', 'state'])
-            workflow.write({'description': 'Admin updated'})
-            workflow.unlink()
+        """Test only workflow administrators manage the workflow engines"""
+        workflow_admin = self._create_user('workflow_admin')
+        self.assertTrue(self._can(workflow_admin, 'acmst.workflow.engine', 'write'))
+        self.assertTrue(self._can(workflow_admin, 'acmst.workflow.rule', 'create'))
+        self.assertFalse(self._can(self.officer_user, 'acmst.workflow.engine', 'read'))
+        self.assertFalse(self._can(self.manager_user, 'acmst.workflow.rule', 'write'))
 
     def test_audit_log_security(self):
-        """Test audit log security"""
-        # Create audit log
-        audit_log = self.env['acmst.audit.log'].create({
-            'name': 'Test Action',
-            'res_model_id': self.env['ir.model']._get('acmst.admission.file').id,
-            'res_id': self.admission_file.id,
-            'user_id': self.admin_user.id,
-            'action_type': 'create',
-            'description': 'Test audit log entry'
-        })
-        
-        # Test admin user access
-        with self.env.do_in_onchange():
-            self.env = self.env(user=self.admin_user)
-            audit_log = self.env['acmst.audit.log'].browse(audit_log.id)
-            self.assertTrue(audit_log.exists())
-            audit_log.read(['name', 'state'])
-            audit_log.write({'description': 'Admin updated'})
-            audit_log.unlink()
-
-    def test_security_groups_creation(self):
-        """Test security groups creation"""
-        # Test admin group exists
-        admin_group = self.env.ref('acmst_admission.group_admin')
-        self.assertTrue(admin_group.exists())
-        
-        # Test manager group exists
-        manager_group = self.env.ref('acmst_admission.group_manager')
-        self.assertTrue(manager_group.exists())
-        
-        # Test coordinator group exists
-        coordinator_group = self.env.ref('acmst_admission.group_coordinator')
-        self.assertTrue(coordinator_group.exists())
-        
-        # Test health group exists
-        health_group = self.env.ref('acmst_admission.group_health')
-        self.assertTrue(health_group.exists())
-        
-        # Test officer group exists
-        officer_group = self.env.ref('acmst_admission.group_officer')
-        self.assertTrue(officer_group.exists())
-        
-        # Test portal group exists
-        portal_group = self.env.ref('acmst_admission.group_portal')
-        self.assertTrue(portal_group.exists())
-
-    def test_security_groups_hierarchy(self):
-        """Test security groups hierarchy"""
-        # Test admin group has all permissions
-        admin_group = self.env.ref('acmst_admission.group_admin')
-        self.assertTrue(admin_group.exists())
-        
-        # Test manager group has limited permissions
-        manager_group = self.env.ref('acmst_admission.group_manager')
-        self.assertTrue(manager_group.exists())
-        
-        # Test coordinator group has limited permissions
-        coordinator_group = self.env.ref('acmst_admission.group_coordinator')
-        self.assertTrue(coordinator_group.exists())
-        
-        # Test health group has limited permissions
-        health_group = self.env.ref('acmst_admission.group_health')
-        self.assertTrue(health_group.exists())
-        
-        # Test officer group has limited permissions
-        officer_group = self.env.ref('acmst_admission.group_officer')
-        self.assertTrue(officer_group.exists())
-        
-        # Test portal group has read-only permissions
-        portal_group = self.env.ref('acmst_admission.group_portal')
-        self.assertTrue(portal_group.exists())
-
-    def test_security_record_rules(self):
-        """Test security record rules"""
-        # Test record rules are applied
-        # This would require more complex setup to test record-level security
-        # For now, we'll just verify the rules exist
-        record_rules = self.env['ir.rule'].search([
-            ('model_id.model', 'in', [
-                'acmst.admission.file',
-                'acmst.health.check',
-                'acmst.coordinator.condition',
-                'acmst.admission.approval',
-                'acmst.portal.application',
-                'acmst.workflow.engine',
-                'acmst.audit.log'
-            ])
-        ])
-        self.assertTrue(record_rules.exists())
-
-    def test_security_field_level_access(self):
-        """Test security field level access"""
-        # Test field-level security is applied
-        # This would require more complex setup to test field-level security
-        # For now, we'll just verify the fields exist
-        admission_file = self.env['acmst.admission.file'].browse(self.admission_file.id)
-        self.assertTrue(admission_file.exists())
-        
-        # Test basic field access
-        fields = ['name', 'state', 'applicant_name', 'national_id']
-        for field in fields:
-            self.assertTrue(hasattr(admission_file, field))
-
-    def test_security_workflow_permissions(self):
-        """Test security workflow permissions"""
-        # Test workflow permissions are applied
-        # This would require more complex setup to test workflow permissions
-        # For now, we'll just verify the workflow exists
-        workflow = self.env['acmst.workflow.engine'].search([])
-        self.assertTrue(workflow.exists() or True)  # Allow empty for now
-
-    def test_security_audit_logging(self):
-        """Test security audit logging"""
-        # Test audit logging is working
-        # This would require more complex setup to test audit logging
-        # For now, we'll just verify the audit log model exists
-        audit_log = self.env['acmst.audit.log']
-        self.assertTrue(audit_log.exists())
-
-    def test_security_validation(self):
-        """Test security validation"""
-        # Test security validation is working
-        # This would require more complex setup to test security validation
-        # For now, we'll just verify the models exist
-        models = [
-            'acmst.admission.file',
-            'acmst.health.check',
-            'acmst.coordinator.condition',
-            'acmst.admission.approval',
-            'acmst.portal.application',
-            'acmst.workflow.engine',
-            'acmst.audit.log'
-        ]
-        
-        for model_name in models:
-            model = self.env[model_name]
-            self.assertTrue(model.exists())
-
-    def test_security_performance(self):
-        """Test security performance"""
-        # Test security performance is acceptable
-        # This would require more complex setup to test security performance
-        # For now, we'll just verify the models can be accessed quickly
-        start_time = datetime.now()
-        
-        models = [
-            'acmst.admission.file',
-            'acmst.health.check',
-            'acmst.coordinator.condition',
-            'acmst.admission.approval',
-            'acmst.portal.application',
-            'acmst.workflow.engine',
-            'acmst.audit.log'
-        ]
-        
-        for model_name in models:
-            model = self.env[model_name]
-            model.search([])
-        
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
-        
-        # Should complete within reasonable time (adjust threshold as needed)
-        self.assertLess(duration, 5.0)
-
-    def test_security_integration(self):
-        """Test security integration"""
-        # Test security integration is working
-        # This would require more complex setup to test security integration
-        # For now, we'll just verify the models can work together
-        admission_file = self.env['acmst.admission.file'].browse(self.admission_file.id)
-        self.assertTrue(admission_file.exists())
-        
-        # Test related models can be accessed
-        health_checks = admission_file.health_check_ids
-        conditions = admission_file.coordinator_conditions_ids
-        approvals = admission_file.approval_ids
-        
-        # These should not raise errors
-        self.assertTrue(health_checks.exists() or True)
-        self.assertTrue(conditions.exists() or True)
-        self.assertTrue(approvals.exists() or True)
+        """Test audit logs are read-only outside admission administrators"""
+        self.assertTrue(self._can(self.audit_viewer_user, 'acmst.audit.log', 'read'))
+        self.assertFalse(self._can(self.audit_viewer_user, 'acmst.audit.log', 'write'))
+        self.assertFalse(self._can(self.officer_user, 'acmst.audit.log', 'create'))
+        self.assertFalse(self._can(self.manager_user, 'acmst.audit.log', 'unlink'))
+        self.assertFalse(self._can(self.portal_user, 'acmst.audit.log', 'read'))
+        self.assertTrue(self._can(self.admin_user, 'acmst.audit.log', 'unlink'))
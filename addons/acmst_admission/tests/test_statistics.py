@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestStatistics(AdmissionTestCommon, TransactionCase):
+    """Test cases for the shared dashboard statistics service"""
+
+    national_id_base = 1234567000
+
+    def setUp(self):
+        super().setUp()
+        self.statistics = self.env['acmst.statistics']
+
+    def test_counts_match_search_count(self):
+        """Grouped counters match the equivalent search_count calls"""
+        self._create_file(1)
+        self._create_file(2, state='ministry_pending')
+        self._create_file(3, state='coordinator_review', coordinator_id=self.env.uid)
+        self._create_file(4, state='manager_approved', coordinator_id=self.env.uid, manager_id=self.env.uid)
+
+        AdmissionFile = self.env['acmst.admission.file']
+        stats = self.statistics.get_admission_file_statistics()
+        self.assertEqual(stats['total'], AdmissionFile.search_count([]))
+        self.assertEqual(stats['ministry_pending'], AdmissionFile.search_count([('state', '=', 'ministry_pending')]))
+        self.assertEqual(stats['coordinator_review'], AdmissionFile.search_count([('state', '=', 'coordinator_review')]))
+        self.assertEqual(stats['my_reviews'], AdmissionFile.search_count([('coordinator_id', '=', self.env.uid)]))
+        self.assertEqual(stats['my_manager_approvals'], AdmissionFile.search_count([
+            ('manager_id', '=', self.env.uid),
+            ('state', 'in', ['manager_approved', 'completed'])
+        ]))
+
+    def test_single_query_per_source(self):
+        """Dashboard computes share one grouped query per source"""
+        self._create_file(1)
+        self.env.flush_all()
+        self.statistics.invalidate_statistics()
+        dashboard = self.env['acmst.dashboard']
+        with self.assertQueryCount(__system__=2):
+            self.statistics.get_admission_file_statistics()
+            dashboard._compute_dashboard_statistics()
+            dashboard._compute_coordinator_statistics()
+
+    def test_invalidated_on_write(self):
+        """Cached counters are refreshed after admission files change"""
+        admission_file = self._create_file(1)
+        before = self.statistics.get_admission_file_statistics()
+        admission_file.write({'state': 'ministry_pending'})
+        after = self.statistics.get_admission_file_statistics()
+        self.assertEqual(after['ministry_pending'], before['ministry_pending'] + 1)
+        self.assertEqual(after['new'], before['new'] - 1)
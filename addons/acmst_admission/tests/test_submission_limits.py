@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase, HttpCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+from odoo.tools import mute_logger
+from psycopg2.errors import UniqueViolation
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestSubmissionLimits(AdmissionTestCommon, TransactionCase):
+    """Test cases for submission rate limiting and idempotency keys"""
+
+    national_id_base = 1234568200
+
+    def setUp(self):
+        super().setUp()
+        self.RateLimit = self.env['acmst.rate.limit']
+
+    def test_token_bucket(self):
+        """A bucket allows its capacity, then refuses until it refills"""
+        allowed = [self.RateLimit._consume('ip:192.0.2.1', capacity=3, refill_rate=0) for __ in range(5)]
+        self.assertEqual(allowed, [True, True, True, False, False])
+        # Buckets are independent per key
+        self.assertTrue(self.RateLimit._consume('ip:192.0.2.2', capacity=3, refill_rate=0))
+
+    def test_bucket_refill(self):
+        """Elapsed time refills the bucket up to its capacity"""
+        for __ in range(3):
+            self.RateLimit._consume('session:abc', capacity=3, refill_rate=0)
+        self.assertFalse(self.RateLimit._consume('session:abc', capacity=3, refill_rate=0))
+        self.env.cr.execute("""
+            UPDATE acmst_rate_limit SET last_refill = last_refill - interval '1 hour' WHERE key = 'session:abc'
+        """)
+        self.assertTrue(self.RateLimit._consume('session:abc', capacity=3, refill_rate=1))
+
+    def test_idempotency_key_unique(self):
+        """Two applications cannot share an idempotency key"""
+        self._create_application(1, idempotency_key='request-1')
+        self._create_application(2)
+        self._create_application(3)
+        with mute_logger('odoo.sql_db'), self.assertRaises(UniqueViolation), self.env.cr.savepoint():
+            self._create_application(4, idempotency_key='request-1')
+
+
+class TestSubmissionEndpoints(AdmissionTestCommon, HttpCase):
+    """Test cases for the rate limited and idempotent submission routes"""
+
+    national_id_base = 1234568250
+
+    def test_rate_limited_submission(self):
+        """A client with an empty bucket gets a 429 response with Retry-After"""
+        self.env.cr.execute("""
+            INSERT INTO acmst_rate_limit (key, tokens, last_refill)
+            VALUES ('ip:127.0.0.1', -1, now() AT TIME ZONE 'UTC')
+        """)
+        response = self.url_open('/admission/submit', data={'idempotency_key': 'limited-1'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '6')
+        self.assertFalse(response.json()['success'])
+
+    def test_idempotent_replay(self):
+        """A retried submission returns the application of the first request without creating another"""
+        application = self._create_application(1, idempotency_key='replay-1', portal_user_id=False)
+        for __ in range(2):
+            response = self.url_open('/admission/submit', data={}, headers={'Idempotency-Key': 'replay-1'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.text)['application_id'], application.id)
+        self.assertEqual(self.env['acmst.portal.application'].search_count([('idempotency_key', '=', 'replay-1')]), 1)
+        self.env.cr.execute("SELECT tokens FROM acmst_rate_limit WHERE key = 'ip:127.0.0.1'")
+        self.assertLess(self.env.cr.fetchone()[0], 10)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+from unittest.mock import patch
+import ast
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestWorkflowCondition(AdmissionTestCommon, TransactionCase):
+    """Test cases for compiled workflow rule conditions"""
+
+    national_id_base = 1234567500
+
+    def setUp(self):
+        super().setUp()
+        self.workflow = self.env['acmst.workflow.engine'].create({
+            'name': 'Condition Workflow',
+            'notification_enabled': False,
+        })
+        self.rule = self.env['acmst.workflow.rule'].create({
+            'name': 'New Files Only',
+            'workflow_id': self.workflow.id,
+            'from_state': 'new',
+            'to_state': 'ministry_pending',
+            'action_type': 'transition',
+            'condition_type': 'custom',
+            'condition_expression': "admission_file.state == 'new'",
+        })
+
+    def test_condition_compiled_once(self):
+        """Evaluating a rule over many files parses its expression once"""
+        admission_files = [self._create_file(index) for index in range(3)]
+        self.env.registry.clear_cache()
+        with patch('odoo.addons.acmst_admission.models.acmst_workflow_engine.ast.parse',
+                   wraps=ast.parse) as parse:
+            results = [self.rule.evaluate_conditions(admission_file) for admission_file in admission_files]
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(parse.call_count, 1)
+
+    def test_condition_recompiled_on_write(self):
+        """Changing the expression takes effect immediately"""
+        admission_file = self._create_file(1)
+        self.assertTrue(self.rule.evaluate_conditions(admission_file))
+        self.rule.write({'condition_expression': "admission_file.state == 'completed'"})
+        self.assertFalse(self.rule.evaluate_conditions(admission_file))
+
+    def test_unsafe_condition_rejected(self):
+        """Unsafe expressions never evaluate to true"""
+        admission_file = self._create_file(1)
+        self.rule.write({'condition_expression': "admission_file.unlink()"})
+        self.assertFalse(self.rule.evaluate_conditions(admission_file))
+
+    def test_rule_index(self):
+        """Rules are looked up by state and action type, by priority"""
+        timeout_rule = self.env['acmst.workflow.rule'].create({
+            'name': 'New Timeout',
+            'workflow_id': self.workflow.id,
+            'from_state': 'new',
+            'to_state': 'cancelled',
+            'action_type': 'timeout',
+            'priority': 1,
+        })
+        self.assertEqual(self.workflow._get_rules(from_state='new'), timeout_rule | self.rule)
+        self.assertEqual(self.workflow._get_rules(action_type='timeout'), timeout_rule)
+        self.assertEqual(self.workflow._get_rules(from_state='new', action_type='transition'), self.rule)
+        self.assertFalse(self.workflow._get_rules(from_state='completed'))
+
+        timeout_rule.active = False
+        self.assertEqual(self.workflow._get_rules(from_state='new'), self.rule)
+        self.rule.from_state = 'coordinator_review'
+        self.assertFalse(self.workflow._get_rules(from_state='new'))
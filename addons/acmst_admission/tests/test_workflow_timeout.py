@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+from odoo.addons.acmst_admission.tests.common import AdmissionTestCommon
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TestWorkflowTimeout(AdmissionTestCommon, TransactionCase):
+    """Test cases for set-based workflow timeout transitions"""
+
+    national_id_base = 1234567400
+
+    def setUp(self):
+        super().setUp()
+        self.workflow = self.env['acmst.workflow.engine'].create({
+            'name': 'Timeout Workflow',
+            'timeout_chunk_size': 2,
+            'notification_enabled': False,
+        })
+        self.rule = self.env['acmst.workflow.rule'].create({
+            'name': 'Ministry Timeout',
+            'workflow_id': self.workflow.id,
+            'from_state': 'ministry_pending',
+            'to_state': 'cancelled',
+            'action_type': 'timeout',
+            'timeout_hours': 24,
+        })
+
+    def _create_stale_files(self, count):
+        admission_files = self.env['acmst.admission.file']
+        for index in range(count):
+            admission_files |= self._create_file(index, state='ministry_pending')
+        admission_files.flush_recordset()
+        self.env.cr.execute(
+            "UPDATE acmst_admission_file SET write_date = now() at time zone 'UTC' - interval '48 hours' WHERE id IN %s",
+            [tuple(admission_files.ids)],
+        )
+        admission_files.invalidate_recordset(['write_date'])
+        return admission_files
+
+    def test_timeout_transitions_in_chunks(self):
+        """All stale files are transitioned, chunk by chunk"""
+        stale_files = self._create_stale_files(5)
+        recent_file = self._create_file(10, state='ministry_pending')
+
+        self.workflow.process_timeout_transitions(auto_commit=False)
+
+        self.assertEqual(set(stale_files.mapped('state')), {'cancelled'})
+        self.assertEqual(recent_file.state, 'ministry_pending')
+        self.assertFalse(self.rule.timeout_cutoff)
+        self.assertEqual(self.rule.timeout_last_file_id, 0)
+
+    def test_timeout_resumes_after_last_file(self):
+        """An interrupted run resumes after the recorded file"""
+        stale_files = self._create_stale_files(4)
+        self.rule.write({
+            'timeout_cutoff': self.env.cr.now(),
+            'timeout_last_file_id': stale_files[1].id,
+        })
+
+        count = self.rule._process_timeout_rule(chunk_size=2, notify=False)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(stale_files[:2].mapped('state'), ['ministry_pending', 'ministry_pending'])
+        self.assertEqual(stale_files[2:].mapped('state'), ['cancelled', 'cancelled'])
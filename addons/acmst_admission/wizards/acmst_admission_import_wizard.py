@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ACMST College
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError, UserError
+from datetime import date, datetime
+from itertools import islice
+import base64
+import csv
+import io
+import logging
+import time
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+_logger = logging.getLogger(__name__)
+
+# Rows validated and created together
+IMPORT_BATCH_SIZE = 500
+# Column names accepted for the program and batch, matched on their code or name
+IMPORT_REFERENCE_COLUMNS = {'program_id': ['program', 'program_code', 'program_id'],
+                            'batch_id': ['batch', 'batch_code', 'batch_id']}
+# Optional admission file columns imported when present
+IMPORT_OPTIONAL_FIELDS = ['place_of_birth', 'religion', 'education_institution', 'previous_education']
+# Selection fields accepting either their value or their label
+IMPORT_SELECTION_FIELDS = ['gender', 'nationality', 'id_type', 'admission_type', 'religion']
+# Errors listed in the wizard, the full list is returned by the API
+MAX_DISPLAYED_ERRORS = 1000
+
+
+def _normalize_header(header):
+    return str(header or '').strip().lower().replace(' ', '_')
+
+
+def _iter_csv_rows(stream):
+    """Yield ``(row_number, values)`` of a CSV file, one row at a time"""
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    headers = [_normalize_header(header) for header in next(reader, [])]
+    for row_number, row in enumerate(reader, start=2):
+        if any(cell.strip() for cell in row):
+            yield row_number, dict(zip(headers, row))
+
+
+def _iter_xlsx_rows(stream):
+    """Yield ``(row_number, values)`` of the first sheet of an XLSX file, one row at a time"""
+    if openpyxl is None:
+        raise UserError(_('Importing XLSX files requires the openpyxl library.'))
+    workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = [_normalize_header(header) for header in next(rows, [])]
+        for row_number, row in enumerate(rows, start=2):
+            if any(cell not in (None, '') for cell in row):
+                yield row_number, dict(zip(headers, row))
+    finally:
+        workbook.close()
+
+
+def _cell_to_str(value):
+    """Text of a CSV or XLSX cell; numbers keep no decimals so IDs and phones survive spreadsheets"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    return str(value).strip()
+
+
+class AcmstAdmissionImportWizard(models.TransientModel):
+    """Bulk import of admission files from a CSV or XLSX file.
+
+    Rows are read one at a time and handled in batches: every batch is
+    validated with one query per lookup (programs, batches, existing
+    national IDs) and created with a single ``create`` call, which writes
+    the audit logs, chatter messages and statistics of the batch together.
+    Invalid rows are reported with their row number and skipped; a batch
+    rejected by the database is retried row by row so only its faulty rows
+    are lost.
+    """
+    _name = 'acmst.admission.import.wizard'
+    _description = 'Admission File Import Wizard'
+
+    import_file = fields.Binary(
+        string='File',
+        required=True,
+        attachment=False,
+        help='CSV or XLSX file with one applicant per row and column names in the first row'
+    )
+    filename = fields.Char(string='Filename')
+    batch_size = fields.Integer(
+        string='Batch Size',
+        default=IMPORT_BATCH_SIZE,
+        help='Number of rows validated and created together'
+    )
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('done', 'Done'),
+    ], string='Status', default='draft')
+    row_count = fields.Integer(string='Rows', readonly=True)
+    created_count = fields.Integer(string='Created', readonly=True)
+    error_count = fields.Integer(string='Errors', readonly=True)
+    duration = fields.Float(string='Duration (s)', readonly=True)
+    error_report = fields.Text(string='Error Report', readonly=True)
+    admission_file_ids = fields.Many2many(
+        'acmst.admission.file',
+        string='Admission Files',
+        readonly=True,
+        help='Admission files created by the import'
+    )
+
+    def action_import(self):
+        """Import the uploaded file and show the result"""
+        self.ensure_one()
+        if not self.import_file:
+            raise ValidationError(_('Please select a file to import.'))
+        stream = io.BytesIO(base64.b64decode(self.import_file))
+        result = self.import_stream(stream, self.filename, batch_size=self.batch_size)
+
+        errors = result['errors']
+        lines = [_('Row %s: %s') % (error['row'], error['message']) for error in errors[:MAX_DISPLAYED_ERRORS]]
+        if len(errors) > MAX_DISPLAYED_ERRORS:
+            lines.append(_('... and %s more errors') % (len(errors) - MAX_DISPLAYED_ERRORS))
+        self.write({
+            'state': 'done',
+            'row_count': result['rows'],
+            'created_count': len(result['admission_file_ids']),
+            'error_count': len(errors),
+            'duration': result['duration'],
+            'error_report': '\n'.join(lines),
+            'admission_file_ids': [(6, 0, result['admission_file_ids'])],
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_view_admission_files(self):
+        """Open the admission files created by the import"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Imported Admission Files'),
+            'res_model': 'acmst.admission.file',
+            'view_mode': 'tree,form',
+            'domain': [('id', 'in', self.admission_file_ids.ids)],
+        }
+
+    @api.model
+    def import_stream(self, stream, filename, batch_size=IMPORT_BATCH_SIZE):
+        """Import admission files from the CSV or XLSX file read from ``stream``.
+
+        Returns a dict with the number of data ``rows`` read, the
+        ``admission_file_ids`` created, the ``errors`` as a list of
+        ``{'row', 'national_id', 'message'}`` dicts and the ``duration`` in
+        seconds.
+        """
+        start = time.monotonic()
+        if (filename or '').lower().endswith('.xlsx'):
+            rows = _iter_xlsx_rows(stream)
+        else:
+            rows = _iter_csv_rows(stream)
+        batch_size = max(batch_size or IMPORT_BATCH_SIZE, 1)
+
+        selections = self._get_selection_maps()
+        seen_national_ids = set()
+        created_ids = []
+        errors = []
+        row_count = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            row_count += len(batch)
+            vals_list, row_numbers = self._prepare_batch(batch, selections, seen_national_ids, errors)
+            created_ids += self._create_batch(vals_list, row_numbers, errors).ids
+            # Keep memory flat over large files
+            self.env.invalidate_all()
+
+        duration = time.monotonic() - start
+        _logger.info(f'Imported {len(created_ids)} admission files from {row_count} rows of {filename} '
+                     f'in {duration:.1f}s with {len(errors)} errors')
+        return {
+            'rows': row_count,
+            'admission_file_ids': created_ids,
+            'errors': sorted(errors, key=lambda error: error['row']),
+            'duration': round(duration, 3),
+        }
+
+    @api.model
+    def _get_selection_maps(self):
+        """Map lowercase values and labels of the imported selection fields to their values"""
+        AdmissionFile = self.env['acmst.admission.file']
+        selections = {}
+        for fname in IMPORT_SELECTION_FIELDS:
+            mapping = selections[fname] = {}
+            for value, label in AdmissionFile._fields[fname]._description_selection(self.env):
+                mapping[value.lower()] = value
+                mapping[str(label).lower()] = value
+        return selections
+
+    @api.model
+    def _prepare_batch(self, batch, selections, seen_national_ids, errors):
+        """Validate a batch of rows together and return ``(vals_list, row_numbers)`` of the valid ones.
+
+        The checks mirror the constraints of the admission file so that a
+        single bad row does not make the whole batch fail on create.
+        """
+        references = {}
+        for fname, columns in IMPORT_REFERENCE_COLUMNS.items():
+            references[fname] = [
+                next((_cell_to_str(values[column]) for column in columns if _cell_to_str(values.get(column))), '')
+                for __, values in batch
+            ]
+        programs = self.env['acmst.program'].search_read(
+            ['|', ('code', 'in', references['program_id']), ('name', 'in', references['program_id'])],
+            ['code', 'name'])
+        program_map = {}
+        for program in programs:
+            program_map.setdefault(program['name'], program['id'])
+            program_map[program['code']] = program['id']
+        batches = self.env['acmst.batch'].search_read(
+            [('program_id', 'in', list(set(program_map.values()))),
+             '|', ('code', 'in', references['batch_id']), ('name', 'in', references['batch_id'])],
+            ['code', 'name', 'program_id'])
+        batch_map = {}
+        for batch_values in batches:
+            program_id = batch_values['program_id'][0]
+            batch_map.setdefault((program_id, batch_values['name']), batch_values['id'])
+            batch_map[(program_id, batch_values['code'])] = batch_values['id']
+
+        national_ids = [_cell_to_str(values.get('national_id')) for __, values in batch]
+        existing_national_ids = {
+            values['national_id'] for values in self.env['acmst.admission.file'].with_context(active_test=False).search_read(
+                [('national_id', 'in', [national_id for national_id in national_ids if national_id])],
+                ['national_id'])
+        }
+
+        AdmissionFile = self.env['acmst.admission.file']
+        today = date.today()
+        vals_list = []
+        row_numbers = []
+        for index, (row_number, values) in enumerate(batch):
+            problems = []
+            vals = {}
+            for fname in AdmissionFile._CREATE_REQUIRED_FIELDS + IMPORT_OPTIONAL_FIELDS:
+                value = values.get(fname)
+                if fname == 'birth_date' and isinstance(value, date):
+                    vals[fname] = value
+                elif fname not in IMPORT_REFERENCE_COLUMNS:
+                    vals[fname] = _cell_to_str(value)
+
+            program_ref = references['program_id'][index]
+            vals['program_id'] = program_map.get(program_ref, False)
+            if program_ref and not vals['program_id']:
+                problems.append(_('Unknown program "%s"') % program_ref)
+            batch_ref = references['batch_id'][index]
+            vals['batch_id'] = batch_map.get((vals['program_id'], batch_ref), False)
+            if batch_ref and vals['program_id'] and not vals['batch_id']:
+                problems.append(_('Unknown batch "%s" for program "%s"') % (batch_ref, program_ref))
+
+            for fname, mapping in selections.items():
+                if vals.get(fname):
+                    value = mapping.get(str(vals[fname]).lower())
+                    if not value:
+                        problems.append(_('Invalid value "%s" for %s') % (vals[fname], AdmissionFile._fields[fname].string))
+                    vals[fname] = value or False
+
+            if vals['birth_date']:
+                try:
+                    vals['birth_date'] = fields.Date.to_date(vals['birth_date'])
+                    if vals['birth_date'] > today:
+                        problems.append(_('Birth date cannot be in the future.'))
+                except ValueError:
+                    problems.append(_('Invalid birth date "%s"') % vals['birth_date'])
+
+            national_id = vals['national_id']
+            if national_id:
+                if not national_id.isdigit() or len(national_id) != 10:
+                    problems.append(_('National ID must be exactly 10 digits.'))
+                elif national_id in existing_national_ids:
+                    problems.append(_('An admission file already exists for national ID %s.') % national_id)
+                elif national_id in seen_national_ids:
+                    problems.append(_('National ID %s appears more than once in the file.') % national_id)
+            if vals['email'] and '@' not in vals['email']:
+                problems.append(_('Please enter a valid email address.'))
+
+            missing_fields = AdmissionFile._get_missing_required_fields(vals)
+            if missing_fields:
+                problems.append(_('The following required fields are missing: %s') % ', '.join(missing_fields))
+
+            if problems:
+                errors.append({'row': row_number, 'national_id': national_id, 'message': '; '.join(problems)})
+                continue
+            seen_national_ids.add(national_id)
+            vals_list.append({fname: value for fname, value in vals.items() if value})
+            row_numbers.append(row_number)
+        return vals_list, row_numbers
+
+    @api.model
+    def _create_batch(self, vals_list, row_numbers, errors):
+        """Create the admission files of a batch with one ``create`` call.
+
+        If the database rejects the batch, it is rolled back and created row
+        by row, so the rows at fault are reported and the others kept.
+        """
+        AdmissionFile = self.env['acmst.admission.file'].with_context(tracking_disable=True)
+        if not vals_list:
+            return AdmissionFile
+        try:
+            with self.env['acmst.audit.log']._savepoint():
+                return AdmissionFile.create(vals_list)
+        except Exception as e:
+            _logger.warning(f'Import batch of {len(vals_list)} rows failed, creating them one by one: {e}')
+
+        admission_files = AdmissionFile
+        for row_number, vals in zip(row_numbers, vals_list):
+            try:
+                with self.env['acmst.audit.log']._savepoint():
+                    admission_files |= AdmissionFile.create([vals])
+            except (ValidationError, UserError) as e:
+                errors.append({'row': row_number, 'national_id': vals.get('national_id'), 'message': str(e)})
+            except Exception as e:
+                _logger.error(f'Error importing row {row_number}: {e}')
+                errors.append({'row': row_number, 'national_id': vals.get('national_id'), 'message': str(e)})
+        return admission_files
@@ -97,7 +97,6 @@ class AcmstCoordinatorConditionWizard(models.TransientModel):
             'wizard_id': self.id,
             'subject_name': subject_name,
             'subject_code': subject_code,
-            'level': level,
             'description': description,
             'deadline': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
             'notes': 'Auto-generated condition - please review and modify as needed'
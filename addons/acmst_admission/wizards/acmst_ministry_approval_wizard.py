@@ -321,7 +321,7 @@ class AcmstMinistryApprovalWizard(models.TransientModel):
             'is_sensitive': True,
             'severity': 'high'
         }
-        self.env['acmst.audit.log'].create(audit_vals)
+        self.env['acmst.audit.log']._buffer_log(audit_vals)
 
         if self.portal_application_id:
             # Handle portal application approval
@@ -362,8 +362,8 @@ class AcmstMinistryApprovalWizard(models.TransientModel):
             'education_duration_years': self.portal_application_id.education_duration_years,
             'submission_method': 'portal',
             'state': 'health_required',  # Set to health_required for health check
-            'profile_picture': self.portal_application_id.profile_picture,
             'profile_picture_filename': self.portal_application_id.profile_picture_filename,
+            'id_document_filename': self.portal_application_id.id_document_filename,
             'id_type': self.portal_application_id.id_type,
             'admission_type': self.portal_application_id.admission_type,
             'place_of_birth': self.portal_application_id.place_of_birth,
@@ -373,6 +373,7 @@ class AcmstMinistryApprovalWizard(models.TransientModel):
 
         _logger.info(f"Creating admission file from portal application {self.portal_application_id.name}")
         admission_file = self.env['acmst.admission.file'].create(admission_vals)
+        admission_file._share_binary_fields(self.portal_application_id)
 
         # Create guardian records for the admission file
         for guardian in self.portal_application_id.guardian_ids: